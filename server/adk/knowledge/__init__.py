@@ -0,0 +1,13 @@
+"""Local tea-utensil knowledge used to ground sub-agent calls."""
+
+from .base import KnowledgeBase, Match, Utensil, knowledge_base
+from .grounding import answer_lookup, ground_prompt
+
+__all__ = [
+    "KnowledgeBase",
+    "Match",
+    "Utensil",
+    "answer_lookup",
+    "ground_prompt",
+    "knowledge_base",
+]
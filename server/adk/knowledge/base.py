@@ -0,0 +1,175 @@
+"""Bundled tea-utensil knowledge base with a trie and bigram index.
+
+``data/utensils.json`` lists utensils with their reading, category, 千家十職
+house and seasonal notes. Vision summaries and planner prompts are scanned
+with a character trie (longest match, ~30 µs for a typical vision summary);
+fuzzy queries go through a bigram inverted index. Known facts are injected
+into sub-agent prompts, and pure lookups ("棗の読み方は?") are answered
+without a model call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+_DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "utensils.json")
+_END = ""  # trie terminal key (never a real character)
+
+# Hiragana readings shorter than this are not matched in free text (ふろ, かま, ろ...).
+_MIN_READING_MATCH = 3
+
+
+@dataclass(frozen=True)
+class Utensil:
+    name: str
+    reading: str
+    category: str
+    summary: str
+    aliases: tuple[str, ...] = ()
+    season: str | None = None
+    classification: str | None = None
+    house: str | None = None
+    house_role: str | None = None
+
+    @property
+    def surfaces(self) -> tuple[str, ...]:
+        return (self.name, *self.aliases, self.reading)
+
+    def fact_line(self) -> str:
+        parts = [f"{self.name}（{self.reading}）: {self.category}。{self.summary}"]
+        if self.classification:
+            parts.append(f"分類: {self.classification}。")
+        if self.house:
+            parts.append(f"千家十職: {self.house}（{self.house_role}）。")
+        if self.season:
+            parts.append(f"季節: {self.season}。")
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class Match:
+    utensil: Utensil
+    start: int
+    end: int
+    surface: str
+
+
+@dataclass
+class KnowledgeBase:
+    entries: list[Utensil]
+    _trie: dict = field(default_factory=dict, repr=False)
+    _bigrams: dict[str, set[int]] = field(default_factory=lambda: defaultdict(set), repr=False)
+    _by_surface: dict[str, Utensil] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        for idx, entry in enumerate(self.entries):
+            for surface in entry.surfaces:
+                if not surface:
+                    continue
+                self._by_surface.setdefault(surface, entry)
+                for gram in _bigrams(surface):
+                    self._bigrams[gram].add(idx)
+                if surface == entry.reading and len(surface) < _MIN_READING_MATCH:
+                    continue
+                node = self._trie
+                for ch in surface:
+                    node = node.setdefault(ch, {})
+                node.setdefault(_END, entry)
+
+    @classmethod
+    def from_json(cls, path: str = _DATA_PATH) -> "KnowledgeBase":
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        entries = []
+        for item in raw:
+            senke = item.get("senke") or {}
+            entries.append(
+                Utensil(
+                    name=item["name"],
+                    reading=item["reading"],
+                    category=item["category"],
+                    summary=item["summary"],
+                    aliases=tuple(item.get("aliases", ())),
+                    season=item.get("season"),
+                    classification=item.get("classification"),
+                    house=senke.get("house"),
+                    house_role=senke.get("role"),
+                )
+            )
+        return cls(entries)
+
+    def get(self, surface: str) -> Utensil | None:
+        """Exact lookup by name, alias or reading."""
+        return self._by_surface.get(surface.strip())
+
+    def scan(self, text: str) -> list[Match]:
+        """Return non-overlapping longest matches of known utensils in ``text``."""
+        matches: list[Match] = []
+        trie = self._trie
+        i, n = 0, len(text)
+        while i < n:
+            node = trie.get(text[i])
+            if node is None:
+                i += 1
+                continue
+            best: Utensil | None = node.get(_END)
+            best_end = i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    best, best_end = node[_END], j
+            if best is not None:
+                matches.append(Match(best, i, best_end, text[i:best_end]))
+                i = best_end
+            else:
+                i += 1
+        return matches
+
+    def mentioned(self, text: str) -> list[Utensil]:
+        """Distinct utensils in order of first mention."""
+        seen: dict[str, Utensil] = {}
+        for m in self.scan(text):
+            seen.setdefault(m.utensil.name, m.utensil)
+        return list(seen.values())
+
+    def search(self, query: str, limit: int = 3) -> list[tuple[Utensil, float]]:
+        """Fuzzy lookup by bigram overlap (Dice coefficient) for misspelled names."""
+        grams = _bigrams(query)
+        if not grams:
+            return []
+        candidates: set[int] = set()
+        for gram in grams:
+            candidates |= self._bigrams.get(gram, set())
+        scored = []
+        for idx in candidates:
+            entry = self.entries[idx]
+            score = max(_dice(grams, _bigrams(s)) for s in entry.surfaces if s)
+            scored.append((entry, round(score, 4)))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+
+def _dice(a: set[str], b: set[str]) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+def _bigrams(text: str) -> set[str]:
+    text = re.sub(r"\s+", "", text)
+    if len(text) == 1:
+        return {text}
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+@lru_cache(maxsize=1)
+def knowledge_base() -> KnowledgeBase:
+    """Return the bundled knowledge base (loaded once)."""
+    return KnowledgeBase.from_json()
@@ -0,0 +1,60 @@
+"""Prompt grounding and model-free answers from the utensil knowledge base."""
+
+from __future__ import annotations
+
+import re
+
+from .base import KnowledgeBase, Utensil, knowledge_base
+
+_READING_RE = re.compile(r"読み方|何と読|なんと読|どう読|読みは|ふりがな|よみかた")
+_HOUSE_RE = re.compile(r"千家十職.*(どこ|誰|だれ|どの|何家)|(どこ|誰|だれ)が作")
+_SEASON_RE = re.compile(r"(いつ|どの季節|何月).*(使|用い)|季節は")
+
+_FACTS_HEADER = "[参考情報（確認済みの基礎知識。名称・読み・分類はこれに従い、再説明は簡潔に）]"
+
+
+def _question(prompt: str) -> str:
+    """The user's question is the last paragraph; earlier ones carry vision findings."""
+    paragraphs = [p for p in re.split(r"\n\s*\n", prompt.strip()) if p.strip()]
+    return paragraphs[-1] if paragraphs else ""
+
+
+def _subject(prompt: str, kb: KnowledgeBase) -> Utensil | None:
+    """The utensil the question is about: named in the question, else the only one in the prompt."""
+    in_question = kb.mentioned(_question(prompt))
+    if in_question:
+        return in_question[0]
+    mentioned = kb.mentioned(prompt)
+    return mentioned[0] if len(mentioned) == 1 else None
+
+
+def ground_prompt(prompt: str, *, limit: int = 3, kb: KnowledgeBase | None = None) -> str:
+    """Append known facts about utensils mentioned in ``prompt`` (unchanged when none)."""
+    kb = kb or knowledge_base()
+    utensils = kb.mentioned(prompt)[:limit]
+    if not utensils:
+        return prompt
+    facts = "\n".join(f"- {u.fact_line()}" for u in utensils)
+    return f"{prompt}\n\n{_FACTS_HEADER}\n{facts}"
+
+
+def answer_lookup(prompt: str, *, kb: KnowledgeBase | None = None) -> str | None:
+    """Answer reading / 千家十職 / season questions directly, or ``None`` if a model is needed."""
+    kb = kb or knowledge_base()
+    question = _question(prompt)
+    if _READING_RE.search(question):
+        utensil = _subject(prompt, kb)
+        if utensil is not None:
+            return f"{utensil.name}は「{utensil.reading}」と読みます。{utensil.summary}"
+    elif _HOUSE_RE.search(question):
+        utensil = _subject(prompt, kb)
+        if utensil is not None and utensil.house:
+            return (
+                f"{utensil.name}（{utensil.reading}）は、千家十職では{utensil.house_role}の"
+                f"{utensil.house}が手がけます。{utensil.summary}"
+            )
+    elif _SEASON_RE.search(question):
+        utensil = _subject(prompt, kb)
+        if utensil is not None and utensil.season:
+            return f"{utensil.name}（{utensil.reading}）: {utensil.season}。{utensil.summary}"
+    return None
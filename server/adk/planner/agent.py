@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+import time
 
 from google.adk.agents import LlmAgent
+from google.adk.models.llm_response import LlmResponse
 from google.adk.tools.function_tool import FunctionTool
 from google.genai import types
 
-from ..setting.agent import analyze_setting
-from ..tools_analysis.agent import analyze_tool_history
-from ..tools_basic.agent import explain_tool_basics
-from ..translator.agent import translate_text
-from ..vision.agent import summarize_image
+from ..services.deadline import CallAborted, current_scope
+from ..services.env import env_bool
+from ..services.semantic_cache import get_semantic_cache
+from ..services.usage import usage_ledger
+from ..setting.agent import analyze_setting_async
+from ..tools_analysis.agent import analyze_tool_history_async
+from ..tools_basic.agent import explain_tool_basics_async
+from ..translator.agent import translate_text_async, translate_text_multi_async
+from ..vision.agent import summarize_images_async
+from .modes import MODE_STATE_KEY, mode_instruction_provider, normalize_mode
+from .prefetch import prefetcher
+from .router import route, router_stats, split_mode_instruction
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +32,14 @@ _instruction_lines = [
     "- call_setting_analysis(prompt=...): ビジョン所見やユーザーの質問を渡すと、茶室全体の設え・季節趣向を統合解釈します。",
     "- call_tools_basic(prompt=...): 道具名称や使い方を初心者向けにやさしく解説します。",
     "- call_tools_analysis(prompt=...): 道具の由緒・歴史的背景・千家十職との関連を専門的に説明します。",
-    "- call_translation(text=..., target_language=...): 最終出力を指定言語に翻訳します。",
+    "- call_multi_perspective(prompt=..., perspectives=...): setting(設え) / basic(道具の基礎) / analysis(由緒) のうち必要な観点をカンマ区切りで指定し、同時に実行して観点ごとの結果をまとめて返します。",
+    "- call_translation(text=..., target_language=...): 最終出力を指定言語に翻訳します。複数言語はカンマ区切りで一度に指定できます。",
     "",
     "ツール呼び出し時は、他の文章を混ぜずに `call_xxx` 形式で JSON 引数を指定して実行してください。",
     "",
     "判断フロー:",
     "1) ユーザー発話に画像/動画が含まれれば自動でビジョン要約を取得し、テキストとして手元のコンテキストに追加する。必要なら再送依頼を行う。",
-    "2) 解析結果やユーザー要望に応じて適切なツールを呼び出し、そのアウトプットを噛み砕いて利用者に伝える。",
+    "2) 解析結果やユーザー要望に応じて適切なツールを呼び出し、そのアウトプットを噛み砕いて利用者に伝える。2つ以上の観点が必要な質問(例: 設えと主な道具の解説)は個別ツールを順に呼ばず、call_multi_perspective を1回だけ呼ぶ。",
     "3) 最終出力の言語指定があれば call_translation で整形する。",
     "",
     "自分で回答する条件: ツール呼び出しが不要な軽微な質問やルーティング判断のみの場合に限り、簡潔に応答する。目的達成に不要な説明は避け、最短経路でゴールへ導くこと。",
@@ -36,8 +48,8 @@ _instruction_lines = [
 PLANNER_INSTRUCTION = "\n".join(_instruction_lines)
 
 
-def _planner_router_before_model(callback_ctx, llm_request):
-    """前処理: 画像を要約しテキスト化してからモデルに渡す。"""
+async def _planner_router_before_model(callback_ctx, llm_request):
+    """前処理: 画像を要約しテキスト化してからモデルに渡す。明らかなターンはツールへ直行する。"""
     try:
         if not llm_request.contents:
             return None
@@ -56,77 +68,220 @@ def _planner_router_before_model(callback_ctx, llm_request):
             else:
                 remaining_parts.append(part)
 
-        if not image_payloads:
-            return None
+        vision: list[str] = []
+        if image_payloads:
+            results = await summarize_images_async(image_payloads)
+            sections: list[str] = []
+            for idx, result in enumerate(results, start=1):
+                if isinstance(result, (asyncio.TimeoutError, CallAborted)):
+                    logger.info("Vision summarization for image #%d timed out", idx)
+                    text = "画像解析が時間内に完了しませんでした。"
+                elif isinstance(result, BaseException):
+                    logger.error("Vision summarization failed for image #%d", idx, exc_info=result)
+                    text = "画像解析に失敗しました。もう一度明るい画像を送ってください。"
+                else:
+                    text = result.strip()
+                    if text:
+                        vision.append(f"[Vision解析{idx}] {text}")
+                if text:
+                    sections.append(f"[Vision解析{idx}] {text}")
+
+            # Start the likely follow-up (basics / provenance) while the planner is still thinking.
+            prefetcher.schedule([r for r in results if isinstance(r, str)])
 
-        summaries: list[str] = []
-        for idx, (mime, payload) in enumerate(image_payloads, start=1):
-            try:
-                summary = summarize_image(payload, mime_type=mime)
-                if summary:
-                    summaries.append(summary.strip())
-            except Exception:
-                logger.exception("Vision summarization failed for image #%d", idx)
-                summaries.append("画像解析に失敗しました。もう一度明るい画像を送ってください。")
-
-        last.parts = remaining_parts
-        if summaries:
-            combined = "\n\n".join(
-                f"[Vision解析{idx}] {text}" for idx, text in enumerate(summaries, start=1) if text
-            )
-            last.parts.append(types.Part.from_text(text=combined))
+            last.parts = remaining_parts
+            if sections:
+                last.parts.append(types.Part.from_text(text="\n\n".join(sections)))
+
+        return await _fast_path(callback_ctx, remaining_parts, vision, had_images=bool(image_payloads))
     except Exception:
         logger.exception("planner before_model callback failed")
     return None
 
 
-def call_setting_analysis(prompt: str) -> str:
-    """茶室全体の設えと季節趣向を統合的に解説します。"""
+_FAST_PATH_ENABLED = env_bool("PLANNER_FAST_PATH", True)
+
+
+async def _fast_path(callback_ctx, parts, vision: list[str], *, had_images: bool) -> LlmResponse | None:
+    """Answer obvious turns directly with a sub-agent, skipping the planner's routing call."""
+    if not _FAST_PATH_ENABLED:
+        return None
+    # Tool results and other non-text parts always go back to the planner.
+    if any(getattr(p, "function_response", None) or getattr(p, "function_call", None) for p in parts):
+        return None
+    if any(not getattr(p, "text", None) for p in parts):
+        return None
+    text_mode, texts = split_mode_instruction([p.text for p in parts])
+    if not texts and not had_images:
+        return None
+    scope = current_scope()
+    state = getattr(callback_ctx, "state", None)
+    state_mode = normalize_mode(state.get(MODE_STATE_KEY)) if state is not None else None
+    mode = (scope.mode if scope else None) or text_mode or state_mode or "intermediate"
+    decision = route(mode=mode, user_text="\n".join(texts), vision=vision)
+    invocation_id = getattr(callback_ctx, "invocation_id", None)
+    if decision is None:
+        router_stats.record_fallback(invocation_id)
+        return None
+    logger.info("[fast-path] %s -> %s", decision.reason, decision.tool)
+    answer = await _FAST_PATH_TOOLS[decision.tool](**decision.args)
+    router_stats.record_route(decision.reason)
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part.from_text(text=answer)]))
+
+
+async def _planner_after_model(callback_ctx, llm_response):
+    """Time the planner's answer after a fast-path fallback (for the saved-latency estimate)."""
+    router_stats.record_planner_response(getattr(callback_ctx, "invocation_id", None))
+    return None
+
+
+_ABORTED_MESSAGE = "応答に時間がかかりすぎたため処理を中断しました。質問を短くするか、もう一度お試しください。"
+_BUDGET_TRANSLATION_MESSAGE = "利用上限に達したため、翻訳機能は一時的に停止しています。解説や画像解析はこのままご利用いただけます。"
+
+
+async def _run_tool(name: str, awaitable, failure_message: str) -> str:
     try:
-        return analyze_setting(prompt)
+        return await awaitable
+    except CallAborted as e:
+        logger.info("%s aborted (%s)", name, e.reason)
+        return _ABORTED_MESSAGE
     except Exception:
-        logger.exception("call_setting_analysis failed")
-        return "設え解析ツールの呼び出しに失敗しました。別の情報を添えて再度お試しください。"
+        logger.exception("%s failed", name)
+        return failure_message
+
 
+async def _answer(tool: str, prompt: str, call) -> str:
+    """Use a prefetched answer for the same utensil when there is one, else the (semantic-cached) call."""
+    prefetched = await prefetcher.take(tool, prompt)
+    if prefetched is not None:
+        return prefetched
+    return await _semantic_cached(tool, prompt, call)
+
+
+async def _semantic_cached(tool: str, prompt: str, call) -> str:
+    """Serve paraphrased prompts from the semantic cache, scoped per tool and user mode."""
+    cache = get_semantic_cache()
+    if cache is None or not prompt.strip():
+        return await call(prompt)
+    scope = current_scope()
+    mode = (scope.mode if scope else None) or "intermediate"
+    return await cache.get_or_call(tool, mode, prompt, call)
+
+
+async def call_setting_analysis(prompt: str) -> str:
+    """茶室全体の設えと季節趣向を統合的に解説します。"""
+    return await _run_tool(
+        "call_setting_analysis",
+        analyze_setting_async(prompt),
+        "設え解析ツールの呼び出しに失敗しました。別の情報を添えて再度お試しください。",
+    )
 
-def call_tools_basic(prompt: str) -> str:
+
+async def call_tools_basic(prompt: str) -> str:
     """茶道具の名称・用途・扱い方を初心者向けに説明します。"""
-    try:
-        return explain_tool_basics(prompt)
-    except Exception:
-        logger.exception("call_tools_basic failed")
-        return "茶道具の基礎説明ツールで問題が発生しました。少し時間を置いて再試行してください。"
+    return await _run_tool(
+        "call_tools_basic",
+        _answer("explain_tool_basics", prompt, explain_tool_basics_async),
+        "茶道具の基礎説明ツールで問題が発生しました。少し時間を置いて再試行してください。",
+    )
 
 
-def call_tools_analysis(prompt: str) -> str:
+async def call_tools_analysis(prompt: str) -> str:
     """茶道具の由緒や歴史的背景を専門的に解説します。"""
-    try:
-        return analyze_tool_history(prompt)
-    except Exception:
-        logger.exception("call_tools_analysis failed")
-        return "茶道具の由緒分析ツールの呼び出しに失敗しました。追加情報があれば添えてください。"
+    return await _run_tool(
+        "call_tools_analysis",
+        _answer("analyze_tool_history", prompt, analyze_tool_history_async),
+        "茶道具の由緒分析ツールの呼び出しに失敗しました。追加情報があれば添えてください。",
+    )
 
 
-def call_translation(text: str, target_language: str) -> str:
-    """指定された言語へ自然な文体で翻訳します。"""
-    try:
-        return translate_text(text=text, target_language=target_language)
-    except Exception:
-        logger.exception("call_translation failed")
-        return "翻訳ツールの呼び出しに失敗しました。target_language と文章をもう一度確認してください。"
+# perspective key -> (section label, planner tool); aliases accept the Japanese labels
+_PERSPECTIVES = {
+    "setting": ("設え", call_setting_analysis),
+    "basic": ("道具の基礎", call_tools_basic),
+    "analysis": ("由緒・歴史", call_tools_analysis),
+}
+_PERSPECTIVE_ALIASES = {
+    "設え": "setting", "しつらえ": "setting", "call_setting_analysis": "setting",
+    "基礎": "basic", "道具": "basic", "basics": "basic", "call_tools_basic": "basic",
+    "由緒": "analysis", "歴史": "analysis", "history": "analysis", "call_tools_analysis": "analysis",
+}
+
+
+def _parse_perspectives(raw: str) -> list[str]:
+    keys: list[str] = []
+    for item in re.split(r"[,、/\s]+", raw or ""):
+        key = item.strip().lower()
+        key = _PERSPECTIVE_ALIASES.get(key, key)
+        if key in _PERSPECTIVES and key not in keys:
+            keys.append(key)
+    return keys or list(_PERSPECTIVES)
+
+
+async def _timed(key: str, prompt: str) -> tuple[str, str, float]:
+    started = time.perf_counter()
+    text = await _PERSPECTIVES[key][1](prompt)
+    return key, text, time.perf_counter() - started
+
+
+async def call_multi_perspective(prompt: str, perspectives: str) -> str:
+    """設え(setting)・道具の基礎(basic)・由緒(analysis)のうち指定した観点を同時に解析し、観点ごとにまとめて返します。perspectives はカンマ区切り（空なら全観点）。"""
+    keys = _parse_perspectives(perspectives)
+    started = time.perf_counter()
+    # Each planner tool already turns failures/aborts into a message, so one slow section never hides the others.
+    results = await asyncio.gather(*(_timed(key, prompt) for key in keys))
+    total = time.perf_counter() - started
+    logger.info(
+        "call_multi_perspective: %s in %.2fs",
+        ", ".join(f"{key}={elapsed:.2f}s" for key, _, elapsed in results),
+        total,
+    )
+    sections = [f"[{_PERSPECTIVES[key][0]}]({elapsed:.1f}秒)\n{text.strip()}" for key, text, elapsed in results]
+    return "\n\n".join(sections)
+
+
+async def _translate(text: str, target_language: str) -> str:
+    languages = [lang for lang in re.split(r"[,、/]", target_language or "") if lang.strip()]
+    if len(languages) <= 1:
+        return await translate_text_async(text=text, target_language=target_language)
+    results = await translate_text_multi_async(text, target_languages=languages)
+    return "\n\n".join(f"[{lang}]\n{translated}" for lang, translated in results.items())
+
+
+async def call_translation(text: str, target_language: str) -> str:
+    """指定された言語へ自然な文体で翻訳します。複数言語はカンマ区切り（例: "English, 中文"）。"""
+    if not usage_ledger.allows("translation"):
+        return _BUDGET_TRANSLATION_MESSAGE
+    return await _run_tool(
+        "call_translation",
+        _translate(text, target_language),
+        "翻訳ツールの呼び出しに失敗しました。target_language と文章をもう一度確認してください。",
+    )
+
+
+# Planner tools the fast path may call directly
+_FAST_PATH_TOOLS = {
+    "call_setting_analysis": call_setting_analysis,
+    "call_tools_basic": call_tools_basic,
+    "call_tools_analysis": call_tools_analysis,
+    "call_translation": call_translation,
+}
 
 
 planner_agent = LlmAgent(
     name="planner_agent",
     description="Tasks router and coordinator for the multi-agent system.",
-    instruction=PLANNER_INSTRUCTION,
+    # The user mode comes from session state (see .modes), not from each turn's text
+    instruction=mode_instruction_provider(PLANNER_INSTRUCTION),
     # Live API 対応モデル
     model="gemini-2.0-flash-exp",
     before_model_callback=_planner_router_before_model,
+    after_model_callback=_planner_after_model,
     tools=[
         FunctionTool(call_setting_analysis),
         FunctionTool(call_tools_basic),
         FunctionTool(call_tools_analysis),
+        FunctionTool(call_multi_perspective),
         FunctionTool(call_translation),
     ],
 )
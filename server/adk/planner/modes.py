@@ -0,0 +1,50 @@
+"""User mode (beginner / intermediate / advanced) as planner session state.
+
+The coordinator stores the connection's mode in the ADK session state under
+``MODE_STATE_KEY``; :func:`mode_instruction_provider` appends the matching mode
+paragraph to the planner's system instruction once per Live session instead of
+prepending it to every user turn. A mode change mid-session is announced
+once with the next user turn (:func:`mode_instruction`), since the Live API
+keeps the system instruction it was connected with.
+"""
+
+from __future__ import annotations
+
+MODE_STATE_KEY = "user_mode"
+DEFAULT_MODE = "intermediate"
+
+MODE_INSTRUCTIONS = {
+    "beginner": "初級者モード: 優しい語り口で、専門用語を避け、短く、具体例を交えて説明してください。必要なら最後に理解確認の質問を1つ添えてください。",
+    "intermediate": "中級者モード: 要点を箇条書き中心で、必要十分な専門用語のみ使い、手順や根拠を簡潔に示してください。",
+    "advanced": "上級者モード: 簡潔かつ技術的に、前提説明は省略して要点・注意点・限界を短く挙げてください。",
+}
+
+_ALIASES = {"初級": "beginner", "中級": "intermediate", "上級": "advanced"}
+
+
+def normalize_mode(raw: str | None) -> str | None:
+    """Return ``beginner|intermediate|advanced`` for a client value, or None if unknown."""
+    raw = (raw or "").strip().lower()
+    normalized = _ALIASES.get(raw, raw)
+    return normalized if normalized in MODE_INSTRUCTIONS else None
+
+
+def mode_instruction(mode: str | None) -> str:
+    return MODE_INSTRUCTIONS.get(mode or DEFAULT_MODE, MODE_INSTRUCTIONS[DEFAULT_MODE])
+
+
+def state_mode(state) -> str:
+    """Mode stored in a session state mapping (default intermediate)."""
+    try:
+        return normalize_mode(state.get(MODE_STATE_KEY)) or DEFAULT_MODE
+    except Exception:
+        return DEFAULT_MODE
+
+
+def mode_instruction_provider(base: str):
+    """Build an ADK InstructionProvider: ``base`` followed by the session's mode paragraph."""
+
+    def provider(ctx) -> str:
+        return f"{base}\n\n応答スタイル:\n{mode_instruction(state_mode(ctx.state))}"
+
+    return provider
@@ -0,0 +1,253 @@
+"""Speculative prefetch of sub-agent answers once vision names a utensil.
+
+After ``summarize_image`` identifies, say, a 棗, the next question is very
+predictable: beginners ask how it is used, advanced users ask about its
+provenance and 千家十職 lineage. The prefetcher starts the matching sub-agent
+call in the background as soon as the vision summaries are in, so that the
+planner's later ``call_tools_basic`` / ``call_tools_analysis`` for the same
+utensil returns immediately (or joins the call already in flight).
+
+Each connection has a small budget of speculative calls; answers that are
+never used count as wasted, together with the tokens they cost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from ..knowledge import ground_prompt, knowledge_base
+from ..services.deadline import CallScope, current_scope
+from ..services.env import env_bool, env_float, env_int
+from ..services.genai import generate_text_async, get_text_from_response
+from ..services.usage import usage_ledger
+from ..tools_analysis.agent import ANALYSIS_INSTRUCTION, ANALYSIS_MODEL
+from ..tools_basic.agent import BASIC_INSTRUCTION, BASIC_MODEL
+
+logger = logging.getLogger(__name__)
+
+# sub-agent tool -> (model, instruction, prompt template)
+_SUB_AGENTS = {
+    "explain_tool_basics": (
+        BASIC_MODEL,
+        BASIC_INSTRUCTION,
+        "画像の所見: {observation}\n質問: この{utensil}は何ですか？名称と用途、扱い方を教えてください。",
+    ),
+    "analyze_tool_history": (
+        ANALYSIS_MODEL,
+        ANALYSIS_INSTRUCTION,
+        "画像の所見: {observation}\n質問: この{utensil}の由緒や歴史的背景、千家十職との関わりを解説してください。",
+    ),
+}
+
+# user mode -> sub-agent whose answer is prefetched
+_MODE_TOOLS = {
+    "beginner": "explain_tool_basics",
+    "intermediate": "explain_tool_basics",
+    "advanced": "analyze_tool_history",
+}
+
+_NO_UTENSIL = "茶道具が映っていないようです"
+
+
+def find_utensil(summaries: Sequence[str]) -> str | None:
+    """Return the name of the utensil mentioned first in the summaries."""
+    kb = knowledge_base()
+    for summary in summaries:
+        if not summary or _NO_UTENSIL in summary:
+            continue
+        matches = kb.scan(summary)
+        if matches:
+            return matches[0].utensil.name
+    return None
+
+
+def mentions(prompt: str, utensil: str) -> bool:
+    entry = knowledge_base().get(utensil)
+    return any(m.utensil is entry for m in knowledge_base().scan(prompt)) if entry else utensil in prompt
+
+
+@dataclass
+class _Prefetch:
+    tool: str
+    utensil: str
+    task: asyncio.Task
+    created: float
+    tokens: int = 0
+    consumed: bool = False
+
+
+@dataclass
+class _ConnectionState:
+    spent: int = 0
+    entries: dict[tuple[str, str], _Prefetch] = field(default_factory=dict)
+
+
+class Prefetcher:
+    """Per-connection background calls keyed on (sub-agent, utensil)."""
+
+    def __init__(self, *, enabled: bool = True, max_per_connection: int = 3, ttl_s: float = 180.0):
+        self.enabled = enabled
+        self.max_per_connection = max_per_connection
+        self.ttl_s = ttl_s
+        self._connections: dict[str, _ConnectionState] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "scheduled": 0,
+            "used": 0,
+            "hits": 0,
+            "joined": 0,
+            "misses": 0,
+            "failed": 0,
+            "wasted": 0,
+            "skipped_budget": 0,
+            "skipped_user_budget": 0,
+            "tokens": 0,
+            "wasted_tokens": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "Prefetcher":
+        return cls(
+            enabled=env_bool("PREFETCH_ENABLED", False),
+            max_per_connection=env_int("PREFETCH_MAX_PER_CONNECTION", 3),
+            ttl_s=env_float("PREFETCH_TTL_S", 180.0),
+        )
+
+    def schedule(self, summaries: Sequence[str]) -> asyncio.Task | None:
+        """Start a background sub-agent call for the utensil named in ``summaries``."""
+        scope = current_scope()
+        if not self.enabled or scope is None or scope.closed:
+            return None
+        tool = _MODE_TOOLS.get(scope.mode or "intermediate")
+        utensil = find_utensil(summaries)
+        if tool is None or utensil is None:
+            return None
+        if not usage_ledger.allows("prefetch", scope.user_id):
+            with self._lock:
+                self._stats["skipped_user_budget"] += 1
+            return None
+        observation = "\n".join(s.strip() for s in summaries if s and s.strip())
+        with self._lock:
+            state = self._connections.get(scope.connection_id)
+            if state is None:
+                state = self._connections[scope.connection_id] = _ConnectionState()
+                scope.on_close(self._discard)
+            self._expire(state, time.monotonic())
+            if (tool, utensil) in state.entries:
+                return None
+            if state.spent >= self.max_per_connection:
+                self._stats["skipped_budget"] += 1
+                return None
+            state.spent += 1
+            self._stats["scheduled"] += 1
+            # The task inherits the current context, so it runs (and is aborted) under ``scope``.
+            task = asyncio.create_task(
+                self._run(tool, utensil, observation), name=f"prefetch:{scope.connection_id}:{tool}"
+            )
+            entry = _Prefetch(tool, utensil, task, time.monotonic())
+            state.entries[(tool, utensil)] = entry
+        task.add_done_callback(lambda t, e=entry: self._finished(e, t))
+        logger.info("[prefetch] %s %s for %s (%s)", tool, utensil, scope.connection_id, scope.mode)
+        return task
+
+    async def _run(self, tool: str, utensil: str, observation: str) -> tuple[str, int]:
+        model, instruction, template = _SUB_AGENTS[tool]
+        response = await generate_text_async(
+            model=model,
+            instruction=instruction,
+            prompt=ground_prompt(template.format(observation=observation, utensil=utensil)),
+            tool=tool,
+        )
+        usage = getattr(response, "usage_metadata", None)
+        tokens = (getattr(usage, "total_token_count", None) or 0) if usage is not None else 0
+        return (get_text_from_response(response) or "").strip(), tokens
+
+    def _finished(self, entry: _Prefetch, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        with self._lock:
+            if task.exception() is not None:
+                self._stats["failed"] += 1
+                return
+            entry.tokens = task.result()[1]
+            self._stats["tokens"] += entry.tokens
+
+    async def take(self, tool: str, prompt: str) -> str | None:
+        """Return the prefetched answer for ``tool`` if ``prompt`` is about the same utensil."""
+        scope = current_scope()
+        if not self.enabled or scope is None:
+            return None
+        with self._lock:
+            state = self._connections.get(scope.connection_id)
+            if state is None:
+                return None
+            self._expire(state, time.monotonic())
+            entry = next(
+                (e for (t, _), e in state.entries.items() if t == tool and mentions(prompt, e.utensil)),
+                None,
+            )
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            joined = not entry.task.done()
+        try:
+            # Shielded: if the planner tool is cancelled the prefetch stays usable.
+            text, _ = await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            return None  # the prefetch itself was cancelled
+        except Exception:
+            return None
+        if not text:
+            return None
+        with self._lock:
+            if not entry.consumed:
+                entry.consumed = True
+                self._stats["used"] += 1
+            self._stats["joined" if joined else "hits"] += 1
+        logger.info("[prefetch] %s %s served (%s)", tool, entry.utensil, "joined" if joined else "hit")
+        return text
+
+    def _expire(self, state: _ConnectionState, now: float) -> None:
+        if self.ttl_s <= 0:
+            return
+        for key, entry in list(state.entries.items()):
+            if now - entry.created > self.ttl_s and entry.task.done():
+                self._drop(state, key)
+
+    def _drop(self, state: _ConnectionState, key: tuple[str, str]) -> None:
+        entry = state.entries.pop(key)
+        if not entry.task.done():
+            entry.task.cancel()
+        elif not entry.consumed and not entry.task.cancelled() and entry.task.exception() is None:
+            self._stats["wasted"] += 1
+            self._stats["wasted_tokens"] += entry.tokens
+
+    def _discard(self, scope: CallScope) -> None:
+        with self._lock:
+            state = self._connections.pop(scope.connection_id, None)
+            if state is None:
+                return
+            for key in list(state.entries):
+                self._drop(state, key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            scheduled = self._stats["scheduled"]
+            return {
+                **self._stats,
+                "enabled": self.enabled,
+                # share of speculative calls whose answer was served at least once
+                "hit_rate": round(self._stats["used"] / scheduled, 4) if scheduled else 0.0,
+                "connections": len(self._connections),
+            }
+
+
+prefetcher = Prefetcher.from_env()
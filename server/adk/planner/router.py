@@ -0,0 +1,148 @@
+"""Rule-based fast path that answers obvious turns without the planner LLM.
+
+The planner spends a full model round-trip choosing a tool even when the
+choice is obvious: a bare image from a beginner is always a basics question,
+and "「…」を英語に翻訳して" is always a translation. :func:`route` maps
+(mode, input shape, keyword intent) to a planner tool call and returns
+``None`` whenever more than one reading is plausible, so the planner still
+handles anything ambiguous. A keyword intent is only taken when the turn is
+about something concrete: a vision observation or a utensil from the
+knowledge base; general questions ("和敬清寂とは何ですか") go to the planner.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from ..knowledge import knowledge_base
+from .modes import MODE_INSTRUCTIONS
+
+# Prefixes of the mode instruction the coordinator sends with the first turn after a mode change.
+_MODE_PREFIXES = {text.split(":", 1)[0]: mode for mode, text in MODE_INSTRUCTIONS.items()}
+
+_LANGUAGES = {
+    "英語": "English", "english": "English",
+    "中国語": "Chinese", "chinese": "Chinese",
+    "韓国語": "Korean", "korean": "Korean",
+    "フランス語": "French", "french": "French",
+    "スペイン語": "Spanish", "spanish": "Spanish",
+    "ドイツ語": "German", "german": "German",
+    "日本語": "Japanese", "japanese": "Japanese",
+}
+_LANGUAGE_RE = "|".join(sorted(map(re.escape, _LANGUAGES), key=len, reverse=True))
+# 「…」を英語に翻訳して / 英語に訳して: … / translate to English: …
+_TRANSLATE_PATTERNS = [
+    re.compile(rf"^[「『\"](?P<text>.+?)[」』\"]\s*を\s*(?P<lang>{_LANGUAGE_RE})\s*に\s*(?:翻訳|訳)", re.S | re.I),
+    re.compile(rf"^(?P<lang>{_LANGUAGE_RE})\s*に\s*(?:翻訳|訳)(?:して(?:ください)?)?\s*[:：]\s*(?P<text>.+)$", re.S | re.I),
+    re.compile(rf"^translate\s+(?:this\s+)?(?:in)?to\s+(?P<lang>{_LANGUAGE_RE})\s*:\s*(?P<text>.+)$", re.S | re.I),
+]
+
+# planner tool -> keywords that make its intent unambiguous once the turn has a subject
+# (generic question words like とは / 何ですか / 名前 are left to the planner)
+_INTENTS = {
+    "call_tools_analysis": ("由緒", "歴史", "来歴", "作者", "作家", "千家十職", "窯", "銘", "時代", "産地"),
+    "call_tools_basic": ("使い方", "扱い方", "名称", "用途", "読み方"),
+    "call_setting_analysis": ("設え", "しつらえ", "取合せ", "取り合わせ", "季節", "趣向", "茶室全体"),
+}
+
+# Bare image (no question) -> tool by mode; intermediate users get the planner.
+_BARE_IMAGE_TOOLS = {"beginner": "call_tools_basic", "advanced": "call_tools_analysis"}
+
+
+@dataclass
+class FastRoute:
+    tool: str
+    args: dict
+    reason: str
+
+
+def split_mode_instruction(texts: list[str]) -> tuple[str | None, list[str]]:
+    """Separate a mode-change instruction from the user's own text."""
+    mode = None
+    rest: list[str] = []
+    for text in texts:
+        prefix = next((p for p in _MODE_PREFIXES if text.startswith(p)), None)
+        if prefix is not None:
+            mode = _MODE_PREFIXES[prefix]
+        elif text.strip():
+            rest.append(text.strip())
+    return mode, rest
+
+
+def route(*, mode: str, user_text: str, vision: list[str]) -> FastRoute | None:
+    """Return the obvious tool call for this turn, or ``None`` to defer to the planner."""
+    text = user_text.strip()
+    if text:
+        for pattern in _TRANSLATE_PATTERNS:
+            m = pattern.match(text)
+            if m:
+                lang = _LANGUAGES[m.group("lang").lower()]
+                return FastRoute("call_translation", {"text": m.group("text").strip(), "target_language": lang}, "translate")
+    observation = "\n\n".join(vision)
+    if not text:
+        tool = _BARE_IMAGE_TOOLS.get(mode)
+        if tool is None or not observation:
+            return None
+        return FastRoute(tool, {"prompt": f"{observation}\n\nこの道具について解説してください。"}, f"bare_image:{mode}")
+    if not observation and not knowledge_base().mentioned(text):
+        return None
+    matched = [tool for tool, words in _INTENTS.items() if any(w in text for w in words)]
+    if len(matched) != 1:
+        return None
+    prompt = f"{observation}\n\n{text}" if observation else text
+    return FastRoute(matched[0], {"prompt": prompt}, "keyword")
+
+
+@dataclass
+class RouterStats:
+    """Counts fast-path decisions and estimates the planner latency they saved."""
+
+    routed: Counter = field(default_factory=Counter)
+    fallbacks: int = 0
+    planner_calls: int = 0
+    planner_latency_ewma_s: float | None = None
+    _pending: dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record_route(self, reason: str) -> None:
+        with self._lock:
+            self.routed[reason] += 1
+
+    def record_fallback(self, invocation_id: str | None) -> None:
+        with self._lock:
+            self.fallbacks += 1
+            if invocation_id:
+                self._pending[invocation_id] = time.perf_counter()
+                # Bound the table in case responses never arrive (disconnects).
+                while len(self._pending) > 256:
+                    self._pending.pop(next(iter(self._pending)))
+
+    def record_planner_response(self, invocation_id: str | None) -> None:
+        """Close the timing of the first planner response after a fallback."""
+        with self._lock:
+            started = self._pending.pop(invocation_id, None) if invocation_id else None
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            self.planner_calls += 1
+            prev = self.planner_latency_ewma_s
+            self.planner_latency_ewma_s = elapsed if prev is None else 0.8 * prev + 0.2 * elapsed
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            saved = sum(self.routed.values())
+            ewma = self.planner_latency_ewma_s
+            return {
+                "routed": dict(self.routed),
+                "llm_routing_calls_saved": saved,
+                "fallbacks": self.fallbacks,
+                "planner_latency_ewma_ms": round(ewma * 1000, 1) if ewma is not None else None,
+                "est_saved_latency_ms": round(saved * ewma * 1000, 1) if ewma is not None else None,
+            }
+
+
+router_stats = RouterStats()
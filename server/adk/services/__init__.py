@@ -1,9 +1,23 @@
-"""Helper utilities for synchronous model invocations used as planner tools."""
+"""Helper utilities for model invocations used as planner tools."""
 
-from .genai import generate_text, generate_with_parts, get_text_from_response
+from .genai import (
+    generate_text,
+    generate_text_async,
+    generate_text_stream_async,
+    generate_with_parts,
+    generate_with_parts_async,
+    generate_with_parts_stream_async,
+    get_text_from_response,
+    run_sync,
+)
 
 __all__ = [
     "generate_text",
+    "generate_text_async",
+    "generate_text_stream_async",
     "generate_with_parts",
+    "generate_with_parts_async",
+    "generate_with_parts_stream_async",
     "get_text_from_response",
+    "run_sync",
 ]
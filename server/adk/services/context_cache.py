@@ -0,0 +1,242 @@
+"""Explicit context caching for large, static sub-agent instructions.
+
+``ANALYSIS_INSTRUCTION``, ``BASIC_INSTRUCTION`` and ``SETTING_INSTRUCTION`` are
+several kilobytes each and would otherwise be resent as ``system_instruction``
+on every call. Agents register them here; the manager lazily creates a
+cached-content handle per (model, instruction), refreshes it before it
+expires, and falls back to the plain instruction whenever caching is
+unavailable (unsupported model, prompt below the minimum size, quota...).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+from google.genai import types
+
+from .env import env_bool, env_float
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheHandle:
+    name: str
+    expires_at: float  # time.monotonic() based
+
+
+class ContextCacheBackend(Protocol):
+    async def create(self, *, model: str, system_instruction: str, ttl_s: float) -> CacheHandle: ...
+
+    async def refresh(self, *, name: str, ttl_s: float) -> float: ...
+
+
+class GenAICacheBackend:
+    """Backend on ``client.aio.caches`` (Gemini API / Vertex AI)."""
+
+    async def create(self, *, model: str, system_instruction: str, ttl_s: float) -> CacheHandle:
+        from .genai import get_client
+
+        cached = await get_client().aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                ttl=f"{int(ttl_s)}s",
+                display_name=f"tea-static-{_digest(system_instruction)[:12]}",
+            ),
+        )
+        return CacheHandle(name=cached.name, expires_at=time.monotonic() + ttl_s)
+
+    async def refresh(self, *, name: str, ttl_s: float) -> float:
+        from .genai import get_client
+
+        await get_client().aio.caches.update(
+            name=name, config=types.UpdateCachedContentConfig(ttl=f"{int(ttl_s)}s")
+        )
+        return time.monotonic() + ttl_s
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Usage:
+    __slots__ = ("calls", "prompt_tokens", "cached_tokens", "latency_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.latency_ms = 0.0
+
+    def as_dict(self) -> dict:
+        billed = self.prompt_tokens - self.cached_tokens
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "billed_input_tokens": billed,
+            "avg_billed_input_tokens": round(billed / self.calls, 1) if self.calls else 0.0,
+            # Non-streaming calls: the whole response is the first token.
+            "avg_time_to_first_token_ms": round(self.latency_ms / self.calls, 1) if self.calls else 0.0,
+        }
+
+
+class ContextCacheManager:
+    """Maps registered static instructions to live cached-content handles."""
+
+    def __init__(
+        self,
+        backend: ContextCacheBackend,
+        *,
+        enabled: bool = True,
+        ttl_s: float = 3600.0,
+        refresh_margin_s: float = 300.0,
+        retry_after_s: float = 600.0,
+    ):
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl_s = ttl_s
+        self.refresh_margin_s = refresh_margin_s
+        self.retry_after_s = retry_after_s
+        self._static: set[str] = set()
+        self._handles: dict[tuple[str, str], CacheHandle] = {}
+        self._unavailable_until: dict[tuple[str, str], float] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._guard = threading.Lock()
+        self._counts = {"creates": 0, "refreshes": 0, "failures": 0, "invalidations": 0}
+        self._usage = {True: _Usage(), False: _Usage()}
+
+    def register(self, instruction: str) -> None:
+        """Mark an instruction as a static prefix worth caching."""
+        with self._guard:
+            self._static.add(_digest(instruction))
+
+    def is_static(self, instruction: str | None) -> bool:
+        return bool(instruction) and _digest(instruction) in self._static
+
+    async def resolve(self, model: str, instruction: str | None) -> str | None:
+        """Return a cached-content name for (model, instruction) or None to send it inline."""
+        if not self.enabled or not self.is_static(instruction):
+            return None
+        key = (model, _digest(instruction))
+        now = time.monotonic()
+        if self._unavailable_until.get(key, 0.0) > now:
+            return None
+        handle = self._handles.get(key)
+        if handle is not None and handle.expires_at - now > self.refresh_margin_s:
+            return handle.name
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            handle = self._handles.get(key)
+            now = time.monotonic()
+            if handle is not None and handle.expires_at - now > self.refresh_margin_s:
+                return handle.name
+            try:
+                if handle is not None and handle.expires_at > now:
+                    handle.expires_at = await self.backend.refresh(name=handle.name, ttl_s=self.ttl_s)
+                    self._counts["refreshes"] += 1
+                else:
+                    handle = await self.backend.create(model=model, system_instruction=instruction, ttl_s=self.ttl_s)
+                    self._handles[key] = handle
+                    self._counts["creates"] += 1
+                    logger.info("[context-cache] created %s for %s", handle.name, model)
+                return handle.name
+            except Exception as e:
+                self._counts["failures"] += 1
+                self._handles.pop(key, None)
+                self._unavailable_until[key] = time.monotonic() + self.retry_after_s
+                logger.warning("[context-cache] unavailable for %s (%s); sending instruction inline", model, e)
+                return None
+
+    def peek(self, model: str, instruction: str | None) -> str | None:
+        """Return a live handle without creating or refreshing one (sync callers)."""
+        if not self.enabled or not self.is_static(instruction):
+            return None
+        handle = self._handles.get((model, _digest(instruction)))
+        if handle is None or handle.expires_at <= time.monotonic():
+            return None
+        return handle.name
+
+    def invalidate(self, model: str, instruction: str) -> None:
+        """Forget a handle the API rejected (expired/deleted) so the next call recreates it."""
+        if self._handles.pop((model, _digest(instruction)), None) is not None:
+            self._counts["invalidations"] += 1
+
+    def record(self, *, cached: bool, response, latency_s: float) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        bucket = self._usage[cached]
+        bucket.calls += 1
+        bucket.latency_ms += latency_s * 1000
+        if usage is not None:
+            bucket.prompt_tokens += getattr(usage, "prompt_token_count", None) or 0
+            bucket.cached_tokens += getattr(usage, "cached_content_token_count", None) or 0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "handles": len(self._handles),
+            **self._counts,
+            "with_cache": self._usage[True].as_dict(),
+            "without_cache": self._usage[False].as_dict(),
+        }
+
+
+_manager: ContextCacheManager | None = None
+_manager_lock = threading.Lock()
+_static_instructions: list[str] = []
+
+
+def register_static_instruction(instruction: str) -> str:
+    """Mark ``instruction`` as cacheable and return it unchanged.
+
+    Agents wrap their module-level instruction constants with this so the
+    registration survives :func:`set_context_cache` swapping the manager.
+    """
+    with _manager_lock:
+        _static_instructions.append(instruction)
+        if _manager is not None:
+            _manager.register(instruction)
+    return instruction
+
+
+def get_context_cache() -> ContextCacheManager:
+    """Return the process-wide manager.
+
+    ``GENAI_CONTEXT_CACHE_ENABLED`` (default off) turns caching on;
+    ``GENAI_CONTEXT_CACHE_TTL_S`` (3600) and
+    ``GENAI_CONTEXT_CACHE_REFRESH_MARGIN_S`` (300) control handle lifetime.
+    Usage counters are collected either way, so the "without cache" baseline
+    is available before enabling it.
+    """
+    global _manager
+    if _manager is not None:
+        return _manager
+    with _manager_lock:
+        if _manager is None:
+            manager = ContextCacheManager(
+                GenAICacheBackend(),
+                enabled=env_bool("GENAI_CONTEXT_CACHE_ENABLED", False),
+                ttl_s=env_float("GENAI_CONTEXT_CACHE_TTL_S", 3600.0),
+                refresh_margin_s=env_float("GENAI_CONTEXT_CACHE_REFRESH_MARGIN_S", 300.0),
+            )
+            for instruction in _static_instructions:
+                manager.register(instruction)
+            _manager = manager
+        return _manager
+
+
+def set_context_cache(manager: ContextCacheManager | None) -> None:
+    """Install a specific manager (tests, fake backends); registered instructions carry over."""
+    global _manager
+    with _manager_lock:
+        if manager is not None:
+            for instruction in _static_instructions:
+                manager.register(instruction)
+        _manager = manager
@@ -0,0 +1,225 @@
+"""Per-turn deadlines and cancellation scopes for in-flight model calls.
+
+The live coordinator binds one :class:`CallScope` per connection through a
+context variable before it starts ``runner.run_live``. ADK copies the context
+into the tasks that execute planner tools, so every model call issued on
+behalf of that connection can find its scope, honour the current turn's
+deadline and be aborted when the client goes away.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+from .env import env_float
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_current_scope: contextvars.ContextVar["CallScope | None"] = contextvars.ContextVar(
+    "genai_call_scope", default=None
+)
+
+_abort_lock = threading.Lock()
+_abort_counts: Counter[tuple[str, str]] = Counter()
+
+
+class CallAborted(RuntimeError):
+    """Raised when a model call is abandoned before the model answered."""
+
+    def __init__(self, reason: str, tool: str):
+        super().__init__(f"{tool} aborted: {reason}")
+        self.reason = reason
+        self.tool = tool
+
+
+class CallScope:
+    """Tracks the deadline and in-flight model calls of one live connection."""
+
+    def __init__(self, connection_id: str, *, user_id: str | None = None, mode: str | None = None):
+        self.connection_id = connection_id
+        self.user_id = user_id
+        # beginner|intermediate|advanced, kept in sync by the coordinator
+        self.mode = mode
+        # Async sink for partial tool output (see adk.services.progress); None = nobody listening
+        self.progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None
+        # Incremented per user turn; used to attribute token usage (see adk.services.usage)
+        self.turn = 0
+        self._deadline: float | None = None
+        self._tasks: set[asyncio.Future] = set()
+        self._closed_reason: str | None = None
+        self._close_callbacks: list[Callable[["CallScope"], None]] = []
+
+    @property
+    def closed(self) -> bool:
+        return self._closed_reason is not None
+
+    @property
+    def closed_reason(self) -> str | None:
+        return self._closed_reason
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def start_turn(self, timeout: float | None) -> None:
+        """Start a new turn and reset its deadline; ``None`` or a non-positive value disables it."""
+        self.turn += 1
+        self._deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+
+    def remaining(self) -> float | None:
+        """Seconds left in the current turn, or ``None`` when no deadline is set."""
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+
+    def track(self, fut: asyncio.Future) -> None:
+        self._tasks.add(fut)
+        fut.add_done_callback(self._tasks.discard)
+
+    def on_close(self, callback: Callable[["CallScope"], None]) -> None:
+        """Run ``callback(scope)`` once when the scope closes (per-connection cleanup)."""
+        if self.closed:
+            callback(self)
+        else:
+            self._close_callbacks.append(callback)
+
+    def close(self, reason: str) -> int:
+        """Abort every outstanding call and refuse new ones. Returns the abort count."""
+        if self._closed_reason is None:
+            self._closed_reason = reason
+            callbacks, self._close_callbacks = self._close_callbacks, []
+            for callback in callbacks:
+                try:
+                    callback(self)
+                except Exception:
+                    logger.exception("[scope] close callback failed for %s", self.connection_id)
+        pending = [t for t in self._tasks if not t.done()]
+        for t in pending:
+            t.cancel()
+        if pending:
+            logger.info(
+                "[scope] %s closed (%s): cancelled %d in-flight call(s)",
+                self.connection_id,
+                reason,
+                len(pending),
+            )
+        return len(pending)
+
+
+def current_scope() -> CallScope | None:
+    """Return the scope bound to the running task, if any."""
+    return _current_scope.get()
+
+
+@contextmanager
+def bind_scope(scope: CallScope | None) -> Iterator[CallScope | None]:
+    """Bind ``scope`` for the duration of the block (inherited by child tasks)."""
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+@lru_cache(maxsize=8)
+def _parse_timeouts(raw: str) -> dict[str, float]:
+    timeouts: dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            timeouts[name.strip()] = float(value)
+        except ValueError:
+            logger.warning("Ignoring invalid GENAI_TOOL_TIMEOUTS entry: %s", item)
+    return timeouts
+
+
+def tool_timeout(tool: str) -> float | None:
+    """Return the per-tool timeout in seconds.
+
+    ``GENAI_TOOL_TIMEOUTS`` holds overrides such as
+    ``summarize_image=15,analyze_setting=25``; other tools fall back to
+    ``GENAI_TOOL_TIMEOUT_S`` (default 30). Non-positive values disable it.
+    """
+    overrides = _parse_timeouts(os.getenv("GENAI_TOOL_TIMEOUTS", ""))
+    value = overrides.get(tool, env_float("GENAI_TOOL_TIMEOUT_S", 30.0))
+    return value if value > 0 else None
+
+
+def record_abort(tool: str, reason: str) -> None:
+    with _abort_lock:
+        _abort_counts[(tool, reason)] += 1
+
+
+def abort_stats() -> dict:
+    """Return abort counters as ``{"total": n, "by_tool": {tool: {reason: n}}}``."""
+    with _abort_lock:
+        items = list(_abort_counts.items())
+    by_tool: dict[str, dict[str, int]] = {}
+    for (tool, reason), count in items:
+        by_tool.setdefault(tool, {})[reason] = count
+    return {"total": sum(c for _, c in items), "by_tool": by_tool}
+
+
+def reset_abort_stats() -> None:
+    with _abort_lock:
+        _abort_counts.clear()
+
+
+async def guard_call(awaitable: Awaitable[T], *, tool: str) -> T:
+    """Await a model call under the bound scope's deadline and the tool timeout.
+
+    Raises :class:`CallAborted` when the turn deadline or tool timeout expires
+    or when the scope is closed (client disconnect, SSE teardown) mid-call.
+    """
+    scope = current_scope()
+    timeout = tool_timeout(tool)
+    timeout_reason = "timeout"
+    if scope is not None:
+        if scope.closed:
+            _discard(awaitable)
+            record_abort(tool, scope.closed_reason or "closed")
+            raise CallAborted(scope.closed_reason or "closed", tool)
+        remaining = scope.remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                _discard(awaitable)
+                record_abort(tool, "deadline")
+                raise CallAborted("deadline", tool)
+            if timeout is None or remaining < timeout:
+                timeout, timeout_reason = remaining, "deadline"
+
+    fut = asyncio.ensure_future(awaitable)
+    if scope is not None:
+        scope.track(fut)
+    try:
+        return await asyncio.wait_for(fut, timeout)
+    except asyncio.TimeoutError:
+        record_abort(tool, timeout_reason)
+        raise CallAborted(timeout_reason, tool) from None
+    except asyncio.CancelledError:
+        if scope is not None and scope.closed and fut.cancelled():
+            current = asyncio.current_task()
+            if current is None or not current.cancelling():
+                record_abort(tool, scope.closed_reason or "closed")
+                raise CallAborted(scope.closed_reason or "closed", tool) from None
+        record_abort(tool, "cancelled")
+        raise
+
+
+def _discard(awaitable: Awaitable) -> None:
+    close = getattr(awaitable, "close", None)
+    if callable(close):
+        close()
@@ -1,58 +1,362 @@
-"""Low-level helpers for calling Gemini models synchronously."""
+"""Low-level helpers for calling Gemini models (sync and asyncio)."""
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from functools import lru_cache
-from typing import Iterable
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
 
+import httpx
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+
+from .context_cache import get_context_cache
+from .deadline import CallAborted, guard_call, record_abort
+from .env import env_float, env_int
+from .hedging import get_hedge_policy
+from .limiter import LimiterRejected, get_model_limiter
+from .model_router import PRIMARY, get_model_router
+from .progress import ProgressReporter, progress_reporter
+from .response_cache import ResponseCache, get_response_cache
+from .usage import usage_ledger
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Bounded pool used when a blocking call has to be bridged into asyncio.
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Credentials:
+    """The subset of the environment that decides which backend a client talks to."""
+
+    api_key: str = ""
+    project: str = ""
+    location: str = ""
+
+    @classmethod
+    def from_env(cls) -> "Credentials":
+        return cls(
+            api_key=os.getenv("GOOGLE_API_KEY", ""),
+            project=os.getenv("GOOGLE_CLOUD_PROJECT", ""),
+            location=os.getenv("GOOGLE_CLOUD_LOCATION", ""),
+        )
 
-@lru_cache(maxsize=1)
-def _create_client(
-    api_key: str,
-    project: str,
-    location: str,
-    use_vertex: bool,
-) -> genai.Client:
-    """Instantiate a cached GenAI client based on the active credentials."""
-    kwargs: dict[str, object] = {}
+    @property
+    def use_vertex(self) -> bool:
+        return _should_use_vertex(self.api_key, self.project, self.location)
+
+
+def _should_use_vertex(api_key: str, project: str, location: str) -> bool:
+    """Return True when Vertex credentials should be used instead of API key."""
     if api_key:
-        kwargs["api_key"] = api_key
-    if use_vertex:
+        return False
+    return bool(project and location)
+
+
+def _build_client(credentials: Credentials, http_options: types.HttpOptions) -> genai.Client:
+    """Instantiate a GenAI client for ``credentials`` with the pool's HTTP settings."""
+    kwargs: dict[str, object] = {"http_options": http_options}
+    if credentials.api_key:
+        kwargs["api_key"] = credentials.api_key
+    if credentials.use_vertex:
         kwargs["vertexai"] = True
-        if project:
-            kwargs["project"] = project
-        if location:
-            kwargs["location"] = location
+        if credentials.project:
+            kwargs["project"] = credentials.project
+        if credentials.location:
+            kwargs["location"] = credentials.location
     logger.debug(
         "Creating GenAI client (vertex=%s project=%s location=%s)",
-        use_vertex,
-        project,
-        location,
+        credentials.use_vertex,
+        credentials.project,
+        credentials.location,
     )
     return genai.Client(**kwargs)
 
 
-def _should_use_vertex(api_key: str, project: str, location: str) -> bool:
-    """Return True when Vertex credentials should be used instead of API key."""
-    if api_key:
-        return False
-    return bool(project and location)
+@lru_cache(maxsize=8)
+def _parse_model_limits(raw: str) -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            logger.warning("Ignoring invalid GENAI_MODEL_CONCURRENCY entry: %s", item)
+    return limits
+
+
+@dataclass
+class _ModelUsage:
+    limit: int
+    calls: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    queued: int = 0
+    waits: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "limit": self.limit or None,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queued": self.queued,
+            "waits": self.waits,
+            "avg_wait_ms": round(self.wait_total_s / self.waits * 1000, 1) if self.waits else 0.0,
+            "max_wait_ms": round(self.wait_max_s * 1000, 1),
+        }
+
+
+class ClientPool:
+    """Shared GenAI client with a sized HTTP pool and per-model concurrency limits.
+
+    Every tool goes through one ``genai.Client`` whose httpx pools are sized by
+    ``max_connections`` / ``max_keepalive`` and keep idle connections for
+    ``keepalive_expiry_s``. Async model calls first take a per-model slot, so a
+    burst of sessions queues in-process instead of piling onto the backend.
+    Credentials are read once; :meth:`refresh` rebuilds the client when they
+    change and closes the previous one after its in-flight calls finish.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive: int = 50,
+        keepalive_expiry_s: float = 30.0,
+        model_limits: dict[str, int] | None = None,
+        default_model_limit: int = 32,
+        factory: Callable[[Credentials, types.HttpOptions], genai.Client] = _build_client,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry_s = keepalive_expiry_s
+        self.model_limits = dict(model_limits or {})
+        self.default_model_limit = default_model_limit
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._client: genai.Client | None = None
+        self._credentials: Credentials | None = None
+        self._generation = 0
+        self._leases: Counter = Counter()
+        self._retired: dict[int, genai.Client] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._usage: dict[str, _ModelUsage] = {}
+        self._rebuilds = 0
+
+    @classmethod
+    def from_env(cls) -> "ClientPool":
+        return cls(
+            max_connections=max(1, env_int("GENAI_HTTP_MAX_CONNECTIONS", 100)),
+            max_keepalive=max(0, env_int("GENAI_HTTP_MAX_KEEPALIVE", 50)),
+            keepalive_expiry_s=env_float("GENAI_HTTP_KEEPALIVE_S", 30.0),
+            model_limits=_parse_model_limits(os.getenv("GENAI_MODEL_CONCURRENCY", "")),
+            default_model_limit=env_int("GENAI_MODEL_CONCURRENCY_DEFAULT", 32),
+        )
+
+    def http_options(self) -> types.HttpOptions:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+        return types.HttpOptions(client_args={"limits": limits}, async_client_args={"limits": limits})
+
+    def client(self) -> genai.Client:
+        """Return the shared client, building it from the environment on first use."""
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                self._install(Credentials.from_env())
+            return self._client
+
+    def refresh(self, credentials: Credentials | None = None) -> bool:
+        """Rebuild the client if the credentials changed; returns True when it did."""
+        credentials = credentials or Credentials.from_env()
+        with self._lock:
+            if self._client is None or credentials == self._credentials:
+                return False
+            old, generation = self._client, self._generation
+            self._install(credentials)
+            self._rebuilds += 1
+            if self._leases[generation]:
+                # Closed by the last call still using it (see ``_release``).
+                self._retired[generation] = old
+                old = None
+        logger.info("GenAI credentials changed; rebuilt client (vertex=%s)", credentials.use_vertex)
+        if old is not None:
+            _close_client(old)
+        return True
+
+    def _install(self, credentials: Credentials) -> None:
+        self._client = self._factory(credentials, self.http_options())
+        self._credentials = credentials
+        self._generation += 1
+
+    def limit_for(self, model: str) -> int:
+        return self.model_limits.get(model, self.default_model_limit)
+
+    def has_capacity(self, model: str) -> bool:
+        """True when a call to ``model`` would get a slot without queueing."""
+        semaphore = self._semaphores.get(model)
+        return semaphore is None or not semaphore.locked()
+
+    @asynccontextmanager
+    async def slot(self, model: str):
+        """Hold one of ``model``'s concurrent-call slots for the duration of the block."""
+        limit = self.limit_for(model)
+        with self._lock:
+            usage = self._usage.get(model)
+            if usage is None:
+                usage = self._usage[model] = _ModelUsage(limit)
+            semaphore = self._semaphores.get(model)
+            if semaphore is None and limit > 0:
+                semaphore = self._semaphores[model] = asyncio.Semaphore(limit)
+            usage.queued += 1
+        started = time.perf_counter()
+        contended = semaphore is not None and semaphore.locked()
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+        finally:
+            with self._lock:
+                usage.queued -= 1
+        waited = time.perf_counter() - started
+        with self._lock:
+            usage.calls += 1
+            usage.in_flight += 1
+            usage.peak_in_flight = max(usage.peak_in_flight, usage.in_flight)
+            if contended:
+                usage.waits += 1
+                usage.wait_total_s += waited
+                usage.wait_max_s = max(usage.wait_max_s, waited)
+            generation = self._generation
+            self._leases[generation] += 1
+        try:
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+            with self._lock:
+                usage.in_flight -= 1
+            retired = self._release(generation)
+            if retired is not None:
+                await _aclose_client(retired)
+
+    @contextmanager
+    def lease(self):
+        """Mark a blocking call on the current client so a rebuild does not close it mid-call."""
+        with self._lock:
+            generation = self._generation
+            self._leases[generation] += 1
+        try:
+            yield
+        finally:
+            retired = self._release(generation)
+            if retired is not None:
+                _close_client(retired)
+
+    def _release(self, generation: int) -> genai.Client | None:
+        with self._lock:
+            self._leases[generation] -= 1
+            if self._leases[generation] > 0:
+                return None
+            del self._leases[generation]
+            return self._retired.pop(generation, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            client = self._client
+            return {
+                "http": {
+                    "max_connections": self.max_connections,
+                    "max_keepalive": self.max_keepalive,
+                    "keepalive_expiry_s": self.keepalive_expiry_s,
+                    "connections": _http_pool_usage(client),
+                },
+                "backend": None if self._credentials is None else ("vertex" if self._credentials.use_vertex else "api_key"),
+                "rebuilds": self._rebuilds,
+                "retired_pending": len(self._retired),
+                "models": {model: usage.as_dict() for model, usage in self._usage.items()},
+            }
+
+
+def _close_client(client: genai.Client) -> None:
+    try:
+        client.close()
+    except Exception:
+        logger.debug("Error closing retired GenAI client", exc_info=True)
+
+
+async def _aclose_client(client: genai.Client) -> None:
+    _close_client(client)
+    try:
+        await client.aio.aclose()
+    except Exception:
+        logger.debug("Error closing retired GenAI async client", exc_info=True)
+
+
+def _http_pool_usage(client: genai.Client | None) -> dict | None:
+    """Open/idle connections of the async httpx pool (best effort; httpcore internals)."""
+    try:
+        pool = client._api_client._async_httpx_client._transport._pool  # type: ignore[union-attr]
+        connections = list(pool.connections)
+    except Exception:
+        return None
+    idle = sum(1 for c in connections if c.is_idle())
+    return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+
+_pool: ClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide client pool.
+
+    HTTP pool sizes come from ``GENAI_HTTP_MAX_CONNECTIONS`` (100),
+    ``GENAI_HTTP_MAX_KEEPALIVE`` (50) and ``GENAI_HTTP_KEEPALIVE_S`` (30).
+    ``GENAI_MODEL_CONCURRENCY`` holds per-model limits such as
+    ``gemini-2.0-flash-exp=32,gemini-2.5-pro=8``; other models use
+    ``GENAI_MODEL_CONCURRENCY_DEFAULT`` (32). Non-positive limits disable it.
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ClientPool.from_env()
+        return _pool
+
+
+def set_client_pool(pool: ClientPool | None) -> None:
+    """Install a specific pool (tests); ``None`` rebuilds from the environment on next use."""
+    global _pool
+    with _pool_lock:
+        _pool = pool
 
 
 def get_client() -> genai.Client:
-    """Return a cached GenAI client using either API key or Vertex settings."""
-    api_key = os.getenv("GOOGLE_API_KEY", "")
-    project = os.getenv("GOOGLE_CLOUD_PROJECT", "")
-    location = os.getenv("GOOGLE_CLOUD_LOCATION", "")
-    use_vertex = _should_use_vertex(api_key, project, location)
-    return _create_client(api_key, project, location, use_vertex)
+    """Return the shared GenAI client using either API key or Vertex settings."""
+    return get_client_pool().client()
 
 
 def _ensure_config(
@@ -68,18 +372,74 @@ def _ensure_config(
     return cfg
 
 
+def _cache_lookup(
+    cache: ResponseCache | None,
+    *,
+    tool: str,
+    model: str,
+    instruction: str,
+    prompt: str,
+    config: types.GenerateContentConfig | None,
+) -> tuple[str | None, types.GenerateContentResponse | None]:
+    """Return ``(key, cached_response)``; key is None when the call is not cacheable."""
+    if cache is None or cache.ttl_for(tool) <= 0:
+        return None, None
+    key = cache.make_key(model=model, instruction=instruction, prompt=prompt, config=config)
+    payload = cache.get(key)
+    if payload is None:
+        return key, None
+    try:
+        return key, types.GenerateContentResponse.model_validate_json(payload)
+    except Exception:
+        logger.warning("Discarding undecodable cached response for %s", tool)
+        return key, None
+
+
+def _cache_store(
+    cache: ResponseCache | None,
+    key: str | None,
+    response: types.GenerateContentResponse,
+    *,
+    tool: str,
+) -> None:
+    # Only keep answers that actually carry text; errors and empty candidates are retried.
+    if cache is None or key is None or not get_text_from_response(response):
+        return
+    try:
+        cache.put(key, response.model_dump_json(exclude_none=True), tool=tool)
+    except Exception:
+        logger.warning("Failed to store response for %s in cache", tool, exc_info=True)
+
+
 def generate_text(
     *,
     model: str,
     instruction: str,
     prompt: str,
     config: types.GenerateContentConfig | None = None,
+    tool: str = "generate_text",
+    use_cache: bool = True,
 ) -> types.GenerateContentResponse:
-    """Call the text model with a single user prompt and instruction."""
+    """Call the text model with a single user prompt and instruction.
+
+    When ``GENAI_RESPONSE_CACHE_PATH`` is set, responses are served from and
+    stored in the disk cache unless ``use_cache`` is False. Answers from the
+    model router's fallback tier are not stored.
+    """
     prompt_text = prompt.strip()
+    cache = get_response_cache() if use_cache else None
+    key, cached = _cache_lookup(
+        cache, tool=tool, model=model, instruction=instruction, prompt=prompt_text, config=config
+    )
+    if cached is not None:
+        return cached
     contents = [types.Content(role="user", parts=[types.Part.from_text(text=prompt_text)])]
     cfg = _ensure_config(config=config, system_instruction=instruction)
-    return get_client().models.generate_content(model=model, contents=contents, config=cfg)
+    response, tier = _generate_content(model=model, contents=contents, config=cfg, tool=tool, instruction=instruction)
+    # The key names the requested model: a fallback-tier answer must not outlive the degradation
+    if tier == PRIMARY:
+        _cache_store(cache, key, response, tool=tool)
+    return response
 
 
 def generate_with_parts(
@@ -88,11 +448,405 @@ def generate_with_parts(
     instruction: str,
     parts: Iterable[types.Part],
     config: types.GenerateContentConfig | None = None,
+    tool: str = "generate_with_parts",
 ) -> types.GenerateContentResponse:
     """Call the model with pre-built parts (e.g., inline images)."""
     content = types.Content(role="user", parts=list(parts))
     cfg = _ensure_config(config=config, system_instruction=instruction)
-    return get_client().models.generate_content(model=model, contents=[content], config=cfg)
+    response, _ = _generate_content(model=model, contents=[content], config=cfg, tool=tool, instruction=instruction)
+    return response
+
+
+def _generate_content(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    tool: str,
+    instruction: str | None,
+) -> tuple[types.GenerateContentResponse, str]:
+    """Sync model call on the routed tier; returns the response and the tier that served it."""
+    router = get_model_router()
+    model, tier = router.select(tool, model)
+    started = time.perf_counter()
+    # Sync callers share the adaptive limit; LimiterRejected propagates to them.
+    try:
+        with get_model_limiter().acquire_sync(), get_client_pool().lease():
+            client = get_client()
+            response = None
+            # Sync callers reuse a live cached-content handle but never create one.
+            cached_name = get_context_cache().peek(model, instruction) if instruction else None
+            if cached_name is not None:
+                try:
+                    response = client.models.generate_content(
+                        model=model, contents=contents, config=_with_cached_content(config, cached_name)
+                    )
+                except errors.ClientError:
+                    get_context_cache().invalidate(model, instruction)
+            if response is None:
+                response = client.models.generate_content(model=model, contents=contents, config=config)
+    except LimiterRejected:
+        raise
+    except Exception:
+        router.record(tool, model, tier, latency_s=time.perf_counter() - started, ok=False)
+        raise
+    router.record(tool, model, tier, latency_s=time.perf_counter() - started, ok=True)
+    usage_ledger.record(tool=tool, model=model, usage=getattr(response, "usage_metadata", None))
+    return response, tier
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared executor for sync fallbacks.
+
+    The worker count is read once from ``GENAI_SYNC_WORKERS`` (default 8) so a
+    burst of blocking calls queues up instead of spawning unbounded threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, env_int("GENAI_SYNC_WORKERS", 8))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="genai-sync")
+            logger.debug("Created GenAI sync executor (workers=%d)", workers)
+        return _executor
+
+
+def shutdown_executor(wait: bool = False) -> None:
+    """Tear down the sync executor (used on reconfiguration and in tests)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
+
+
+async def run_sync(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the bounded executor without stalling the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+_MODEL_FAULT_ABORTS = ("timeout",)
+
+
+def _with_cached_content(
+    config: types.GenerateContentConfig | None, cached_name: str
+) -> types.GenerateContentConfig:
+    """Swap the inline system instruction for a cached-content reference."""
+    base = config if config is not None else types.GenerateContentConfig()
+    return base.model_copy(update={"cached_content": cached_name, "system_instruction": None})
+
+
+async def _generate_content_async(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    tool: str,
+    instruction: str | None = None,
+    reporter: ProgressReporter | None = None,
+) -> types.GenerateContentResponse:
+    """Guarded model call on the tier the model router picks for ``tool``."""
+    response, _ = await _generate_routed_async(
+        model=model, contents=contents, config=config, tool=tool, instruction=instruction, reporter=reporter
+    )
+    return response
+
+
+async def _generate_routed_async(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    tool: str,
+    instruction: str | None = None,
+    reporter: ProgressReporter | None = None,
+) -> tuple[types.GenerateContentResponse, str]:
+    """:func:`_generate_content_async` that also returns the tier that served the call."""
+    router = get_model_router()
+    routed, tier = router.select(tool, model)
+    started = time.perf_counter()
+    try:
+        response = await _generate_on_model_async(
+            model=routed, contents=contents, config=config, tool=tool, instruction=instruction, reporter=reporter
+        )
+    except CallAborted as e:
+        # Disconnects and turn deadlines say nothing about the model; tool timeouts do.
+        if e.reason in _MODEL_FAULT_ABORTS:
+            router.record(tool, routed, tier, latency_s=time.perf_counter() - started, ok=False)
+        raise
+    except Exception:
+        router.record(tool, routed, tier, latency_s=time.perf_counter() - started, ok=False)
+        raise
+    router.record(tool, routed, tier, latency_s=time.perf_counter() - started, ok=True)
+    usage_ledger.record(tool=tool, model=routed, usage=getattr(response, "usage_metadata", None))
+    return response, tier
+
+
+async def _generate_on_model_async(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    tool: str,
+    instruction: str | None,
+    reporter: ProgressReporter | None,
+) -> types.GenerateContentResponse:
+    """Registered static ``instruction``s go through context caching."""
+    manager = get_context_cache()
+    cached_name = await manager.resolve(model, instruction)
+    if cached_name is not None:
+        started = time.perf_counter()
+        try:
+            response = await _guarded(
+                _call_model_hedged(
+                    model=model,
+                    contents=contents,
+                    config=_with_cached_content(config, cached_name),
+                    tool=tool,
+                    reporter=reporter,
+                ),
+                tool=tool,
+            )
+        except errors.ClientError as e:
+            # Expired or deleted handle: forget it and answer inline this time.
+            logger.warning("Cached content %s rejected (%s); retrying inline", cached_name, e)
+            manager.invalidate(model, instruction)
+        else:
+            manager.record(cached=True, response=response, latency_s=time.perf_counter() - started)
+            return response
+    started = time.perf_counter()
+    response = await _guarded(
+        _call_model_hedged(model=model, contents=contents, config=config, tool=tool, reporter=reporter),
+        tool=tool,
+    )
+    if manager.is_static(instruction):
+        manager.record(cached=False, response=response, latency_s=time.perf_counter() - started)
+    return response
+
+
+async def _guarded(call: Awaitable[T], *, tool: str) -> T:
+    """:func:`guard_call` that also reports adaptive-limiter rejections as aborts."""
+    try:
+        return await guard_call(call, tool=tool)
+    except LimiterRejected:
+        record_abort(tool, "overloaded")
+        raise CallAborted("overloaded", tool) from None
+
+
+async def _call_model_hedged(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    tool: str,
+    reporter: ProgressReporter | None = None,
+) -> types.GenerateContentResponse:
+    """Model call that may be hedged with a duplicate request (see :mod:`adk.services.hedging`)."""
+    pool = get_client_pool()
+    limiter = get_model_limiter()
+    return await get_hedge_policy().run(
+        tool,
+        lambda attempt_reporter: _call_model_async(
+            model=model, contents=contents, config=config, reporter=attempt_reporter
+        ),
+        reporter=reporter,
+        has_capacity=lambda: limiter.has_capacity() and pool.has_capacity(model),
+    )
+
+
+async def _call_model_async(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    reporter: ProgressReporter | None = None,
+) -> types.GenerateContentResponse:
+    # Both slots are held for the whole call, streaming included. Quota errors
+    # raised inside shrink the adaptive limit (see :mod:`adk.services.limiter`).
+    async with get_model_limiter().acquire(), get_client_pool().slot(model):
+        return await _call_client_async(model=model, contents=contents, config=config, reporter=reporter)
+
+
+async def _call_client_async(
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    reporter: ProgressReporter | None,
+) -> types.GenerateContentResponse:
+    client = get_client()
+    aio = getattr(client, "aio", None)
+    if aio is not None:
+        if reporter is not None and hasattr(aio.models, "generate_content_stream"):
+            return await _stream_model_async(aio, model=model, contents=contents, config=config, reporter=reporter)
+        return await aio.models.generate_content(model=model, contents=contents, config=config)
+    # Older clients without the asyncio surface: bridge through the executor.
+    response = await run_sync(client.models.generate_content, model=model, contents=contents, config=config)
+    if reporter is not None:
+        await reporter.text(get_text_from_response(response))
+    return response
+
+
+async def _stream_model_async(
+    aio: Any,
+    *,
+    model: str,
+    contents: list[types.Content],
+    config: types.GenerateContentConfig | None,
+    reporter: ProgressReporter,
+) -> types.GenerateContentResponse:
+    """Consume ``generate_content_stream``, forwarding deltas, and return one merged response."""
+    pieces: list[str] = []
+    last: types.GenerateContentResponse | None = None
+    async for chunk in await aio.models.generate_content_stream(model=model, contents=contents, config=config):
+        last = chunk
+        delta = "".join(
+            part.text
+            for candidate in (chunk.candidates or [])[:1]
+            for part in ((candidate.content.parts or []) if candidate.content else [])
+            if part.text
+        )
+        if delta:
+            pieces.append(delta)
+            await reporter.text(delta)
+    if last is None:
+        return types.GenerateContentResponse(candidates=[])
+    merged = types.Content(role="model", parts=[types.Part.from_text(text="".join(pieces))])
+    candidate = last.candidates[0] if last.candidates else types.Candidate()
+    # The final chunk carries finish_reason and usage_metadata for the whole stream.
+    return last.model_copy(update={"candidates": [candidate.model_copy(update={"content": merged})]})
+
+
+async def generate_text_async(
+    *,
+    model: str,
+    instruction: str,
+    prompt: str,
+    config: types.GenerateContentConfig | None = None,
+    tool: str = "generate_text",
+    use_cache: bool = True,
+) -> types.GenerateContentResponse:
+    """Async counterpart of :func:`generate_text` built on ``client.aio``.
+
+    ``tool`` names the caller for per-tool timeouts, cache TTLs and abort
+    accounting; the call is aborted when the bound connection scope closes or
+    its turn deadline passes (see :mod:`adk.services.deadline`).
+    """
+    return await _generate_text_async(
+        model=model, instruction=instruction, prompt=prompt, config=config, tool=tool, use_cache=use_cache
+    )
+
+
+async def generate_text_stream_async(
+    *,
+    model: str,
+    instruction: str,
+    prompt: str,
+    config: types.GenerateContentConfig | None = None,
+    tool: str = "generate_text",
+    use_cache: bool = True,
+) -> types.GenerateContentResponse:
+    """Streaming variant of :func:`generate_text_async`.
+
+    Text deltas are forwarded to the client of the bound scope as
+    ``tool_progress`` messages (see :mod:`adk.services.progress`) while the
+    merged response is still returned to the caller. Without a listening
+    client this is a plain non-streaming call.
+    """
+    reporter = progress_reporter(tool)
+    return await _with_progress(
+        reporter,
+        _generate_text_async(
+            model=model,
+            instruction=instruction,
+            prompt=prompt,
+            config=config,
+            tool=tool,
+            use_cache=use_cache,
+            reporter=reporter,
+        ),
+    )
+
+
+async def _generate_text_async(
+    *,
+    model: str,
+    instruction: str,
+    prompt: str,
+    config: types.GenerateContentConfig | None,
+    tool: str,
+    use_cache: bool,
+    reporter: ProgressReporter | None = None,
+) -> types.GenerateContentResponse:
+    prompt_text = prompt.strip()
+    cache = get_response_cache() if use_cache else None
+    key, cached = None, None
+    if cache is not None:
+        key, cached = await run_sync(
+            _cache_lookup, cache, tool=tool, model=model, instruction=instruction, prompt=prompt_text, config=config
+        )
+    if cached is not None:
+        if reporter is not None:
+            await reporter.text(get_text_from_response(cached))
+        return cached
+    contents = [types.Content(role="user", parts=[types.Part.from_text(text=prompt_text)])]
+    cfg = _ensure_config(config=config, system_instruction=instruction)
+    response, tier = await _generate_routed_async(
+        model=model, contents=contents, config=cfg, tool=tool, instruction=instruction, reporter=reporter
+    )
+    # The key names the requested model: a fallback-tier answer must not outlive the degradation
+    if key is not None and tier == PRIMARY:
+        await run_sync(_cache_store, cache, key, response, tool=tool)
+    return response
+
+
+async def generate_with_parts_async(
+    *,
+    model: str,
+    instruction: str,
+    parts: Iterable[types.Part],
+    config: types.GenerateContentConfig | None = None,
+    tool: str = "generate_with_parts",
+) -> types.GenerateContentResponse:
+    """Async counterpart of :func:`generate_with_parts`."""
+    content = types.Content(role="user", parts=list(parts))
+    cfg = _ensure_config(config=config, system_instruction=instruction)
+    return await _generate_content_async(
+        model=model, contents=[content], config=cfg, tool=tool, instruction=instruction
+    )
+
+
+async def generate_with_parts_stream_async(
+    *,
+    model: str,
+    instruction: str,
+    parts: Iterable[types.Part],
+    config: types.GenerateContentConfig | None = None,
+    tool: str = "generate_with_parts",
+) -> types.GenerateContentResponse:
+    """Streaming variant of :func:`generate_with_parts_async` (see :func:`generate_text_stream_async`)."""
+    reporter = progress_reporter(tool)
+    content = types.Content(role="user", parts=list(parts))
+    cfg = _ensure_config(config=config, system_instruction=instruction)
+    return await _with_progress(
+        reporter,
+        _generate_content_async(
+            model=model, contents=[content], config=cfg, tool=tool, instruction=instruction, reporter=reporter
+        ),
+    )
+
+
+async def _with_progress(reporter: ProgressReporter | None, call: Awaitable[T]) -> T:
+    """Await ``call`` and close the progress stream with a ``done`` message."""
+    if reporter is None:
+        return await call
+    try:
+        result = await call
+    except Exception as e:
+        await reporter.done(error=getattr(e, "reason", None) or type(e).__name__)
+        raise
+    await reporter.done()
+    return result
 
 
 def get_text_from_response(response: types.GenerateContentResponse) -> str:
@@ -0,0 +1,291 @@
+"""Hedged model calls to cut the latency tail of slow sub-agent responses.
+
+A small fraction of ``analyze_setting`` / ``summarize_image`` calls take many
+times the median. When hedging is enabled for a tool, a call that is still
+running after the tool's recent p95 latency gets a duplicate request; the first
+attempt to finish wins and the other is cancelled. For streamed calls the race
+is decided by the first text delta instead, so the client only ever sees one
+stream.
+
+Hedges are paid for by a global token bucket: every call earns ``budget``
+tokens (default 0.05) up to ``burst``, and each hedge spends one, so hedging
+never adds more than ~5% extra model calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeVar
+
+from .env import env_bool, env_float, env_int
+from .progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_TOOLS = ("analyze_setting", "summarize_image")
+
+
+@dataclass
+class _ToolLatency:
+    samples: deque = field(default_factory=lambda: deque(maxlen=256))
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    denied_budget: int = 0
+    denied_capacity: int = 0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class _Race:
+    """Hands the caller's progress reporter to whichever attempt streams first."""
+
+    def __init__(self, reporter: ProgressReporter | None):
+        self.target = reporter
+        self.owner: int | None = None
+        self.claimed_at: float | None = None
+        self.claimed = asyncio.Event()
+
+    def reporter(self, index: int) -> "_RaceReporter | None":
+        return None if self.target is None else _RaceReporter(self, index)
+
+
+class _RaceReporter:
+    def __init__(self, race: _Race, index: int):
+        self._race = race
+        self._index = index
+
+    async def text(self, delta: str) -> None:
+        race = self._race
+        if not delta:
+            return
+        if race.owner is None:
+            race.owner = self._index
+            race.claimed_at = time.perf_counter()
+            race.claimed.set()
+        if race.owner == self._index:
+            await race.target.text(delta)
+
+
+class HedgePolicy:
+    """Per-tool adaptive hedge delay plus a global hedge budget."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        tools: tuple[str, ...] | None = DEFAULT_TOOLS,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        min_delay_s: float = 0.05,
+        max_delay_s: float = 10.0,
+        budget: float = 0.05,
+        burst: float = 5.0,
+    ):
+        self.enabled = enabled
+        self.tools = None if tools is None else frozenset(tools)  # None hedges every tool
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay_s = min_delay_s
+        self.max_delay_s = max_delay_s
+        self.budget = budget
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolLatency] = {}
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        raw = os.getenv("GENAI_HEDGE_TOOLS", "").strip()
+        if raw == "*":
+            tools = None
+        elif raw:
+            tools = tuple(t.strip() for t in raw.split(",") if t.strip())
+        else:
+            tools = DEFAULT_TOOLS
+        return cls(
+            enabled=env_bool("GENAI_HEDGE_ENABLED", False),
+            tools=tools,
+            percentile=env_float("GENAI_HEDGE_PERCENTILE", 95.0) / 100,
+            min_samples=env_int("GENAI_HEDGE_MIN_SAMPLES", 20),
+            min_delay_s=env_float("GENAI_HEDGE_MIN_DELAY_S", 0.05),
+            max_delay_s=env_float("GENAI_HEDGE_MAX_DELAY_S", 10.0),
+            budget=env_float("GENAI_HEDGE_BUDGET", 0.05),
+            burst=env_float("GENAI_HEDGE_BURST", 5.0),
+        )
+
+    def applies(self, tool: str) -> bool:
+        return self.enabled and (self.tools is None or tool in self.tools)
+
+    def _state(self, tool: str) -> _ToolLatency:
+        state = self._tools.get(tool)
+        if state is None:
+            state = self._tools[tool] = _ToolLatency()
+        return state
+
+    def delay_for(self, tool: str) -> float | None:
+        """Current hedge delay for ``tool``; None until enough latencies were observed."""
+        with self._lock:
+            state = self._state(tool)
+            if len(state.samples) < self.min_samples:
+                return None
+            return min(self.max_delay_s, max(self.min_delay_s, state.percentile(self.percentile)))
+
+    def observe(self, tool: str, latency_s: float) -> None:
+        with self._lock:
+            self._state(tool).samples.append(latency_s)
+
+    def _start_call(self, tool: str) -> None:
+        with self._lock:
+            self._state(tool).calls += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+    def _try_spend(self, tool: str) -> bool:
+        with self._lock:
+            state = self._state(tool)
+            if self._tokens < 1:
+                state.denied_budget += 1
+                return False
+            self._tokens -= 1
+            state.hedged += 1
+            return True
+
+    async def run(
+        self,
+        tool: str,
+        attempt: Callable[[ProgressReporter | None], Awaitable[T]],
+        *,
+        reporter: ProgressReporter | None = None,
+        has_capacity: Callable[[], bool] | None = None,
+    ) -> T:
+        """Await ``attempt(reporter)``, hedging it with a second attempt if it runs long."""
+        if not self.applies(tool):
+            return await attempt(reporter)
+        # Streamed calls race on time to first delta, so they keep their own latency window.
+        key = tool if reporter is None else f"{tool}:stream"
+        self._start_call(key)
+        delay = self.delay_for(key)
+        started = time.perf_counter()
+        race = _Race(reporter)
+        tasks = [asyncio.ensure_future(attempt(race.reporter(0)))]
+        claim = asyncio.ensure_future(race.claimed.wait())
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({tasks[0], claim}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if has_capacity is not None and not has_capacity():
+                        with self._lock:
+                            self._state(key).denied_capacity += 1
+                    elif self._try_spend(key):
+                        logger.debug("[hedge] %s still running after %.0f ms; sending duplicate", key, delay * 1000)
+                        tasks.append(asyncio.ensure_future(attempt(race.reporter(1))))
+            index, result = await self._first(tasks, race, claim)
+        finally:
+            claim.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        self.observe(key, (race.claimed_at or time.perf_counter()) - started)
+        if index == 1:
+            with self._lock:
+                self._state(key).hedge_wins += 1
+        return result
+
+    @staticmethod
+    async def _first(
+        tasks: list[asyncio.Future], race: _Race, claim: asyncio.Future
+    ) -> tuple[int, T]:
+        """Return ``(index, result)`` of the attempt that wins.
+
+        The winner is the first attempt to succeed or, for streamed calls, the
+        first one to emit text.
+        """
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            waiters = pending | ({claim} if not claim.done() else set())
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            if race.owner is not None:
+                # One attempt is already streaming to the client: drop the others.
+                for i, task in enumerate(tasks):
+                    if i != race.owner and task in pending:
+                        task.cancel()
+                        pending.discard(task)
+            for task in done & pending:
+                pending.discard(task)
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    return tasks.index(task), task.result()
+                error = error or task.exception()
+        if error is None:
+            raise asyncio.CancelledError()
+        raise error
+
+    def stats(self) -> dict:
+        with self._lock:
+            tools = {}
+            for tool, state in self._tools.items():
+                p50, p95, p99 = (state.percentile(q) for q in (0.5, 0.95, 0.99))
+                tools[tool] = {
+                    "calls": state.calls,
+                    "hedged": state.hedged,
+                    "hedge_wins": state.hedge_wins,
+                    "denied_budget": state.denied_budget,
+                    "denied_capacity": state.denied_capacity,
+                    "samples": len(state.samples),
+                    "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+                    "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+                    "p99_ms": None if p99 is None else round(p99 * 1000, 1),
+                }
+            calls = sum(s.calls for s in self._tools.values())
+            hedged = sum(s.hedged for s in self._tools.values())
+            return {
+                "enabled": self.enabled,
+                "budget": self.budget,
+                "tokens": round(self._tokens, 3),
+                "extra_call_ratio": round(hedged / calls, 4) if calls else 0.0,
+                "tools": tools,
+            }
+
+
+_policy: HedgePolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """Return the process-wide policy.
+
+    ``GENAI_HEDGE_ENABLED`` (default off) turns hedging on for
+    ``GENAI_HEDGE_TOOLS`` (default ``analyze_setting,summarize_image``; ``*``
+    for all). The delay is the tool's ``GENAI_HEDGE_PERCENTILE`` (95) latency
+    once ``GENAI_HEDGE_MIN_SAMPLES`` (20) calls were seen, clamped to
+    ``GENAI_HEDGE_MIN_DELAY_S`` / ``GENAI_HEDGE_MAX_DELAY_S``; the extra-call
+    budget is ``GENAI_HEDGE_BUDGET`` (0.05) with ``GENAI_HEDGE_BURST`` (5).
+    """
+    global _policy
+    if _policy is not None:
+        return _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = HedgePolicy.from_env()
+        return _policy
+
+
+def set_hedge_policy(policy: HedgePolicy | None) -> None:
+    """Install a specific policy (tests, benchmarks); ``None`` re-reads the environment."""
+    global _policy
+    with _policy_lock:
+        _policy = policy
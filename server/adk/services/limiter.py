@@ -0,0 +1,286 @@
+"""AIMD concurrency limiter that follows the backend's real quota.
+
+A fixed ``LIVE_SESSIONS_MAX`` is either too low (idle quota) or too high
+(RESOURCE_EXHAUSTED storms). :class:`AdaptiveLimiter` starts at its ceiling,
+halves its limit when a call fails with a quota error (429 /
+RESOURCE_EXHAUSTED), and adds one slot after each full window of successful
+calls made while the limit was actually saturated. Callers that would wait
+longer than ``max_wait_s`` are rejected instead of piling on.
+
+The same limiter serves asyncio callers (:meth:`AdaptiveLimiter.acquire`) and
+blocking callers on executor threads (:meth:`AdaptiveLimiter.acquire_sync`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from google.genai import errors
+
+from .env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_OVERLOAD_MARKERS = ("RESOURCE_EXHAUSTED", "429", "quota", "Quota", "rate limit")
+
+
+class LimiterRejected(Exception):
+    """Raised when a caller could not get a slot within ``max_wait_s``."""
+
+    def __init__(self, name: str, waited_s: float):
+        super().__init__(f"{name} limiter rejected call after {waited_s:.2f}s")
+        self.name = name
+        self.waited_s = waited_s
+
+
+def is_overload(exc: BaseException) -> bool:
+    """True for quota / rate-limit failures that should shrink the limit."""
+    if isinstance(exc, errors.APIError):
+        return exc.code == 429 or exc.status == "RESOURCE_EXHAUSTED"
+    text = str(exc)
+    return any(marker in text for marker in _OVERLOAD_MARKERS)
+
+
+class _Waiter:
+    """One queued caller; woken either on its event loop or as a blocked thread."""
+
+    def __init__(self, *, blocking: bool):
+        self.granted = False
+        self._loop = None if blocking else asyncio.get_running_loop()
+        self._future: asyncio.Future | None = None if blocking else self._loop.create_future()
+        self._event = threading.Event() if blocking else None
+
+    def wake(self) -> None:
+        self.granted = True
+        if self._future is not None:
+            self._loop.call_soon_threadsafe(_resolve, self._future)
+        else:
+            self._event.set()
+
+    async def wait_async(self, timeout: float | None) -> None:
+        await asyncio.wait_for(asyncio.shield(self._future), timeout)
+
+    def wait_sync(self, timeout: float | None) -> bool:
+        return self._event.wait(timeout)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by additive increase / multiplicative decrease."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_limit: int,
+        min_limit: int = 1,
+        initial: int | None = None,
+        decrease_factor: float = 0.5,
+        cooldown_s: float = 5.0,
+        max_wait_s: float | None = None,
+    ):
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = max(self.min_limit, min(initial or self.max_limit, self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.cooldown_s = cooldown_s
+        self.max_wait_s = max_wait_s
+        self._lock = threading.Lock()
+        self._waiters: deque[_Waiter] = deque()
+        self._in_flight = 0
+        self._successes = 0
+        self._saturated = False
+        self._last_decrease = float("-inf")
+        self._stats = {
+            "acquired": 0,
+            "waited": 0,
+            "rejected": 0,
+            "overloads": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+        self._peak_in_flight = 0
+
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return self._in_flight < self.limit and not self._waiters
+
+    def _try_take(self) -> bool:
+        if self._in_flight < self.limit and not self._waiters:
+            self._grant()
+            return True
+        self._saturated = True
+        return False
+
+    def _grant(self) -> None:
+        self._in_flight += 1
+        self._stats["acquired"] += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        if self._in_flight >= self.limit:
+            self._saturated = True
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            self._grant()
+            waiter.wake()
+
+    def _stop_waiting(self, waiter: _Waiter, waited_s: float, *, rejected: bool) -> bool:
+        """Withdraw a waiter; returns True if it was granted a slot in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            if rejected:
+                self._stats["rejected"] += 1
+        if rejected:
+            logger.warning("[%s] rejected call after waiting %.2fs (limit %d)", self.name, waited_s, self.limit)
+        return False
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Hold a slot; quota errors raised inside the block shrink the limit."""
+        waiter = self._enqueue(blocking=False)
+        if waiter is not None:
+            started = time.perf_counter()
+            try:
+                await waiter.wait_async(self.max_wait_s)
+            except asyncio.TimeoutError:
+                waited = time.perf_counter() - started
+                if not self._stop_waiting(waiter, waited, rejected=True):
+                    raise LimiterRejected(self.name, waited) from None
+            except asyncio.CancelledError:
+                if self._stop_waiting(waiter, time.perf_counter() - started, rejected=False):
+                    self.release(success=False)
+                raise
+        with self._feedback():
+            yield
+
+    @contextmanager
+    def acquire_sync(self):
+        """Blocking counterpart of :meth:`acquire` for executor threads."""
+        waiter = self._enqueue(blocking=True)
+        if waiter is not None:
+            started = time.perf_counter()
+            if not waiter.wait_sync(self.max_wait_s):
+                waited = time.perf_counter() - started
+                if not self._stop_waiting(waiter, waited, rejected=True):
+                    raise LimiterRejected(self.name, waited)
+        with self._feedback():
+            yield
+
+    def _enqueue(self, *, blocking: bool) -> _Waiter | None:
+        with self._lock:
+            if self._try_take():
+                return None
+            waiter = _Waiter(blocking=blocking)
+            self._waiters.append(waiter)
+            self._stats["waited"] += 1
+            return waiter
+
+    @contextmanager
+    def _feedback(self):
+        try:
+            yield
+        except BaseException as e:
+            self.release(overload=isinstance(e, Exception) and is_overload(e), success=False)
+            raise
+        else:
+            self.release(success=True)
+
+    def release(self, *, success: bool, overload: bool = False) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if overload:
+                self._on_overload()
+            elif success:
+                self._on_success()
+            self._wake_waiters()
+
+    def _on_success(self) -> None:
+        self._successes += 1
+        if self._successes < self.limit:
+            return
+        # One window of successes: grow only if the limit was actually the bottleneck.
+        if self._saturated and self.limit < self.max_limit:
+            self.limit += 1
+            self._stats["increases"] += 1
+        self._successes = 0
+        self._saturated = False
+
+    def _on_overload(self) -> None:
+        self._stats["overloads"] += 1
+        now = time.monotonic()
+        # Calls already in flight when the quota was hit fail together; shrink once per burst.
+        if now - self._last_decrease < self.cooldown_s:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit < self.limit:
+            logger.warning("[%s] quota exceeded; limit %d -> %d", self.name, self.limit, new_limit)
+            self.limit = new_limit
+            self._stats["decreases"] += 1
+        self._successes = 0
+        self._saturated = False
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "queued": len(self._waiters),
+            }
+
+
+_model_limiter: AdaptiveLimiter | None = None
+_model_limiter_lock = threading.Lock()
+
+
+def get_model_limiter() -> AdaptiveLimiter:
+    """Return the process-wide limiter for model calls (async and sync).
+
+    The limit moves between ``GENAI_ADAPTIVE_LIMIT_MIN`` (4) and
+    ``GENAI_ADAPTIVE_LIMIT_MAX`` (256), starting at
+    ``GENAI_ADAPTIVE_LIMIT_INITIAL`` (64). Calls waiting longer than
+    ``GENAI_ADAPTIVE_LIMIT_MAX_WAIT_S`` (10; 0 waits forever) are rejected.
+    """
+    global _model_limiter
+    if _model_limiter is not None:
+        return _model_limiter
+    with _model_limiter_lock:
+        if _model_limiter is None:
+            max_wait = env_float("GENAI_ADAPTIVE_LIMIT_MAX_WAIT_S", 10.0)
+            _model_limiter = AdaptiveLimiter(
+                "genai",
+                max_limit=env_int("GENAI_ADAPTIVE_LIMIT_MAX", 256),
+                min_limit=env_int("GENAI_ADAPTIVE_LIMIT_MIN", 4),
+                initial=env_int("GENAI_ADAPTIVE_LIMIT_INITIAL", 64),
+                cooldown_s=env_float("GENAI_ADAPTIVE_LIMIT_COOLDOWN_S", 5.0),
+                max_wait_s=max_wait if max_wait > 0 else None,
+            )
+        return _model_limiter
+
+
+def set_model_limiter(limiter: AdaptiveLimiter | None) -> None:
+    """Install a specific limiter (tests); ``None`` re-reads the environment."""
+    global _model_limiter
+    with _model_limiter_lock:
+        _model_limiter = limiter
@@ -0,0 +1,180 @@
+"""Per-tool model tiering driven by latency SLOs and error rates.
+
+Each sub-agent tool can name a ``primary`` and a faster/cheaper ``fallback``
+model together with a latency SLO. The router watches a rolling window of the
+primary's calls; when its p90 latency exceeds the SLO or its error rate
+exceeds ``max_error_rate`` the tool is *degraded* and calls go to the
+fallback. While degraded, every ``probe_every``-th call still goes to the
+primary; once ``recover_after`` consecutive probes meet the SLO the tool
+recovers. Tools without a route simply use the model the caller asked for.
+
+The server installs the routes from ``Settings.MODEL_ROUTES`` at start-up
+(see ``server/app_state.py``).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+FALLBACK = "fallback"
+
+
+@dataclass(frozen=True)
+class ToolRoute:
+    primary: str | None = None  # None keeps the model the caller passed
+    fallback: str | None = None
+    slo_ms: float | None = None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "ToolRoute":
+        slo = raw.get("slo_ms")
+        return cls(primary=raw.get("primary") or None, fallback=raw.get("fallback") or None, slo_ms=float(slo) if slo else None)
+
+
+@dataclass
+class _ToolState:
+    route: ToolRoute
+    window: deque = field(default_factory=deque)  # (latency_s, ok) of recent primary calls
+    degraded: bool = False
+    calls_since_probe: int = 0
+    good_probes: int = 0
+    served: Counter = field(default_factory=Counter)  # tier -> calls
+    models: Counter = field(default_factory=Counter)  # model -> calls
+    degradations: int = 0
+    recoveries: int = 0
+
+
+class ModelRouter:
+    """Chooses the model tier per call and learns from the outcome."""
+
+    def __init__(
+        self,
+        routes: dict[str, ToolRoute] | None = None,
+        *,
+        window: int = 50,
+        min_samples: int = 10,
+        max_error_rate: float = 0.2,
+        probe_every: int = 10,
+        recover_after: int = 3,
+    ):
+        self.routes = dict(routes or {})
+        self.window = window
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.probe_every = max(1, probe_every)
+        self.recover_after = max(1, recover_after)
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolState] = {}
+
+    @classmethod
+    def from_config(cls, routes: dict[str, dict], **kwargs) -> "ModelRouter":
+        return cls({tool: ToolRoute.from_dict(raw) for tool, raw in routes.items()}, **kwargs)
+
+    def _state(self, tool: str) -> _ToolState:
+        state = self._tools.get(tool)
+        if state is None:
+            state = self._tools[tool] = _ToolState(self.routes.get(tool, ToolRoute()), deque(maxlen=self.window))
+        return state
+
+    def select(self, tool: str, requested: str) -> tuple[str, str]:
+        """Return ``(model, tier)`` for the next call of ``tool``."""
+        with self._lock:
+            state = self._state(tool)
+            route = state.route
+            primary = route.primary or requested
+            if not state.degraded or route.fallback is None:
+                return primary, PRIMARY
+            state.calls_since_probe += 1
+            if state.calls_since_probe >= self.probe_every:
+                state.calls_since_probe = 0
+                return primary, PRIMARY
+            return route.fallback, FALLBACK
+
+    def record(self, tool: str, model: str, tier: str, *, latency_s: float, ok: bool) -> None:
+        """Account one finished call and move the tool between tiers if needed."""
+        with self._lock:
+            state = self._state(tool)
+            state.served[tier] += 1
+            state.models[model] += 1
+            if tier != PRIMARY or state.route.fallback is None:
+                return
+            meets_slo = ok and (state.route.slo_ms is None or latency_s * 1000 <= state.route.slo_ms)
+            if state.degraded:
+                state.good_probes = state.good_probes + 1 if meets_slo else 0
+                if state.good_probes >= self.recover_after:
+                    state.degraded = False
+                    state.good_probes = 0
+                    state.window.clear()
+                    state.recoveries += 1
+                    logger.info("[model-router] %s recovered to %s", tool, model)
+                return
+            state.window.append((latency_s, ok))
+            reason = self._breach(state)
+            if reason is not None:
+                state.degraded = True
+                state.calls_since_probe = 0
+                state.good_probes = 0
+                state.degradations += 1
+                logger.warning("[model-router] %s degraded to %s (%s)", tool, state.route.fallback, reason)
+
+    def _breach(self, state: _ToolState) -> str | None:
+        if len(state.window) < self.min_samples:
+            return None
+        errors = sum(1 for _, ok in state.window if not ok)
+        if errors / len(state.window) > self.max_error_rate:
+            return f"error rate {errors}/{len(state.window)}"
+        slo = state.route.slo_ms
+        if slo is not None:
+            p90 = _p90([latency for latency, ok in state.window if ok])
+            if p90 is not None and p90 * 1000 > slo:
+                return f"p90 {p90 * 1000:.0f}ms > SLO {slo:.0f}ms"
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            tools = {}
+            for tool, state in self._tools.items():
+                window = list(state.window)
+                p90 = _p90([latency for latency, ok in window if ok])
+                tools[tool] = {
+                    "state": "degraded" if state.degraded else PRIMARY,
+                    "primary": state.route.primary,
+                    "fallback": state.route.fallback,
+                    "slo_ms": state.route.slo_ms,
+                    "served": dict(state.served),
+                    "models": dict(state.models),
+                    "p90_ms": None if p90 is None else round(p90 * 1000, 1),
+                    "error_rate": round(sum(1 for _, ok in window if not ok) / len(window), 4) if window else 0.0,
+                    "degradations": state.degradations,
+                    "recoveries": state.recoveries,
+                }
+            return {"tools": tools}
+
+
+def _p90(latencies: list[float]) -> float | None:
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+
+
+_router = ModelRouter()
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Return the installed router (no routes until the server installs them)."""
+    return _router
+
+
+def set_model_router(router: ModelRouter | None) -> None:
+    """Install a router; ``None`` resets to one without routes."""
+    global _router
+    with _router_lock:
+        _router = router if router is not None else ModelRouter()
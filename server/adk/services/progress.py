@@ -0,0 +1,62 @@
+"""Partial sub-agent output forwarded to the connected client.
+
+Planner tools return their full answer to the planner, but the user should not
+stare at nothing while a 300-character analysis is generated. When the bound
+:class:`~adk.services.deadline.CallScope` has a ``progress`` sink (set by the
+coordinator only for WS/SSE connections that opted in), streamed text deltas are pushed as typed
+messages::
+
+    {"type": "tool_progress", "tool": "analyze_tool_history", "call_id": "3f2a9c1e", "seq": 0, "text": "..."}
+    {"type": "tool_progress", "tool": "analyze_tool_history", "call_id": "3f2a9c1e", "seq": 5, "done": true}
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+
+from .deadline import current_scope
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Emits the deltas of one streamed model call."""
+
+    def __init__(self, tool: str, emit):
+        self.tool = tool
+        self.call_id = uuid.uuid4().hex[:8]
+        self._emit = emit
+        self._seq = 0
+        self._failed = False
+
+    async def _send(self, **fields) -> None:
+        if self._failed:
+            return
+        message = {"type": "tool_progress", "tool": self.tool, "call_id": self.call_id, "seq": self._seq, **fields}
+        self._seq += 1
+        try:
+            await self._emit(message)
+        except Exception:
+            # A broken sink must never fail the tool call itself.
+            self._failed = True
+            logger.debug("Dropping progress for %s after sink failure", self.tool, exc_info=True)
+
+    async def text(self, delta: str) -> None:
+        if delta:
+            await self._send(text=delta)
+
+    async def done(self, *, error: str | None = None) -> None:
+        if error is None:
+            await self._send(done=True)
+        else:
+            await self._send(done=True, error=error)
+
+
+def progress_reporter(tool: str) -> ProgressReporter | None:
+    """Return a reporter when the current scope has a client listening, else None."""
+    scope = current_scope()
+    emit = getattr(scope, "progress", None) if scope is not None else None
+    if emit is None or scope.closed:
+        return None
+    return ProgressReporter(tool, emit)
@@ -0,0 +1,211 @@
+"""Disk-backed (SQLite) cache of text sub-agent responses.
+
+Opt-in via ``GENAI_RESPONSE_CACHE_PATH``. Entries are keyed on model,
+instruction hash, normalized prompt and generation config so repeated
+questions (same utensil names, same vision summaries) are answered from disk
+and survive restarts. TTLs are per tool and the file is kept under a byte
+budget by evicting the least recently used rows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any
+
+from .env import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """NFKC-normalize and collapse whitespace so trivially different prompts share a key."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFKC", prompt)).strip()
+
+
+def _parse_ttls(raw: str) -> dict[str, float]:
+    ttls: dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            ttls[name.strip()] = float(value)
+        except ValueError:
+            logger.warning("Ignoring invalid GENAI_RESPONSE_CACHE_TTLS entry: %s", item)
+    return ttls
+
+
+class ResponseCache:
+    """Thread-safe SQLite store for serialized model responses."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl_s: float = 3600.0,
+        ttls: dict[str, float] | None = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl_s = default_ttl_s
+        self.ttls = dict(ttls or {})
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0}
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, tool: str) -> float:
+        """TTL in seconds for ``tool``; 0 or less means the tool is never cached."""
+        return self.ttls.get(tool, self.default_ttl_s)
+
+    @staticmethod
+    def make_key(*, model: str, instruction: str | None, prompt: str, config: Any = None) -> str:
+        instruction_hash = hashlib.sha256((instruction or "").encode("utf-8")).hexdigest()
+        config_repr: Any = None
+        if config is not None:
+            dump = getattr(config, "model_dump", None)
+            config_repr = dump(exclude_none=True, exclude={"system_instruction"}) if dump else repr(config)
+        material = json.dumps(
+            [model, instruction_hash, normalize_prompt(prompt), config_repr],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            payload, expires_at, size = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._bytes -= size
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+            return payload
+
+    def put(self, key: str, payload: str, *, tool: str) -> None:
+        ttl = self.ttl_for(tool)
+        if ttl <= 0:
+            return
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, tool, payload, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, tool, payload, size, now + ttl, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            self._stats["writes"] += 1
+            if self._bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE expires_at <= ?", (now,)
+        ).fetchone()
+        if count:
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._bytes -= size
+            self._stats["expired"] += count
+        # Trim to 90% of the budget so a full cache doesn't evict on every write.
+        target = int(self.max_bytes * 0.9)
+        while self._bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                break
+            for key, size in rows:
+                if self._bytes <= target:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._bytes -= size
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {**self._stats, "entries": entries, "bytes": self._bytes, "path": self.path}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def _open_cache(path: str, max_bytes: int, default_ttl_s: float, ttls_raw: str) -> ResponseCache:
+    logger.info("Opening GenAI response cache at %s", path)
+    return ResponseCache(path, max_bytes=max_bytes, default_ttl_s=default_ttl_s, ttls=_parse_ttls(ttls_raw))
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the configured cache, or ``None`` when disabled or bypassed.
+
+    Settings: ``GENAI_RESPONSE_CACHE_PATH`` (enables the cache),
+    ``GENAI_RESPONSE_CACHE_TTL_S`` (default 3600), ``GENAI_RESPONSE_CACHE_TTLS``
+    (per tool, e.g. ``translate_text=86400,analyze_setting=0``),
+    ``GENAI_RESPONSE_CACHE_MAX_BYTES`` (default 64 MiB) and
+    ``GENAI_RESPONSE_CACHE_BYPASS`` (skip the cache without losing its contents).
+    """
+    path = os.getenv("GENAI_RESPONSE_CACHE_PATH", "").strip()
+    if not path or env_bool("GENAI_RESPONSE_CACHE_BYPASS", False):
+        return None
+    try:
+        return _open_cache(
+            path,
+            env_int("GENAI_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            env_float("GENAI_RESPONSE_CACHE_TTL_S", 3600.0),
+            os.getenv("GENAI_RESPONSE_CACHE_TTLS", ""),
+        )
+    except Exception:
+        logger.exception("Failed to open GenAI response cache at %s; continuing without it", path)
+        return None
@@ -0,0 +1,286 @@
+"""Embedding-based semantic cache for planner tool prompts.
+
+The planner tends to rephrase the same request ("黒楽茶碗の使い方" vs
+"黒楽茶碗はどう使う?") before it calls a sub-agent, which defeats exact-match
+caching. Prompts are embedded and kept in a NumPy matrix per (tool, mode)
+scope; a lookup is one matrix-vector product and returns the cached answer of
+the most similar prompt when its cosine similarity clears the threshold.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Protocol, Sequence
+
+from google.genai import types
+
+from .deadline import guard_call
+from .env import env_bool, env_float, env_int
+from .genai import get_client, run_sync
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - numpy is listed in requirements.txt
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Above this many rows a search is moved off the event loop; it runs on a
+# snapshot of the index, so the cache lock is not held while it scans.
+_INLINE_SEARCH_ROWS = 4096
+
+
+class Embedder(Protocol):
+    dim: int
+
+    async def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """Return an ``(len(texts), dim)`` float32 matrix."""
+        ...
+
+
+class HashingEmbedder:
+    """Deterministic character n-gram embedder (no model call).
+
+    Good enough to catch re-orderings and particle changes in short Japanese
+    prompts, and fully reproducible, which makes it the embedder of choice in
+    tests and for deployments that do not want an extra embedding call.
+    """
+
+    def __init__(self, dim: int = 256, ngrams: tuple[int, ...] = (1, 2, 3)):
+        self.dim = dim
+        self.ngrams = ngrams
+
+    def embed_one(self, text: str) -> "np.ndarray":
+        vec = np.zeros(self.dim, dtype=np.float32)
+        norm = unicodedata.normalize("NFKC", text).lower()
+        chars = [c for c in norm if not c.isspace() and c not in "?？!！。、,.「」"]
+        for n in self.ngrams:
+            for i in range(len(chars) - n + 1):
+                gram = "".join(chars[i : i + n]).encode("utf-8")
+                h = int.from_bytes(hashlib.blake2b(gram, digest_size=8).digest(), "little")
+                vec[h % self.dim] += 1.0 if (h >> 63) == 0 else -1.0
+        return vec
+
+    async def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        return np.stack([self.embed_one(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+
+class GenAIEmbedder:
+    """Embeds through ``client.aio.models.embed_content``."""
+
+    def __init__(self, model: str = "text-embedding-004", dim: int = 256):
+        self.model = model
+        self.dim = dim
+
+    async def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        client = get_client()
+        resp = await guard_call(
+            client.aio.models.embed_content(
+                model=self.model,
+                contents=list(texts),
+                config=types.EmbedContentConfig(output_dimensionality=self.dim),
+            ),
+            tool="embed_content",
+        )
+        return np.asarray([e.values for e in resp.embeddings], dtype=np.float32)
+
+
+class SemanticIndex:
+    """Fixed-capacity cosine index; the oldest row is overwritten when full."""
+
+    def __init__(self, dim: int, capacity: int):
+        self.dim = dim
+        self.capacity = capacity
+        self._vectors = np.zeros((min(capacity, 256), dim), dtype=np.float32)
+        self._answers: list[str | None] = []
+        self._created: list[float] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def add(self, vector: "np.ndarray", answer: str, created: float) -> None:
+        if len(self._answers) < self.capacity:
+            row = len(self._answers)
+            if row >= self._vectors.shape[0]:
+                grown = np.zeros((min(self.capacity, self._vectors.shape[0] * 2), self.dim), dtype=np.float32)
+                grown[:row] = self._vectors[:row]
+                self._vectors = grown
+            self._answers.append(answer)
+            self._created.append(created)
+        else:
+            row = self._next
+            self._next = (self._next + 1) % self.capacity
+            self._answers[row] = answer
+            self._created[row] = created
+        self._vectors[row] = vector
+
+    def snapshot(self) -> tuple["np.ndarray", int]:
+        """The row matrix and valid row count, searchable without holding the cache lock.
+
+        Growth replaces the matrix, so the snapshot keeps its rows; overwritten or
+        invalidated rows may change under it and are re-scored with :meth:`score`.
+        """
+        return self._vectors, len(self._answers)
+
+    @staticmethod
+    def search_rows(vectors: "np.ndarray", rows: int, vector: "np.ndarray") -> tuple[int, float]:
+        if rows == 0:
+            return -1, -1.0
+        scores = vectors[:rows] @ vector
+        idx = int(np.argmax(scores))
+        return idx, float(scores[idx])
+
+    def search(self, vector: "np.ndarray") -> tuple[int, float]:
+        return self.search_rows(*self.snapshot(), vector)
+
+    def score(self, idx: int, vector: "np.ndarray") -> float:
+        return float(self._vectors[idx] @ vector)
+
+    def answer(self, idx: int) -> tuple[str | None, float]:
+        return self._answers[idx], self._created[idx]
+
+    def invalidate(self, idx: int) -> None:
+        self._answers[idx] = None
+        self._vectors[idx] = 0.0
+
+
+@dataclass
+class SemanticMatch:
+    answer: str | None
+    score: float
+    vector: "np.ndarray"
+
+
+class SemanticCache:
+    """Per (tool, mode) semantic answer cache."""
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        threshold: float = 0.92,
+        max_entries: int = 10_000,
+        ttl_s: float = 3600.0,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for the semantic cache")
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._indexes: dict[tuple[str, str], SemanticIndex] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0}
+
+    @staticmethod
+    def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _index(self, tool: str, mode: str) -> SemanticIndex:
+        key = (tool, mode)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = SemanticIndex(self.embedder.dim, self.max_entries)
+        return index
+
+    async def lookup(self, tool: str, mode: str, prompt: str) -> SemanticMatch:
+        vector = self._normalize((await self.embedder.embed([prompt]))[0])
+        with self._lock:
+            index = self._index(tool, mode)
+            vectors, rows = index.snapshot()
+        if rows > _INLINE_SEARCH_ROWS:
+            idx, score = await run_sync(SemanticIndex.search_rows, vectors, rows, vector)
+        else:
+            idx, score = SemanticIndex.search_rows(vectors, rows, vector)
+        answer = None
+        if idx >= 0 and score >= self.threshold:
+            with self._lock:
+                # The row may have been overwritten or invalidated during an unlocked search
+                score = index.score(idx, vector)
+                answer, created = index.answer(idx) if score >= self.threshold else (None, 0.0)
+                if answer is not None and self.ttl_s > 0 and time.monotonic() - created > self.ttl_s:
+                    index.invalidate(idx)
+                    self._stats["expired"] += 1
+                    answer = None
+        with self._lock:
+            self._stats["hits" if answer is not None else "misses"] += 1
+        return SemanticMatch(answer=answer, score=score, vector=vector)
+
+    def store(self, tool: str, mode: str, vector: "np.ndarray", answer: str) -> None:
+        if not answer:
+            return
+        with self._lock:
+            self._index(tool, mode).add(vector, answer, time.monotonic())
+            self._stats["stores"] += 1
+
+    async def get_or_call(self, tool: str, mode: str, prompt: str, call: Callable[[str], Awaitable[str]]) -> str:
+        """Serve ``prompt`` from the cache or run ``call`` and remember its answer."""
+        try:
+            match = await self.lookup(tool, mode, prompt)
+        except Exception:
+            logger.warning("Semantic cache lookup failed for %s; calling through", tool, exc_info=True)
+            return await call(prompt)
+        if match.answer is not None:
+            logger.info("[semantic-cache] %s/%s hit (score=%.3f)", tool, mode, match.score)
+            return match.answer
+        answer = await call(prompt)
+        self.store(tool, mode, match.vector, answer)
+        return answer
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "threshold": self.threshold,
+                "entries": {f"{t}:{m}": len(ix) for (t, m), ix in self._indexes.items()},
+            }
+
+
+_cache: SemanticCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache | None:
+    """Return the process-wide cache when ``SEMANTIC_CACHE_ENABLED`` is set.
+
+    ``SEMANTIC_CACHE_EMBEDDER`` selects ``genai`` (default, model
+    ``SEMANTIC_CACHE_EMBED_MODEL``) or ``hashing``; ``SEMANTIC_CACHE_THRESHOLD``
+    (0.92), ``SEMANTIC_CACHE_MAX_ENTRIES`` (per scope, 10000),
+    ``SEMANTIC_CACHE_TTL_S`` (3600) and ``SEMANTIC_CACHE_DIM`` (256) tune it.
+    """
+    global _cache
+    if _cache is not None:
+        return _cache
+    if not env_bool("SEMANTIC_CACHE_ENABLED", False) or np is None:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            dim = env_int("SEMANTIC_CACHE_DIM", 256)
+            if os.getenv("SEMANTIC_CACHE_EMBEDDER", "genai").strip().lower() == "hashing":
+                embedder: Embedder = HashingEmbedder(dim=dim)
+            else:
+                embedder = GenAIEmbedder(os.getenv("SEMANTIC_CACHE_EMBED_MODEL", "text-embedding-004"), dim=dim)
+            _cache = SemanticCache(
+                embedder,
+                threshold=env_float("SEMANTIC_CACHE_THRESHOLD", 0.92),
+                max_entries=env_int("SEMANTIC_CACHE_MAX_ENTRIES", 10_000),
+                ttl_s=env_float("SEMANTIC_CACHE_TTL_S", 3600.0),
+            )
+        return _cache
+
+
+def set_semantic_cache(cache: SemanticCache | None) -> None:
+    """Install a specific cache instance (tests, benchmarks)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
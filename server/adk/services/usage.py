@@ -0,0 +1,286 @@
+"""Token and cost accounting per turn, tool, agent, connection and user.
+
+Every ``generate_content`` call made through :mod:`adk.services.genai` and
+every Live event carrying ``usage_metadata`` is recorded here, attributed to
+the connection, user and turn of the bound
+:class:`~adk.services.deadline.CallScope`. Cost is estimated from
+``GENAI_PRICES_PER_MTOK`` (USD per million input/output tokens per model).
+
+With ``USAGE_USER_TOKEN_BUDGET`` set, a user who spent more tokens than that
+within ``USAGE_BUDGET_WINDOW_S`` loses the optional features listed in
+``USAGE_BUDGET_DEGRADE`` (default ``prefetch,translation``); the core
+planner / vision flow keeps working.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from .deadline import current_scope
+from .env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# tool -> agent package that issues it, for the per-agent breakdown
+TOOL_AGENTS = {
+    "summarize_image": "vision",
+    "analyze_setting": "setting",
+    "explain_tool_basics": "tools_basic",
+    "analyze_tool_history": "tools_analysis",
+    "translate_text": "translator",
+}
+
+# Cached input tokens are billed at a fraction of the regular input price.
+_CACHED_INPUT_DISCOUNT = 0.25
+
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, other: "UsageTotals") -> None:
+        self.calls += other.calls
+        self.prompt_tokens += other.prompt_tokens
+        self.cached_tokens += other.cached_tokens
+        self.output_tokens += other.output_tokens
+        self.total_tokens += other.total_tokens
+        self.cost_usd += other.cost_usd
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+@dataclass
+class _Connection:
+    user_id: str | None
+    totals: UsageTotals = field(default_factory=UsageTotals)
+    by_tool: dict[str, UsageTotals] = field(default_factory=lambda: defaultdict(UsageTotals))
+    turns: "OrderedDict[int, UsageTotals]" = field(default_factory=OrderedDict)
+
+
+@dataclass
+class _BudgetWindow:
+    started: float
+    tokens: int = 0
+
+
+@lru_cache(maxsize=8)
+def _parse_prices(raw: str) -> dict[str, tuple[float, float]]:
+    prices: dict[str, tuple[float, float]] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            input_price, _, output_price = value.partition(":")
+            prices[name.strip()] = (float(input_price), float(output_price or input_price))
+        except ValueError:
+            logger.warning("Ignoring invalid GENAI_PRICES_PER_MTOK entry: %s", item)
+    return prices
+
+
+def totals_from_usage(usage: Any, *, price: tuple[float, float] | None = None) -> UsageTotals | None:
+    """Convert ``usage_metadata`` (response or Live event) into totals; None if empty."""
+    if usage is None:
+        return None
+    prompt = getattr(usage, "prompt_token_count", None) or 0
+    cached = getattr(usage, "cached_content_token_count", None) or 0
+    output = (getattr(usage, "candidates_token_count", None) or 0) + (getattr(usage, "thoughts_token_count", None) or 0)
+    total = getattr(usage, "total_token_count", None) or prompt + output
+    if not (prompt or output or total):
+        return None
+    cost = 0.0
+    if price is not None:
+        input_price, output_price = price
+        billed_input = (prompt - cached) + cached * _CACHED_INPUT_DISCOUNT
+        cost = (billed_input * input_price + output * output_price) / 1_000_000
+    return UsageTotals(1, prompt, cached, output, total, cost)
+
+
+class UsageLedger:
+    """In-memory aggregates plus optional per-user token budgets."""
+
+    def __init__(
+        self,
+        *,
+        prices: dict[str, tuple[float, float]] | None = None,
+        user_budget_tokens: int = 0,
+        budget_window_s: float = 86400.0,
+        degrade: tuple[str, ...] = ("prefetch", "translation"),
+        max_connections: int = 1000,
+        max_turns: int = 20,
+    ):
+        self.prices = dict(prices or {})
+        self.user_budget_tokens = user_budget_tokens
+        self.budget_window_s = budget_window_s
+        self.degrade = frozenset(degrade)
+        self.max_connections = max_connections
+        self.max_turns = max_turns
+        self._lock = threading.Lock()
+        self._totals = UsageTotals()
+        self._by_user: dict[str, UsageTotals] = defaultdict(UsageTotals)
+        self._by_agent: dict[str, UsageTotals] = defaultdict(UsageTotals)
+        self._by_tool: dict[str, UsageTotals] = defaultdict(UsageTotals)
+        self._by_model: dict[str, UsageTotals] = defaultdict(UsageTotals)
+        self._connections: "OrderedDict[str, _Connection]" = OrderedDict()
+        self._budgets: dict[str, _BudgetWindow] = {}
+        self._degraded_calls: dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_env(cls) -> "UsageLedger":
+        degrade = os.getenv("USAGE_BUDGET_DEGRADE", "prefetch,translation")
+        return cls(
+            prices=_parse_prices(os.getenv("GENAI_PRICES_PER_MTOK", "")),
+            user_budget_tokens=env_int("USAGE_USER_TOKEN_BUDGET", 0),
+            budget_window_s=env_float("USAGE_BUDGET_WINDOW_S", 86400.0),
+            degrade=tuple(f.strip() for f in degrade.split(",") if f.strip()),
+        )
+
+    def record(
+        self,
+        *,
+        tool: str,
+        model: str,
+        usage: Any,
+        agent: str | None = None,
+        connection_id: str | None = None,
+        user_id: str | None = None,
+        turn: int | None = None,
+    ) -> UsageTotals | None:
+        """Add one call's usage. Connection, user and turn default to the bound scope."""
+        totals = totals_from_usage(usage, price=self.prices.get(model))
+        if totals is None:
+            return None
+        scope = current_scope()
+        if scope is not None:
+            connection_id = connection_id or scope.connection_id
+            user_id = user_id or scope.user_id
+            turn = scope.turn if turn is None else turn
+        agent = agent or TOOL_AGENTS.get(tool, tool)
+        with self._lock:
+            self._totals.add(totals)
+            self._by_tool[tool].add(totals)
+            self._by_agent[agent].add(totals)
+            self._by_model[model].add(totals)
+            if user_id:
+                self._by_user[user_id].add(totals)
+                self._charge(user_id, totals.total_tokens)
+            if connection_id:
+                self._charge_connection(connection_id, user_id, tool, turn, totals)
+        return totals
+
+    def _charge(self, user_id: str, tokens: int) -> None:
+        now = time.monotonic()
+        window = self._budgets.get(user_id)
+        if window is None or now - window.started >= self.budget_window_s:
+            window = self._budgets[user_id] = _BudgetWindow(now)
+        window.tokens += tokens
+
+    def _charge_connection(
+        self, connection_id: str, user_id: str | None, tool: str, turn: int | None, totals: UsageTotals
+    ) -> None:
+        conn = self._connections.get(connection_id)
+        if conn is None:
+            conn = self._connections[connection_id] = _Connection(user_id)
+            while len(self._connections) > self.max_connections:
+                self._connections.popitem(last=False)
+        else:
+            self._connections.move_to_end(connection_id)
+        conn.totals.add(totals)
+        conn.by_tool[tool].add(totals)
+        if turn is not None:
+            if turn not in conn.turns:
+                conn.turns[turn] = UsageTotals()
+                while len(conn.turns) > self.max_turns:
+                    conn.turns.popitem(last=False)
+            conn.turns[turn].add(totals)
+
+    def user_tokens(self, user_id: str) -> int:
+        """Tokens spent by ``user_id`` in the current budget window."""
+        with self._lock:
+            window = self._budgets.get(user_id)
+            if window is None or time.monotonic() - window.started >= self.budget_window_s:
+                return 0
+            return window.tokens
+
+    def over_budget(self, user_id: str | None) -> bool:
+        if not user_id or self.user_budget_tokens <= 0:
+            return False
+        return self.user_tokens(user_id) >= self.user_budget_tokens
+
+    def allows(self, feature: str, user_id: str | None = None) -> bool:
+        """False when ``feature`` is degraded for the (scope's) user because of the budget."""
+        if feature not in self.degrade:
+            return True
+        if user_id is None:
+            scope = current_scope()
+            user_id = scope.user_id if scope is not None else None
+        if not self.over_budget(user_id):
+            return True
+        with self._lock:
+            self._degraded_calls[feature] += 1
+        logger.info("[usage] %s disabled for %s (token budget exceeded)", feature, user_id)
+        return False
+
+    def connection(self, connection_id: str) -> dict | None:
+        with self._lock:
+            conn = self._connections.get(connection_id)
+            if conn is None:
+                return None
+            return {
+                "user_id": conn.user_id,
+                "totals": conn.totals.as_dict(),
+                "by_tool": {tool: t.as_dict() for tool, t in conn.by_tool.items()},
+                "turns": {str(turn): t.as_dict() for turn, t in conn.turns.items()},
+            }
+
+    def user(self, user_id: str) -> dict:
+        tokens = self.user_tokens(user_id)
+        with self._lock:
+            totals = self._by_user.get(user_id, UsageTotals()).as_dict()
+        budget = self.user_budget_tokens
+        return {
+            "user_id": user_id,
+            "totals": totals,
+            "budget": {
+                "tokens": budget or None,
+                "window_s": self.budget_window_s,
+                "used": tokens,
+                "exceeded": bool(budget) and tokens >= budget,
+                "degraded_features": sorted(self.degrade) if budget and tokens >= budget else [],
+            },
+        }
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "totals": self._totals.as_dict(),
+                "by_user": {k: v.as_dict() for k, v in self._by_user.items()},
+                "by_agent": {k: v.as_dict() for k, v in self._by_agent.items()},
+                "by_tool": {k: v.as_dict() for k, v in self._by_tool.items()},
+                "by_model": {k: v.as_dict() for k, v in self._by_model.items()},
+                "connections": len(self._connections),
+                "degraded_calls": dict(self._degraded_calls),
+            }
+
+
+usage_ledger = UsageLedger.from_env()
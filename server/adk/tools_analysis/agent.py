@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from ..services.genai import generate_text, get_text_from_response
+from ..knowledge import answer_lookup, ground_prompt
+from ..services.context_cache import register_static_instruction
+from ..services.genai import generate_text, generate_text_stream_async, get_text_from_response
 
 ANALYSIS_INSTRUCTION = """
 あなたは、茶道具の鑑定と茶道史に深く精通した専門家（キュレーター）であり、AIアシスタントです。あなたの役割は、茶道の深い知識を持つ上級者（経験豊富な茶人、研究者、数寄者）に対し、提示された画像や動画から茶道具を高度に分析し、その道具が持つ歴史的背景、由緒、格付け（名物分類）、そして作者の系譜（特に千家十職との関連）について、専門的な知見に基づいた詳細な解説を行うことです。
@@ -64,14 +66,37 @@ ANALYSIS_INSTRUCTION = """
 情報不足への対応: 高度な分析に必要な情報（例：高台の裏、箱書き、全体の寸法など）が不足している場合、その旨を指摘し、追加情報の提供を丁寧に依頼する姿勢も保持してください。（例：「もし可能であれば、高台の様子や、お持ちであればお箱書きなども拝見できますと、さらに詳しい所見が申し上げられるかと存じます。」）
 """
 
+register_static_instruction(ANALYSIS_INSTRUCTION)
+
 ANALYSIS_MODEL = "gemini-2.0-flash-exp"
 
+_MISSING_PROMPT_MESSAGE = "歴史的な所見を行うための情報が不足しています。対象となる道具の詳細を追加してください。"
+
 
 def analyze_tool_history(prompt: str, *, model: str = ANALYSIS_MODEL) -> str:
     """Provide historical and cultural context for a utensil description."""
     prompt_text = prompt.strip()
     if not prompt_text:
-        return "歴史的な所見を行うための情報が不足しています。対象となる道具の詳細を追加してください。"
-    response = generate_text(model=model, instruction=ANALYSIS_INSTRUCTION, prompt=prompt_text)
+        return _MISSING_PROMPT_MESSAGE
+    direct = answer_lookup(prompt_text)
+    if direct is not None:
+        return direct
+    response = generate_text(model=model, instruction=ANALYSIS_INSTRUCTION, prompt=ground_prompt(prompt_text))
+    text = get_text_from_response(response)
+    return text.strip() if text else ""
+
+
+async def analyze_tool_history_async(prompt: str, *, model: str = ANALYSIS_MODEL) -> str:
+    """Async variant of :func:`analyze_tool_history` used by the planner tools; streams progress to the client."""
+    prompt_text = prompt.strip()
+    if not prompt_text:
+        return _MISSING_PROMPT_MESSAGE
+    # Readings, 千家十職 houses and seasons come straight from the local knowledge base.
+    direct = answer_lookup(prompt_text)
+    if direct is not None:
+        return direct
+    response = await generate_text_stream_async(
+        model=model, instruction=ANALYSIS_INSTRUCTION, prompt=ground_prompt(prompt_text), tool="analyze_tool_history"
+    )
     text = get_text_from_response(response)
     return text.strip() if text else ""
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from ..services.genai import generate_text, get_text_from_response
+from ..knowledge import answer_lookup, ground_prompt
+from ..services.context_cache import register_static_instruction
+from ..services.genai import generate_text, generate_text_stream_async, get_text_from_response
 
 BASIC_INSTRUCTION = """
 あなたは、長年の経験を持つ茶道の師範であり、AIアシスタントです。あなたの役割は、茶道に興味を持ち始めたばかりの初心者に対して、画像や動画に写っている茶道具の名称、使い方、そしてその道具にまつわる基礎知識を、親しみやすく丁寧に解説することです。
@@ -48,14 +50,37 @@ BASIC_INSTRUCTION = """
 あなたの知識は、提供された画像・動画の情報に基づいています。断定的な表現が難しい場合は、「～だと思われます」「一般的には～と呼ばれています」といった、少し幅を持たせた表現を使用してください。
 """
 
+register_static_instruction(BASIC_INSTRUCTION)
+
 BASIC_MODEL = "gemini-2.0-flash-exp"
 
+_MISSING_PROMPT_MESSAGE = "道具の説明に必要な情報が不足しています。気になる道具の特徴をもう少し教えてください。"
+
 
 def explain_tool_basics(prompt: str, *, model: str = BASIC_MODEL) -> str:
     """Generate an accessible explanation for a tea utensil based on context."""
     prompt_text = prompt.strip()
     if not prompt_text:
-        return "道具の説明に必要な情報が不足しています。気になる道具の特徴をもう少し教えてください。"
-    response = generate_text(model=model, instruction=BASIC_INSTRUCTION, prompt=prompt_text)
+        return _MISSING_PROMPT_MESSAGE
+    direct = answer_lookup(prompt_text)
+    if direct is not None:
+        return direct
+    response = generate_text(model=model, instruction=BASIC_INSTRUCTION, prompt=ground_prompt(prompt_text))
+    text = get_text_from_response(response)
+    return text.strip() if text else ""
+
+
+async def explain_tool_basics_async(prompt: str, *, model: str = BASIC_MODEL) -> str:
+    """Async variant of :func:`explain_tool_basics` used by the planner tools; streams progress to the client."""
+    prompt_text = prompt.strip()
+    if not prompt_text:
+        return _MISSING_PROMPT_MESSAGE
+    # Readings, 千家十職 houses and seasons come straight from the local knowledge base.
+    direct = answer_lookup(prompt_text)
+    if direct is not None:
+        return direct
+    response = await generate_text_stream_async(
+        model=model, instruction=BASIC_INSTRUCTION, prompt=ground_prompt(prompt_text), tool="explain_tool_basics"
+    )
     text = get_text_from_response(response)
     return text.strip() if text else ""
@@ -1,12 +1,41 @@
 
 from __future__ import annotations
 
-from ..services.genai import generate_text, get_text_from_response
+import asyncio
+import logging
+from typing import Sequence
+
+from ..services.genai import generate_text, generate_text_async, get_text_from_response
+from .memory import (
+    build_batch_prompt,
+    looks_like,
+    normalize_language,
+    parse_batch_response,
+    split_segments,
+    translation_memory,
+)
+
+logger = logging.getLogger(__name__)
 
 TRANSLATOR_INSTRUCTION = """You are a precise translation assistant."""
 TRANSLATOR_MODEL = "gemini-2.0-flash-exp"
 
 
+def _validate(text: str, target_language: str) -> tuple[str, str, str | None]:
+    """Return (text, language, error_message) after trimming the inputs."""
+    text_body = text.strip()
+    language = target_language.strip()
+    if not text_body:
+        return text_body, language, "翻訳する文章が指定されていません。"
+    if not language:
+        return text_body, language, "翻訳先の言語を `target_language` に指定してください。"
+    return text_body, language, None
+
+
+def _build_prompt(text_body: str, language: str) -> str:
+    return f"Translate the following content into {language} with natural tone:\n{text_body}"
+
+
 def translate_text(
     text: str,
     *,
@@ -14,15 +43,101 @@ def translate_text(
     model: str = TRANSLATOR_MODEL,
 ) -> str:
     """Translate text into the requested language while preserving tone."""
-    text_body = text.strip()
-    language = target_language.strip()
-    if not text_body:
-        return "翻訳する文章が指定されていません。"
-    if not language:
-        return "翻訳先の言語を `target_language` に指定してください。"
-    prompt = (
-        f"Translate the following content into {language} with natural tone:\n{text_body}"
-    )
+    text_body, language, error = _validate(text, target_language)
+    if error:
+        return error
+    prompt = _build_prompt(text_body, language)
     response = generate_text(model=model, instruction=TRANSLATOR_INSTRUCTION, prompt=prompt)
     translated = get_text_from_response(response)
     return translated.strip() if translated else ""
+
+
+async def translate_text_async(
+    text: str,
+    *,
+    target_language: str,
+    model: str = TRANSLATOR_MODEL,
+) -> str:
+    """Async variant of :func:`translate_text` used by the planner tools.
+
+    Text already written in the target language is returned unchanged.
+    Otherwise sentences are served from the translation memory and only the
+    uncached ones are translated, together, in a single numbered request.
+    """
+    text_body, language, error = _validate(text, target_language)
+    if error:
+        return error
+    if looks_like(text_body, language):
+        translation_memory.count("skipped_same_language")
+        return text_body
+
+    pieces = split_segments(text_body)
+    translated: dict[str, str] = {}
+    missing: list[str] = []
+    for piece, translatable in pieces:
+        if not translatable or piece in translated or piece in missing:
+            continue
+        hit = translation_memory.get(language, piece)
+        if hit is None:
+            missing.append(piece)
+        else:
+            translated[piece] = hit
+
+    if missing:
+        translation_memory.count("batched_calls")
+        response = await generate_text_async(
+            model=model,
+            instruction=TRANSLATOR_INSTRUCTION,
+            prompt=build_batch_prompt(missing, language),
+            tool="translate_text",
+        )
+        results = parse_batch_response(get_text_from_response(response), len(missing))
+        if results is None:
+            logger.warning("Batched translation came back misaligned; translating as one block")
+            return await _translate_whole(text_body, language, model)
+        for segment, result in zip(missing, results):
+            translation_memory.put(language, segment, result)
+            translated[segment] = result
+
+    return _assemble(pieces, translated, language)
+
+
+async def translate_text_multi_async(
+    text: str,
+    *,
+    target_languages: Sequence[str],
+    model: str = TRANSLATOR_MODEL,
+) -> dict[str, str]:
+    """Translate into several languages concurrently; keys follow the input order."""
+    languages = [lang.strip() for lang in target_languages if lang.strip()]
+    results = await asyncio.gather(
+        *(translate_text_async(text, target_language=lang, model=model) for lang in languages)
+    )
+    return dict(zip(languages, results))
+
+
+async def _translate_whole(text_body: str, language: str, model: str) -> str:
+    response = await generate_text_async(
+        model=model,
+        instruction=TRANSLATOR_INSTRUCTION,
+        prompt=_build_prompt(text_body, language),
+        tool="translate_text",
+    )
+    translated = get_text_from_response(response)
+    return translated.strip() if translated else ""
+
+
+def _assemble(pieces: list[tuple[str, bool]], translated: dict[str, str], language: str) -> str:
+    # Japanese/Chinese sentences butt up against each other; others need a space.
+    joiner = "" if normalize_language(language) in {"ja", "zh"} else " "
+    out: list[str] = []
+    prev_translated = False
+    for piece, translatable in pieces:
+        if translatable:
+            if prev_translated and joiner:
+                out.append(joiner)
+            out.append(translated.get(piece, piece))
+        else:
+            out.append(piece)
+        prev_translated = translatable
+    return "".join(out).strip()
@@ -0,0 +1,184 @@
+"""Segment-level translation memory for the translator agent.
+
+Planner answers reuse many sentences verbatim (greetings, caveats such as
+「あくまで画像から拝察できる範囲での所見」). Text is split into sentences,
+each sentence is looked up per target language, and only the misses are sent
+to the model in one numbered batch.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from ..services.env import env_int
+
+# Split after sentence-final punctuation (keeping it) and around newlines.
+_SEGMENT_RE = re.compile(r"[^。！？!?\n]*(?:[。！？!?]+[」』）)]*|\n+|$)")
+_NUMBERED_LINE_RE = re.compile(r"^\s*(\d+)\s*[:：.．)]\s?(.*)$")
+
+_LANGUAGE_ALIASES = {
+    "en": "en", "english": "en", "英語": "en", "eng": "en",
+    "ja": "ja", "japanese": "ja", "日本語": "ja", "jp": "ja",
+    "ko": "ko", "korean": "ko", "韓国語": "ko",
+    "zh": "zh", "chinese": "zh", "中国語": "zh", "zh-cn": "zh", "zh-tw": "zh",
+    "fr": "fr", "french": "fr", "フランス語": "fr",
+    "es": "es", "spanish": "es", "スペイン語": "es",
+    "de": "de", "german": "de", "ドイツ語": "de",
+}
+_ENGLISH_HINTS = {"the", "and", "is", "of", "to", "a", "in", "this", "you", "it"}
+# Characters used in Chinese but not in Japanese (simplified-only forms and common
+# traditional function words). Kana-less Japanese ("千家十職の楽家作") is all han too,
+# so Chinese needs one of these as positive evidence.
+_CHINESE_ONLY = frozenset(
+    "这们个么吗呢说话请谢对过还样种东见问间让给进经现认觉长门车马鸟鱼书买卖头发兴爱从众关应该电产业选张风传务实节艺术岁"
+    "释绿红热处难欢壶這們麼嗎說沒讓裡妳"
+)
+
+
+def normalize_language(language: str) -> str:
+    """Map common spellings ("English", "英語", "EN") to a short key."""
+    key = language.strip().lower()
+    return _LANGUAGE_ALIASES.get(key, key)
+
+
+def split_segments(text: str) -> list[tuple[str, bool]]:
+    """Split text into ``(piece, translatable)`` pairs that re-join to ``text``.
+
+    Whitespace-only pieces (newlines, indentation) are kept verbatim and are
+    not sent to the model.
+    """
+    pieces: list[tuple[str, bool]] = []
+    for match in _SEGMENT_RE.finditer(text):
+        piece = match.group(0)
+        if not piece:
+            continue
+        # Peel trailing newlines off a sentence so line structure is preserved.
+        body = piece.rstrip("\n")
+        tail = piece[len(body):]
+        if body.strip():
+            lead = body[: len(body) - len(body.lstrip())]
+            if lead:
+                pieces.append((lead, False))
+            pieces.append((body.strip(), True))
+            trail = body[len(body.rstrip()):]
+            if trail:
+                pieces.append((trail, False))
+        elif body:
+            pieces.append((body, False))
+        if tail:
+            pieces.append((tail, False))
+    return pieces
+
+
+def looks_like(text: str, language: str) -> bool:
+    """Conservatively decide whether ``text`` is already written in ``language``."""
+    lang = normalize_language(language)
+    letters = [c for c in text if c.isalpha()]
+    if not letters:
+        return True
+    counts = {"kana": 0, "han": 0, "hangul": 0, "latin": 0, "ascii": 0}
+    for c in letters:
+        name = unicodedata.name(c, "")
+        if "HIRAGANA" in name or "KATAKANA" in name:
+            counts["kana"] += 1
+        elif "CJK" in name:
+            counts["han"] += 1
+        elif "HANGUL" in name:
+            counts["hangul"] += 1
+        elif "LATIN" in name:
+            counts["latin"] += 1
+            if c.isascii():
+                counts["ascii"] += 1
+    total = len(letters)
+    if lang == "ja":
+        return counts["kana"] / total >= 0.1 and counts["latin"] / total < 0.5
+    if lang == "ko":
+        return counts["hangul"] / total >= 0.5
+    if lang == "zh":
+        return counts["han"] / total >= 0.6 and counts["kana"] == 0 and any(c in _CHINESE_ONLY for c in letters)
+    if lang == "en":
+        words = set(re.findall(r"[a-z]+", text.lower()))
+        return counts["ascii"] / total >= 0.95 and bool(words & _ENGLISH_HINTS)
+    return False
+
+
+def build_batch_prompt(segments: list[str], language: str) -> str:
+    lines = "\n".join(f"{i}: {seg}" for i, seg in enumerate(segments, start=1))
+    return (
+        f"Translate each numbered segment into {language} with natural tone. "
+        'Reply with exactly one line per segment in the form "<number>: <translation>", '
+        "keeping the same numbering and adding nothing else.\n"
+        f"{lines}"
+    )
+
+
+def parse_batch_response(text: str, expected: int) -> list[str] | None:
+    """Return translations in order, or ``None`` if the numbering does not line up."""
+    found: dict[int, str] = {}
+    for line in text.splitlines():
+        m = _NUMBERED_LINE_RE.match(line)
+        if m:
+            found.setdefault(int(m.group(1)), m.group(2).strip())
+    if sorted(found) != list(range(1, expected + 1)):
+        return None
+    return [found[i] for i in range(1, expected + 1)]
+
+
+class TranslationMemory:
+    """Bounded LRU of ``(language, segment) -> translation``."""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"segment_hits": 0, "segment_misses": 0, "batched_calls": 0, "skipped_same_language": 0}
+
+    @staticmethod
+    def _key(language: str, segment: str) -> tuple[str, str]:
+        return normalize_language(language), unicodedata.normalize("NFKC", segment).strip()
+
+    def get(self, language: str, segment: str) -> str | None:
+        key = self._key(language, segment)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats["segment_misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["segment_hits"] += 1
+            return value
+
+    def put(self, language: str, segment: str, translation: str) -> None:
+        if not translation:
+            return
+        key = self._key(language, segment)
+        with self._lock:
+            self._entries[key] = translation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for k in self._stats:
+                self._stats[k] = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["segment_hits"] + self._stats["segment_misses"]
+            return {
+                **self._stats,
+                "segment_hit_rate": round(self._stats["segment_hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+translation_memory = TranslationMemory(env_int("TRANSLATION_MEMORY_MAX_ENTRIES", 5000))
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Sequence
+
 from google.genai import types
 
-from ..services.genai import generate_with_parts, get_text_from_response
+from ..services.env import env_float, env_int
+from ..services.genai import generate_with_parts, generate_with_parts_async, get_text_from_response
+from .cache import vision_cache
 
 
 VISION_INSTRUCTION = """
@@ -27,6 +32,7 @@ def summarize_image(
     mime_type: str = "image/jpeg",
     instruction: str = VISION_INSTRUCTION,
     model: str = VISION_MODEL,
+    use_cache: bool = True,
 ) -> str:
     """Return a textual summary for the provided image bytes.
 
@@ -35,18 +41,97 @@ def summarize_image(
         mime_type: MIME type of the image. Defaults to JPEG.
         instruction: Prompt steering the vision model.
         model: Target Gemini model name.
+        use_cache: Reuse the summary of a perceptually identical frame.
 
     Returns:
         The model's textual summary.
     """
+    parts = _build_parts(image_bytes, mime_type)
+    fingerprint = vision_cache.fingerprint(image_bytes) if use_cache else None
+    if fingerprint is not None:
+        cached = vision_cache.get(fingerprint, model=model, instruction=instruction)
+        if cached is not None:
+            return cached
+    response = generate_with_parts(model=model, instruction=instruction, parts=parts, tool="summarize_image")
+    text = get_text_from_response(response)
+    summary = text.strip() if text else ""
+    if fingerprint is not None:
+        vision_cache.put(fingerprint, summary, model=model, instruction=instruction)
+    return summary
+
+
+async def summarize_image_async(
+    image_bytes: bytes,
+    *,
+    mime_type: str = "image/jpeg",
+    instruction: str = VISION_INSTRUCTION,
+    model: str = VISION_MODEL,
+    use_cache: bool = True,
+    fingerprint: tuple[int, bool] | None = None,
+) -> str:
+    """Async variant of :func:`summarize_image` for the planner pre-model hook.
+
+    ``fingerprint`` (from :func:`adk.vision.cache.frame_fingerprint`) skips
+    decoding the image again for the cache lookup.
+    """
+    parts = _build_parts(image_bytes, mime_type)
+    if not use_cache:
+        fingerprint = None
+    elif fingerprint is None:
+        fingerprint = vision_cache.fingerprint(image_bytes)
+    if fingerprint is not None:
+        cached = vision_cache.get(fingerprint, model=model, instruction=instruction)
+        if cached is not None:
+            return cached
+    response = await generate_with_parts_async(
+        model=model, instruction=instruction, parts=parts, tool="summarize_image"
+    )
+    text = get_text_from_response(response)
+    summary = text.strip() if text else ""
+    if fingerprint is not None:
+        vision_cache.put(fingerprint, summary, model=model, instruction=instruction)
+    return summary
+
+
+async def summarize_images_async(
+    images: Sequence[tuple[str, bytes]],
+    *,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+    instruction: str = VISION_INSTRUCTION,
+    model: str = VISION_MODEL,
+) -> list[str | BaseException]:
+    """Summarize several ``(mime_type, bytes)`` images concurrently.
+
+    At most ``concurrency`` (``VISION_FANOUT``, default 4) model calls run at
+    once and each image must finish within ``timeout`` seconds
+    (``VISION_IMAGE_TIMEOUT_S``, default 15) including time spent waiting for
+    a slot. Results keep the input order; an image that failed or timed out
+    yields its exception instead of a summary, so callers can return a
+    partial answer.
+    """
+    if concurrency is None:
+        concurrency = env_int("VISION_FANOUT", 4)
+    if timeout is None:
+        timeout = env_float("VISION_IMAGE_TIMEOUT_S", 15.0)
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(mime: str, payload: bytes) -> str:
+        async with slots:
+            return await summarize_image_async(payload, mime_type=mime, instruction=instruction, model=model)
+
+    async def _bounded(mime: str, payload: bytes) -> str:
+        if timeout and timeout > 0:
+            return await asyncio.wait_for(_one(mime, payload), timeout)
+        return await _one(mime, payload)
+
+    return await asyncio.gather(*(_bounded(m, p) for m, p in images), return_exceptions=True)
+
+
+def _build_parts(image_bytes: bytes, mime_type: str) -> list[types.Part]:
     if not image_bytes:
         raise ValueError("image_bytes must contain data for summarization.")
-
-    parts = [
+    return [
         types.Part.from_text(text="以下の画像について、観察結果を説明してください。"),
         types.Part.from_bytes(data=image_bytes, mime_type=mime_type),
     ]
-
-    response = generate_with_parts(model=model, instruction=instruction, parts=parts)
-    text = get_text_from_response(response)
-    return text.strip() if text else ""
@@ -0,0 +1,213 @@
+"""Perceptual-hash keyed cache for vision summaries.
+
+Webcam clients resend nearly identical JPEGs many times per minute. Frames are
+reduced to a 64-bit difference hash (dHash) of the decoded grayscale image, so
+re-encoded or slightly noisy copies of the same scene land within a small
+Hamming distance of each other and can reuse the previous summary.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..services.env import env_bool, env_float, env_int
+
+try:  # Optional: without Pillow/NumPy only byte-identical frames are matched.
+    import numpy as np
+    from PIL import Image
+except Exception:  # pragma: no cover - depends on the deployment image
+    np = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Per-entry bookkeeping overhead counted towards the byte budget.
+_ENTRY_OVERHEAD = 96
+
+
+def perceptual_hash(image_bytes: bytes, *, hash_size: int = 8) -> int | None:
+    """Return a ``hash_size**2``-bit dHash of the image, or ``None`` if undecodable."""
+    if Image is None or np is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # JPEG draft mode decodes at 1/2..1/8 scale, which is all we need.
+            img.draft("L", (hash_size * 8, hash_size * 8))
+            small = img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+            pixels = np.asarray(small, dtype=np.int16)
+    except Exception:
+        logger.debug("perceptual_hash: failed to decode image", exc_info=True)
+        return None
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _exact_hash(image_bytes: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(image_bytes, digest_size=8).digest(), "big")
+
+
+def frame_fingerprint(image_bytes: bytes) -> tuple[int, bool]:
+    """Return ``(hash, exact)``: the dHash, or a byte hash with ``exact`` set when undecodable.
+
+    Decoding costs ~1.5 ms for a 720p JPEG (~0.7 ms at 480p), so the
+    coordinator computes it once per frame off the event loop and passes it to
+    the frame selector, the vision proxy and :meth:`VisionSummaryCache.get`/``put``.
+    """
+    phash = perceptual_hash(image_bytes)
+    if phash is None:
+        return _exact_hash(image_bytes), True
+    return phash, False
+
+
+@dataclass
+class _Entry:
+    scope: str
+    phash: int
+    exact: bool
+    summary: str
+    size: int
+    created: float
+
+
+class VisionSummaryCache:
+    """LRU of vision summaries keyed on (model, instruction, perceptual hash).
+
+    Lookups first try the exact hash and then scan entries of the same
+    model/instruction for one within ``max_distance`` bits. Entries expire
+    after ``ttl_s`` seconds and the cache is bounded by both entry count and
+    the UTF-8 size of the stored summaries.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        max_bytes: int = 2 * 1024 * 1024,
+        ttl_s: float = 300.0,
+        max_distance: int = 6,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.max_distance = max_distance
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple[str, int], _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "unhashable": 0}
+
+    @classmethod
+    def from_env(cls) -> "VisionSummaryCache":
+        return cls(
+            max_entries=env_int("VISION_CACHE_MAX_ENTRIES", 512),
+            max_bytes=env_int("VISION_CACHE_MAX_BYTES", 2 * 1024 * 1024),
+            ttl_s=env_float("VISION_CACHE_TTL_S", 300.0),
+            max_distance=env_int("VISION_CACHE_MAX_DISTANCE", 6),
+            enabled=env_bool("VISION_CACHE_ENABLED", True),
+        )
+
+    @staticmethod
+    def scope_for(model: str, instruction: str) -> str:
+        digest = hashlib.sha1(instruction.encode("utf-8")).hexdigest()[:16]
+        return f"{model}:{digest}"
+
+    def fingerprint(self, image_bytes: bytes) -> tuple[int, bool]:
+        """Return ``(hash, exact)``; ``exact`` is True when only a byte hash was possible."""
+        fingerprint = frame_fingerprint(image_bytes)
+        if fingerprint[1]:
+            with self._lock:
+                self._stats["unhashable"] += 1
+        return fingerprint
+
+    def get(self, fingerprint: tuple[int, bool], *, model: str, instruction: str) -> str | None:
+        if not self.enabled:
+            return None
+        phash, exact = fingerprint
+        scope = self.scope_for(model, instruction)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((scope, phash))
+            if entry is not None and self._expired(entry, now):
+                self._drop((scope, phash), expired=True)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end((scope, phash))
+                self._stats["hits"] += 1
+                return entry.summary
+            if not exact and self.max_distance > 0:
+                best_key, best_dist = None, self.max_distance + 1
+                for key, candidate in self._entries.items():
+                    if candidate.scope != scope or candidate.exact:
+                        continue
+                    dist = (candidate.phash ^ phash).bit_count()
+                    if dist < best_dist:
+                        best_key, best_dist = key, dist
+                if best_key is not None:
+                    candidate = self._entries[best_key]
+                    if self._expired(candidate, now):
+                        self._drop(best_key, expired=True)
+                    else:
+                        self._entries.move_to_end(best_key)
+                        self._stats["near_hits"] += 1
+                        return candidate.summary
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, fingerprint: tuple[int, bool], summary: str, *, model: str, instruction: str) -> None:
+        if not self.enabled or not summary:
+            return
+        phash, exact = fingerprint
+        scope = self.scope_for(model, instruction)
+        size = len(summary.encode("utf-8")) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            key = (scope, phash)
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(scope, phash, exact, summary, size, time.monotonic())
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for k in self._stats:
+                self._stats[k] = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["near_hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] + self._stats["near_hits"]) / lookups if lookups else 0.0
+            return {
+                **self._stats,
+                "hit_rate": round(hit_rate, 4),
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_distance": self.max_distance,
+            }
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_s > 0 and now - entry.created > self.ttl_s
+
+    def _drop(self, key: tuple[str, int], *, expired: bool = False) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        if expired:
+            self._stats["expired"] += 1
+
+
+vision_cache = VisionSummaryCache.from_env()
@@ -15,6 +15,8 @@ from server.routes.docs import router as docs_router
 from server.routes.health import router as health_router
 from server.routes.summarizer import router as summarizer_router
 from server.routes.connections import router as connections_router
+from server.routes.metrics import router as metrics_router
+from server.routes.usage import router as usage_router
 
 # ログ設定
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +32,8 @@ app.include_router(health_router)
 app.include_router(docs_router)
 app.include_router(summarizer_router)
 app.include_router(connections_router)
+app.include_router(metrics_router)
+app.include_router(usage_router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Event-loop CPU of per-chunk audio forwarding vs coalesced blocks.
+
+Simulates ``--connections`` microphones sending 20 ms 16 kHz PCM chunks
+(50/s) in bursts of ``--talk-s`` speech followed by ``--pause-s`` silence, for
+``--seconds``. A single driver feeds every connection each tick, so only the
+forwarding path differs:
+
+* ``per-chunk``: the previous coordinator behaviour, ``send_realtime`` per
+  chunk plus a new sleeping activity-end task per chunk.
+* ``coalesced``: :class:`server.core.audio.AudioCoalescer` with
+  ``--block-ms`` blocks and one idle timer per connection.
+
+Reports process CPU seconds, blobs sent, tasks/timers created and the p99
+lateness of the driver's 20 ms tick (event-loop lag).
+
+Usage:
+  python benchmarks/bench_audio_coalescing.py [--connections 300] [--seconds 10] [--block-ms 60]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from google.genai import types  # noqa: E402
+
+from server.core.audio import AudioCoalescer  # noqa: E402
+
+_CHUNK = b"\x00\x01" * 320  # 20 ms at 16 kHz, 16-bit mono
+_TICK_S = 0.02
+_IDLE_END_MS = 800
+
+
+class _Lrq:
+    def __init__(self):
+        self.blobs = 0
+
+    def send_realtime(self, blob):
+        self.blobs += 1
+
+    def send_activity_start(self):
+        pass
+
+    def send_activity_end(self):
+        pass
+
+
+class _PerChunk:
+    """The per-chunk path the coordinator used before coalescing."""
+
+    def __init__(self, lrq: _Lrq, counter: list[int]):
+        self.lrq = lrq
+        self.counter = counter
+        self.open = False
+        self.last = 0.0
+
+    def feed(self, chunk: bytes) -> None:
+        now = asyncio.get_event_loop().time()
+        if not self.open:
+            self.lrq.send_activity_start()
+            self.open = True
+        self.last = now
+        self.counter[0] += 1
+        asyncio.create_task(self._activity_end())
+        self.lrq.send_realtime(types.Blob(data=chunk, mime_type="audio/pcm;rate=16000"))
+
+    async def _activity_end(self):
+        await asyncio.sleep(_IDLE_END_MS / 1000)
+        now = asyncio.get_event_loop().time()
+        if self.open and now - self.last >= _IDLE_END_MS / 1000 - 0.05:
+            self.lrq.send_activity_end()
+            self.open = False
+
+    def close(self) -> None:
+        pass
+
+
+async def _run(kind: str, args) -> dict:
+    counter = [0]
+    lrqs = [_Lrq() for _ in range(args.connections)]
+    if kind == "per-chunk":
+        streams = [_PerChunk(lrq, counter) for lrq in lrqs]
+    else:
+        streams = [
+            AudioCoalescer(lrq, sample_rate=16000, block_ms=args.block_ms, idle_end_ms=_IDLE_END_MS, activity=True)
+            for lrq in lrqs
+        ]
+    cycle = args.talk_s + args.pause_s
+    lateness: list[float] = []
+    cpu0 = time.process_time()
+    started = time.perf_counter()
+    next_tick = started
+    while (now := time.perf_counter()) - started < args.seconds:
+        lateness.append(now - next_tick)
+        if (now - started) % cycle < args.talk_s:
+            for stream in streams:
+                stream.feed(_CHUNK)
+        next_tick += _TICK_S
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+    # Let pending activity-end work run so both paths pay for it
+    await asyncio.sleep(_IDLE_END_MS / 1000 + 0.1)
+    cpu = time.process_time() - cpu0
+    timers = counter[0] if kind == "per-chunk" else sum(s.stats["timer_arms"] for s in streams)
+    for stream in streams:
+        stream.close()
+    lateness.sort()
+    return {
+        "cpu_s": cpu,
+        "blobs": sum(lrq.blobs for lrq in lrqs),
+        "tasks_or_timers": timers,
+        "lag_p99_ms": lateness[int(len(lateness) * 0.99)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--block-ms", type=int, default=60)
+    parser.add_argument("--talk-s", type=float, default=2.0)
+    parser.add_argument("--pause-s", type=float, default=1.0)
+    args = parser.parse_args()
+
+    for kind in ("per-chunk", "coalesced"):
+        result = asyncio.run(_run(kind, args))
+        print(
+            f"{kind:>10}: cpu={result['cpu_s']:6.2f} s blobs={result['blobs']:>7} "
+            f"tasks/timers={result['tasks_or_timers']:>7} tick_lag_p99={result['lag_p99_ms']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare sub-agent latency percentiles with and without request hedging.
+
+Runs ``--calls`` ``analyze_setting`` calls (``--concurrency`` at a time)
+through ``generate_text_async`` against a fake backend whose latency is
+``--base-latency`` with ±30% jitter, except that a ``--slow-rate`` share of
+requests takes ``--slow-latency``. The hedged run enables
+:class:`adk.services.hedging.HedgePolicy` with the default p95 delay and 5%
+budget; the report shows p50/p95/p99 and the extra backend calls spent.
+
+Usage:
+  python benchmarks/bench_hedging.py [--calls 600] [--slow-rate 0.03] [--slow-latency 1.0]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import types as pytypes
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from google.genai import types  # noqa: E402
+
+from adk.services import genai as genai_module  # noqa: E402
+from adk.services.hedging import HedgePolicy, set_hedge_policy  # noqa: E402
+
+
+def _fake_client(rng: random.Random, base: float, slow: float, slow_rate: float, counter: list[int]):
+    response = types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text="風炉の季節の設えです。")]))]
+    )
+
+    class AioModels:
+        async def generate_content(self, **_):
+            counter[0] += 1
+            latency = slow if rng.random() < slow_rate else base * rng.uniform(0.7, 1.3)
+            await asyncio.sleep(latency)
+            return response
+
+    return pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=AioModels()))
+
+
+async def _run(calls: int, concurrency: int) -> list[float]:
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int):
+        async with gate:
+            started = time.perf_counter()
+            await genai_module.generate_text_async(
+                model="fake", instruction="", prompt=f"設えを見てください {i}", tool="analyze_setting", use_cache=False
+            )
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return latencies
+
+
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--base-latency", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--slow-rate", type=float, default=0.03)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for label, policy in (("plain", HedgePolicy(enabled=False)), ("hedged", HedgePolicy())):
+        counter = [0]
+        client = _fake_client(
+            random.Random(args.seed), args.base_latency, args.slow_latency, args.slow_rate, counter
+        )
+        genai_module.get_client = lambda: client
+        set_hedge_policy(policy)
+        latencies = asyncio.run(_run(args.calls, args.concurrency))
+        extra = counter[0] - args.calls
+        print(
+            f"{label:>7}: p50={_pct(latencies, 0.5):7.1f} ms p95={_pct(latencies, 0.95):7.1f} ms "
+            f"p99={_pct(latencies, 0.99):7.1f} ms max={max(latencies) * 1000:7.1f} ms "
+            f"backend_calls={counter[0]} (+{extra / args.calls:.1%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
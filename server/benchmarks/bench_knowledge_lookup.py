@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Throughput of the utensil knowledge base lookups.
+
+Times ``KnowledgeBase.scan`` over vision-summary-sized texts (the per-turn
+cost of grounding and prefetch detection), ``answer_lookup`` for a reading
+question, and the bigram ``search`` used for fuzzy names.
+
+Usage:
+  python benchmarks/bench_knowledge_lookup.py [--iterations 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from adk.knowledge import answer_lookup, knowledge_base  # noqa: E402
+
+SUMMARY = (
+    "[Vision解析1] 床の間に掛軸があり、手前に竹の花入が置かれています。点前座には唐銅の風炉に釜がかかり、"
+    "右手に染付の水指、その前に朱塗りの棗と竹の茶杓が置かれています。黒い楽茶碗の中に茶筅が仕込まれ、"
+    "勝手付には建水と蓋置が見えます。全体として初夏の取合せと推察されます。"
+)
+
+
+def _bench(label: str, func, iterations: int) -> None:
+    timings = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    total = sum(timings)
+    print(
+        f"{label:<14} {iterations / total:>10,.0f} ops/s  "
+        f"p50={timings[len(timings) // 2] * 1e6:.1f} µs  p99={timings[int(len(timings) * 0.99) - 1] * 1e6:.1f} µs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    kb = knowledge_base()
+    print(f"entries={len(kb.entries)} load={(time.perf_counter() - t0) * 1000:.1f} ms summary={len(SUMMARY)} chars")
+    _bench("scan", lambda: kb.scan(SUMMARY), args.iterations)
+    _bench("answer_lookup", lambda: answer_lookup(f"{SUMMARY}\n\n棗の読み方は？", kb=kb), args.iterations)
+    _bench("search", lambda: kb.search("ちゃしゃく"), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
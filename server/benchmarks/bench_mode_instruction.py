@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Mode-instruction tokens of a webcam session: per-turn prefix vs session state.
+
+Replays a ``--minutes`` Live session (one frame every ``--frame-interval``
+seconds, ``--text-turns`` typed questions and ``--mode-changes`` mode
+switches) through the coordinator with a fake LiveRequestQueue and counts the
+mode paragraph tokens:
+
+* ``before``: the paragraph is prepended to every text turn, every frame and
+  every follow-up nudge (the previous behaviour).
+* ``after``: the paragraph is part of the planner's system instruction (from
+  session state) and is sent with a turn only after the mode changes.
+
+``sent`` is the mode text uploaded (and left in the Live context);
+``processed`` the mode tokens the model re-reads over all
+turns (the whole context is read again on every turn). Tokens are estimated
+at ``--chars-per-token`` characters per token unless ``--count-tokens`` asks
+the API (needs credentials).
+
+Usage:
+  python benchmarks/bench_mode_instruction.py [--minutes 10] [--frame-interval 2] [--text-turns 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from google.genai import types  # noqa: E402
+
+from adk.planner.modes import MODE_INSTRUCTIONS, mode_instruction  # noqa: E402
+from server.core import coordinator as coordinator_module  # noqa: E402
+from server.core.coordinator import MultimodalServer  # noqa: E402
+
+_MODES = ("intermediate", "beginner", "advanced")
+
+
+class _Queue:
+    def __init__(self):
+        self.sent: list[types.Content] = []
+
+    def send_content(self, content: types.Content) -> None:
+        self.sent.append(content)
+
+
+def _timeline(minutes: float, frame_interval: float, text_turns: int, mode_changes: int) -> list[tuple[str, str]]:
+    duration = minutes * 60
+    events = [(i * frame_interval, "frame", "") for i in range(int(duration / frame_interval))]
+    events += [((i + 0.5) * duration / max(1, text_turns), "text", "この道具の使い方は？") for i in range(text_turns)]
+    events += [((i + 1) * duration / (mode_changes + 1), "mode", _MODES[(i + 1) % 3]) for i in range(mode_changes)]
+    return [(kind, value) for _, kind, value in sorted(events)]
+
+
+async def _replay(timeline: list[tuple[str, str]], *, legacy: bool) -> list[types.Content]:
+    server = MultimodalServer()
+    conn = await server.create_connection(agent_key="analyze", user_id="bench")
+    cid = conn["connection_id"]
+    queue = _Queue()
+    # What _receive_and_process_responses does when the Live session starts
+    server._store_mode(cid)
+    server._mode_sent[cid] = server._get_mode(cid)
+    for kind, value in timeline:
+        if kind == "mode":
+            server.set_mode(cid, value)
+        elif kind == "frame":
+            if legacy:
+                prefix = types.Part.from_text(text=server._mode_instruction(cid))
+                ask = types.Part.from_text(text="この画像の内容を短く説明してください。道具があれば特定して。")
+                image = types.Part.from_bytes(data=b"jpeg", mime_type="image/jpeg")
+                queue.send_content(types.Content(role="user", parts=[prefix, ask, image]))
+                queue.send_content(types.Content(role="user", parts=[prefix, types.Part.from_text(text="上の画像について返答してください。")]))
+            else:
+                await server._send_video_content_immediate(queue, cid, b"jpeg")
+        else:
+            parts = [types.Part.from_text(text=server._mode_instruction(cid))] if legacy else server.mode_change_parts(cid)
+            queue.send_content(types.Content(role="user", parts=[*parts, types.Part.from_text(text=value)]))
+    return queue.sent
+
+
+def _token_counter(args) -> dict[str, int]:
+    if args.count_tokens:
+        from adk.services.genai import get_client
+
+        client = get_client()
+        return {text: client.models.count_tokens(model=args.model, contents=text).total_tokens for text in MODE_INSTRUCTIONS.values()}
+    return {text: round(len(text) / args.chars_per_token) for text in MODE_INSTRUCTIONS.values()}
+
+
+def _measure(sent: list[types.Content], tokens: dict[str, int], system_tokens: int) -> dict[str, int]:
+    sent_tokens = 0
+    processed = 0
+    for content in sent:
+        sent_tokens += sum(tokens.get(p.text, 0) for p in content.parts if p.text)
+        # Every user turn makes the model read the system instruction plus the whole history again
+        processed += system_tokens + sent_tokens
+    return {"turns": len(sent), "sent": sent_tokens, "processed": processed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--frame-interval", type=float, default=2.0)
+    parser.add_argument("--text-turns", type=int, default=20)
+    parser.add_argument("--mode-changes", type=int, default=1)
+    parser.add_argument("--chars-per-token", type=float, default=1.5)
+    parser.add_argument("--count-tokens", action="store_true")
+    parser.add_argument("--model", default="gemini-2.0-flash-exp")
+    args = parser.parse_args()
+
+    async def no_sleep(_):
+        return None
+
+    coordinator_module.asyncio.sleep = no_sleep
+    tokens = _token_counter(args)
+    timeline = _timeline(args.minutes, args.frame_interval, args.text_turns, args.mode_changes)
+    before = _measure(asyncio.run(_replay(timeline, legacy=True)), tokens, 0)
+    after = _measure(asyncio.run(_replay(timeline, legacy=False)), tokens, tokens[mode_instruction(None)])
+    print(f"{len(timeline)} events over {args.minutes:g} min; mode paragraph ≈ {tokens[mode_instruction(None)]} tokens")
+    for label, result in (("before", before), ("after", after)):
+        print(
+            f"{label:>7}: turns={result['turns']} sent={result['sent']} "
+            f"processed={result['processed']}"
+        )
+    print(f"processed mode tokens: -{1 - after['processed'] / max(1, before['processed']):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Lookup latency of the semantic cache at large index sizes.
+
+Fills one (tool, mode) scope with random unit vectors and times lookups of
+query vectors through ``SemanticIndex.search`` (the matrix-vector product the
+cache performs per planner tool call; embedding time is excluded).
+
+Usage:
+  python benchmarks/bench_semantic_cache.py [--entries 100000] [--dim 256]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from adk.services.semantic_cache import SemanticIndex  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.entries, args.dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = SemanticIndex(args.dim, args.entries)
+    start = time.perf_counter()
+    for i, vec in enumerate(vectors):
+        index.add(vec, f"answer-{i}", 0.0)
+    fill_s = time.perf_counter() - start
+
+    queries = vectors[rng.integers(0, args.entries, args.queries)]
+    timings = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.search(q)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+
+    print(f"entries={args.entries} dim={args.dim} fill={fill_s:.2f}s matrix={index._vectors.nbytes / 2**20:.1f} MiB")
+    print(
+        f"lookup p50={statistics.median(timings):.3f} ms "
+        f"p99={timings[int(len(timings) * 0.99) - 1]:.3f} ms max={timings[-1]:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
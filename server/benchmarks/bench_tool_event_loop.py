@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Measure event-loop stalls caused by planner tool calls.
+
+Simulates ``--connections`` live connections that each tick every 10 ms (as
+the audio/SSE loops do) while ``--calls`` tool invocations are in flight
+against a fake model that takes ``--model-latency`` seconds. The blocking
+variant calls the sync ``explain_tool_basics`` inline the way the planner used
+to; the async variant awaits ``explain_tool_basics_async``.
+
+Usage:
+  python benchmarks/bench_tool_event_loop.py [--calls 8] [--model-latency 0.5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import types as pytypes
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from adk.services import genai as genai_module  # noqa: E402
+from adk.tools_basic.agent import explain_tool_basics, explain_tool_basics_async  # noqa: E402
+
+
+def _fake_client(latency: float):
+    def _response():
+        part = pytypes.SimpleNamespace(text="これは黒楽茶碗（くろらくぢゃわん）ですね。")
+        content = pytypes.SimpleNamespace(parts=[part])
+        return pytypes.SimpleNamespace(candidates=[pytypes.SimpleNamespace(content=content)])
+
+    class SyncModels:
+        def generate_content(self, **_):
+            time.sleep(latency)
+            return _response()
+
+    class AioModels:
+        async def generate_content(self, **_):
+            await asyncio.sleep(latency)
+            return _response()
+
+    return pytypes.SimpleNamespace(models=SyncModels(), aio=pytypes.SimpleNamespace(models=AioModels()))
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float], interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append((loop.time() - start - interval) * 1000)
+
+
+async def _run(mode: str, calls: int, connections: int) -> list[float]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    beats = [asyncio.create_task(_heartbeat(stop, lags)) for _ in range(connections)]
+    await asyncio.sleep(0.05)
+
+    async def _blocking_tool():
+        return explain_tool_basics("黒楽茶碗の使い方")
+
+    async def _async_tool():
+        return await explain_tool_basics_async("黒楽茶碗の使い方")
+
+    tool = _blocking_tool if mode == "blocking" else _async_tool
+    await asyncio.gather(*(tool() for _ in range(calls)))
+    stop.set()
+    await asyncio.gather(*beats)
+    return lags
+
+
+def _report(mode: str, lags: list[float]) -> None:
+    lags = sorted(lags) or [0.0]
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{mode:>8}: heartbeat lag mean={statistics.mean(lags):8.2f} ms "
+        f"p99={p99:8.2f} ms max={lags[-1]:8.2f} ms (samples={len(lags)})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--model-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    client = _fake_client(args.model_latency)
+    genai_module.get_client = lambda: client
+
+    for mode in ("blocking", "async"):
+        lags = asyncio.run(_run(mode, args.calls, args.connections))
+        _report(mode, lags)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Upstream audio and end-of-turn latency with and without server-side VAD.
+
+Synthesizes an open-microphone session in a quiet room: ``--utterances``
+voiced utterances of 0.8-3 s (harmonic 120-220 Hz source with a syllabic
+envelope at ``--speech-db`` dBFS) separated by 3-10 s of room noise
+(``--noise-db`` dBFS plus a 50 Hz hum), streamed as 20 ms 16 kHz chunks.
+
+* ``idle timer``: every chunk is sent; activity ends ``AUDIO_IDLE_END_MS`` after
+  the last chunk, which with an open mic only happens when the mic closes (for
+  a client that stops sending on silence it would be 800 ms after speech).
+* ``vad``: :class:`server.core.vad.VoiceActivityDetector` with the server
+  defaults; only speech, pre-roll and hangover are sent.
+
+Reports bytes and seconds of audio sent (Live bills audio input per second),
+segments detected vs utterances, end-of-turn latency after each utterance and
+VAD CPU per 20 ms chunk.
+
+Usage:
+  python benchmarks/bench_vad.py [--utterances 40] [--noise-db -55] [--speech-db -24]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from server.config import settings  # noqa: E402
+from server.core.vad import SPEECH_AUDIO, SPEECH_END, VoiceActivityDetector  # noqa: E402
+
+RATE = 16000
+CHUNK_SAMPLES = 320  # 20 ms
+
+
+def _session(args, rng) -> tuple[np.ndarray, list[int]]:
+    parts, speech_ends, position = [], [], 0
+
+    def room(seconds: float) -> np.ndarray:
+        t = (position + np.arange(int(RATE * seconds))) / RATE
+        noise = rng.normal(0, 10 ** (args.noise_db / 20), t.size)
+        return noise + 10 ** ((args.noise_db - 6) / 20) * np.sin(2 * np.pi * 50 * t)
+
+    for _ in range(args.utterances):
+        for seconds, voiced in ((rng.uniform(3, 10), False), (rng.uniform(0.8, 3.0), True)):
+            segment = room(seconds)
+            if voiced:
+                t = np.arange(segment.size) / RATE
+                f0 = rng.uniform(120, 220)
+                source = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 8))
+                envelope = 0.2 + 0.8 * np.abs(np.sin(2 * np.pi * rng.uniform(2, 3) * t))
+                gain = 10 ** (args.speech_db / 20) / np.sqrt(np.mean(source**2))
+                segment = segment + gain * source * envelope
+            parts.append(segment)
+            position += segment.size
+            if voiced:
+                speech_ends.append(position)
+    parts.append(room(3.0))
+    pcm = np.clip(np.concatenate(parts) * 32767, -32768, 32767).astype("<i2")
+    return pcm, speech_ends
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=40)
+    parser.add_argument("--noise-db", type=float, default=-55.0)
+    parser.add_argument("--speech-db", type=float, default=-24.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pcm, speech_ends = _session(args, np.random.default_rng(args.seed))
+    data = pcm.tobytes()
+    chunk_bytes = CHUNK_SAMPLES * 2
+    total_s = len(pcm) / RATE
+    print(f"session: {total_s:.0f} s audio, {args.utterances} utterances, {sum(1 for _ in speech_ends)} turn ends")
+
+    print(
+        f"  idle timer: sent {len(data) / 1e6:7.2f} MB = {total_s:7.1f} s of Live audio; "
+        f"turn end after speech: never while the mic is open ({settings.AUDIO_IDLE_END_MS} ms once the client stops sending)"
+    )
+
+    vad = VoiceActivityDetector(
+        sample_rate=RATE,
+        threshold_db=settings.VAD_THRESHOLD_DB,
+        hangover_ms=settings.VAD_HANGOVER_MS,
+        preroll_ms=settings.VAD_PREROLL_MS,
+    )
+    sent, ends = 0, []
+    started = time.perf_counter()
+    for offset in range(0, len(data), chunk_bytes):
+        for event, payload in vad.process(data[offset : offset + chunk_bytes]):
+            if event == SPEECH_AUDIO:
+                sent += len(payload)
+            elif event == SPEECH_END:
+                ends.append((offset + chunk_bytes) // 2)
+    elapsed = time.perf_counter() - started
+    chunks = -(-len(data) // chunk_bytes)
+
+    latencies = []
+    for speech_end in speech_ends:
+        after = [end for end in ends if end >= speech_end]
+        if after:
+            latencies.append((after[0] - speech_end) / RATE * 1000)
+    print(
+        f"         vad: sent {sent / 1e6:7.2f} MB = {sent / 2 / RATE:7.1f} s of Live audio "
+        f"({1 - sent / len(data):.1%} less); segments {vad.stats['segments']} for {len(speech_ends)} utterances"
+    )
+    if latencies:
+        print(
+            f"              turn end after speech: median {statistics.median(latencies):.0f} ms, "
+            f"max {max(latencies):.0f} ms; cpu {elapsed / chunks * 1e6:.1f} us per 20 ms chunk"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare the JSON/base64 and binary WebSocket media protocols.
+
+For 16 kHz 16-bit mono PCM chunks (``--audio-ms`` each) and 720p JPEG frames
+(``chagama.jpeg`` scaled to 1280x720, or random bytes without Pillow), measures
+per message:
+
+* wire bytes (JSON text frame vs 2-byte header + payload);
+* client encode time (``json.dumps`` + base64 vs header concat);
+* server decode time up to the payload ``bytes`` handed to the queues
+  (UTF-8 decode + ``json.loads`` + ``b64decode`` vs ``memoryview`` header
+  parse + one copy), using :mod:`server.core.ws_protocol`.
+
+Throughput is payload MB/s through the server-side decode.
+
+Usage:
+  python benchmarks/bench_ws_protocol.py [--messages 2000] [--audio-ms 100]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from server.core import ws_protocol  # noqa: E402
+
+
+def _jpeg_720p() -> bytes:
+    try:
+        from PIL import Image
+
+        with Image.open(os.path.join(ROOT, "chagama.jpeg")) as img:
+            buf = io.BytesIO()
+            img.convert("RGB").resize((1280, 720)).save(buf, format="JPEG", quality=85)
+            return buf.getvalue()
+    except Exception:
+        return os.urandom(150_000)
+
+
+def _json_client(kind: str, payload: bytes) -> bytes:
+    # The browser sends a text frame; the server's WebSocket layer sees UTF-8 bytes
+    return json.dumps({"type": kind, "data": base64.b64encode(payload).decode("ascii")}).encode("utf-8")
+
+
+def _json_server(wire: bytes) -> bytes:
+    _, payload = ws_protocol.parse_json_message(wire.decode("utf-8"))
+    return payload
+
+
+def _binary_client(kind: str, payload: bytes) -> bytes:
+    return ws_protocol.encode_frame(ws_protocol.AUDIO if kind == "audio" else ws_protocol.VIDEO, payload)
+
+
+def _binary_server(wire: bytes) -> bytes:
+    _, _, payload = ws_protocol.parse_frame(wire)
+    return payload.tobytes()
+
+
+def _time(fn, arg, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        fn(arg)
+    return (time.perf_counter() - started) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--audio-ms", type=int, default=100)
+    args = parser.parse_args()
+
+    samples = {
+        "audio": os.urandom(16000 * 2 * args.audio_ms // 1000),
+        "video": _jpeg_720p(),
+    }
+    for kind, payload in samples.items():
+        n = args.messages if kind == "audio" else max(1, args.messages // 10)
+        print(f"{kind}: payload {len(payload)} bytes, {n} messages")
+        for label, encode, decode in (("json", _json_client, _json_server), ("binary", _binary_client, _binary_server)):
+            wire = encode(kind, payload)
+            assert decode(wire) == payload
+            encode_s = _time(lambda p: encode(kind, p), payload, n)
+            decode_s = _time(decode, wire, n)
+            print(
+                f"  {label:>6}: wire={len(wire):>8} B (+{len(wire) / len(payload) - 1:6.1%}) "
+                f"encode={encode_s * 1e6:8.1f} us decode={decode_s * 1e6:8.1f} us "
+                f"server={len(payload) / decode_s / 1e6:8.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,29 @@
+from server.config import settings
 from server.core.coordinator import MultimodalServer
 from adk.agent import root_agent as _analyze_agent
+from adk.services.model_router import ModelRouter, set_model_router
 
 try:
     from adk.agent_alt import root_agent_alt as _alt_agent
 except Exception:
     _alt_agent = None
 
+# Model selection comes from Settings: fixed models for the live agents,
+# SLO-driven tiers for the sub-agent tools.
+_analyze_agent.model = settings.PLANNER_MODEL
+if _alt_agent is not None:
+    _alt_agent.model = settings.METADATA_MODEL
+set_model_router(
+    ModelRouter.from_config(
+        settings.MODEL_ROUTES,
+        window=settings.MODEL_ROUTE_WINDOW,
+        min_samples=settings.MODEL_ROUTE_MIN_SAMPLES,
+        max_error_rate=settings.MODEL_ROUTE_MAX_ERROR_RATE,
+        probe_every=settings.MODEL_ROUTE_PROBE_EVERY,
+        recover_after=settings.MODEL_ROUTE_RECOVER_AFTER,
+    )
+)
+
 # Agents registry (path-based switching)
 agents = {
     "analyze": _analyze_agent,
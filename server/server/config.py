@@ -6,8 +6,51 @@ class Settings(BaseSettings):
     SEND_SAMPLE_RATE: int = 16000
     ENABLE_AUDIO: bool = False
     AUDIO_IDLE_END_MS: int = 800
-    # Limit concurrent Live API sessions (e.g., Vertex AI live sessions)
+    # Client audio is coalesced into blocks of this many ms before send_realtime (0 = send each chunk)
+    AUDIO_BLOCK_MS: int = 60
+    # Server-side voice activity detection when ENABLE_AUDIO is on: frames quieter than VAD_THRESHOLD_DB
+    # dBFS (or near the adaptive noise floor) are not sent, VAD_HANGOVER_MS of silence ends the turn, and
+    # VAD_PREROLL_MS of audio before each onset is sent with it (AUDIO_VAD=false keeps the idle timer only)
+    AUDIO_VAD: bool = True
+    VAD_THRESHOLD_DB: float = -45.0
+    VAD_HANGOVER_MS: int = 300
+    VAD_PREROLL_MS: int = 200
+    # Bounds of the adaptive limit on concurrent Live API sessions (e.g., Vertex AI live sessions);
+    # it starts at the max, halves on RESOURCE_EXHAUSTED and grows back on sustained success
     LIVE_SESSIONS_MAX: int = 50
+    LIVE_SESSIONS_MIN: int = 1
+    # Per-turn deadline (seconds) for model calls issued by planner tools; 0 disables
+    TURN_DEADLINE_S: float = 60.0
+    # Per-connection queue bounds: video keeps the newest VIDEO_QUEUE_MAX frames, audio drops the
+    # oldest chunks beyond AUDIO_QUEUE_MAX_BYTES (0 = unbounded), and SSE output blocks the producer
+    # for up to SSE_OUTBOUND_PUT_TIMEOUT_S once SSE_OUTBOUND_QUEUE_MAX messages are pending, then
+    # disconnects the client (0 = wait forever)
+    VIDEO_QUEUE_MAX: int = 2
+    AUDIO_QUEUE_MAX_BYTES: int = 256 * 1024
+    SSE_OUTBOUND_QUEUE_MAX: int = 256
+    SSE_OUTBOUND_PUT_TIMEOUT_S: float = 5.0
+    # Frames reach the Live API only on a scene change (dHash distance to the last forwarded
+    # frame >= FRAME_SCENE_THRESHOLD bits; 0 forwards all) and at most FRAME_MAX_FPS per connection (0 = no cap)
+    FRAME_SCENE_THRESHOLD: int = 6
+    FRAME_MAX_FPS: float = 1.0
+    # Default vision mode of Live connections: "frames" sends raw JPEGs, "text" sends
+    # deduplicated vision-agent summaries (per connection via the "vision_mode" message)
+    LIVE_VISION_MODE: str = "frames"
+    # Frames within this dHash distance of the last summarized one are skipped in text mode
+    VISION_PROXY_MAX_DISTANCE: int = 8
+    # Live (planner) and metadata agent models
+    PLANNER_MODEL: str = "gemini-2.0-flash-exp"
+    METADATA_MODEL: str = "gemini-2.0-flash-exp"
+    # Per-tool model tiers as JSON, e.g.
+    # {"analyze_setting": {"primary": "gemini-2.5-flash", "fallback": "gemini-2.0-flash-lite", "slo_ms": 8000}}
+    MODEL_ROUTES: dict[str, dict] = {}
+    # Degrade when the primary's error rate over the last MODEL_ROUTE_WINDOW calls exceeds this
+    MODEL_ROUTE_MAX_ERROR_RATE: float = 0.2
+    MODEL_ROUTE_WINDOW: int = 50
+    MODEL_ROUTE_MIN_SAMPLES: int = 10
+    # While degraded, every Nth call probes the primary; recover after this many good probes
+    MODEL_ROUTE_PROBE_EVERY: int = 10
+    MODEL_ROUTE_RECOVER_AFTER: int = 3
 
 
 settings = Settings()  # reads from environment if present
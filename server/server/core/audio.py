@@ -0,0 +1,143 @@
+"""Per-connection audio coalescing and activity tracking for the Live API.
+
+Browsers deliver microphone audio in small chunks (often 20 ms, i.e. ~50
+messages per second). Sending each one with ``send_realtime`` and starting a
+sleeping "activity end" task per chunk costs thousands of short-lived tasks
+per second across connections. :class:`AudioCoalescer` instead buffers PCM
+into fixed ``block_ms`` blocks before handing them to the
+``LiveRequestQueue``, and keeps one idle timer per connection: a single
+``loop.call_later`` handle that re-arms itself for the remaining time when
+audio kept arriving, so no task or handle is created per chunk. When the
+timer finds the stream idle it flushes the partial block and, with
+``activity`` on, sends ``activity_end``.
+
+With a :class:`~server.core.vad.VoiceActivityDetector` attached, speech
+decides instead of chunk arrival: silent frames are withheld, the detector's
+onset (with its pre-roll) sends ``activity_start`` and its hangover sends
+``activity_end``. The idle timer then only closes a segment the client
+stopped sending in the middle of.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from google.genai import types
+
+from .vad import SPEECH_END, SPEECH_START, VoiceActivityDetector
+
+logger = logging.getLogger(__name__)
+
+_BYTES_PER_SAMPLE = 2  # 16-bit mono PCM
+
+
+class AudioCoalescer:
+    """Buffers one connection's PCM stream into fixed-duration realtime blobs."""
+
+    def __init__(
+        self,
+        live_request_queue,
+        *,
+        sample_rate: int,
+        block_ms: int,
+        idle_end_ms: int,
+        activity: bool,
+        vad: VoiceActivityDetector | None = None,
+        clock=time.monotonic,
+    ):
+        self.queue = live_request_queue
+        self.mime_type = f"audio/pcm;rate={sample_rate}"
+        block = sample_rate * _BYTES_PER_SAMPLE * max(0, block_ms) // 1000
+        self.block_bytes = block - block % _BYTES_PER_SAMPLE
+        self.idle_s = idle_end_ms / 1000
+        self.activity = activity
+        self.vad = vad
+        self._clock = clock
+        self._buffer = bytearray()
+        self._open = False
+        self._last = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self.stats = {"chunks": 0, "blocks": 0, "bytes": 0, "activity_starts": 0, "activity_ends": 0, "timer_arms": 0}
+
+    def feed(self, chunk: bytes) -> None:
+        """Add a client chunk; full blocks are sent immediately."""
+        if not chunk:
+            return
+        self.stats["chunks"] += 1
+        self._last = self._clock()
+        if self.vad is None:
+            if self.activity:
+                self._start()
+            self._append(chunk)
+        else:
+            for event, data in self.vad.process(chunk):
+                if event == SPEECH_START:
+                    self._start()
+                elif event == SPEECH_END:
+                    self._end()
+                else:
+                    self._append(data)
+        if self._timer is None:
+            self._arm(self.idle_s)
+
+    def _start(self) -> None:
+        if not self._open:
+            self.queue.send_activity_start()
+            self.stats["activity_starts"] += 1
+            self._open = True
+
+    def _end(self) -> None:
+        self.flush()
+        if self._open:
+            self.queue.send_activity_end()
+            self.stats["activity_ends"] += 1
+            self._open = False
+
+    def _append(self, chunk: bytes) -> None:
+        if self.block_bytes <= 0:
+            self._send(chunk)
+            return
+        self._buffer += chunk
+        while len(self._buffer) >= self.block_bytes:
+            self._send(bytes(self._buffer[: self.block_bytes]))
+            del self._buffer[: self.block_bytes]
+
+    def _send(self, data: bytes) -> None:
+        self.queue.send_realtime(types.Blob(data=data, mime_type=self.mime_type))
+        self.stats["blocks"] += 1
+        self.stats["bytes"] += len(data)
+
+    def _arm(self, delay: float) -> None:
+        self._timer = asyncio.get_running_loop().call_later(max(0.0, delay), self._on_timer)
+        self.stats["timer_arms"] += 1
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        remaining = self._last + self.idle_s - self._clock()
+        # Audio kept arriving since the timer was armed: wait for the rest of the idle window
+        if remaining > 0.001:
+            self._arm(remaining)
+            return
+        try:
+            if self.vad is not None:
+                self.vad.reset()
+            self._end()
+        except Exception:
+            logger.exception("[audio] idle flush failed")
+
+    def flush(self) -> None:
+        """Send the buffered partial block, if any."""
+        if self._buffer:
+            self._send(bytes(self._buffer))
+            self._buffer.clear()
+
+    def as_dict(self) -> dict:
+        return {**self.stats, "vad": self.vad.as_dict() if self.vad is not None else None}
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._buffer.clear()
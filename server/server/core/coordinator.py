@@ -1,9 +1,9 @@
 import asyncio
-import base64
 import logging
 import os
 import json
-from typing import Dict, Optional
+import time
+from typing import Dict, NamedTuple, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import WebSocket
@@ -13,12 +13,39 @@ from google.adk.runners import Runner
 from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.genai import types
 
+from adk.planner.modes import MODE_STATE_KEY, mode_instruction, normalize_mode
+from adk.services.deadline import CallScope, bind_scope
+from adk.services.genai import get_client_pool, run_sync
+from adk.services.limiter import AdaptiveLimiter
+from adk.services.usage import usage_ledger
+from adk.vision.cache import frame_fingerprint
+
 from ..config import settings
 from ..services.sessions import SessionService
+from .audio import AudioCoalescer
+from .vad import VoiceActivityDetector, vad_available
+from .queues import ByteBudgetQueue, LatestQueue, OutboundQueue, queue_stats
+from .frame_selector import FORWARDED, FrameSelector
+from . import ws_protocol
+from .vision_proxy import FRAMES, TEXT, VisionProxy, normalize_vision_mode
 
 logger = logging.getLogger(__name__)
 
 
+class SseEvent(NamedTuple):
+    """A named SSE event queued on an outbound queue (plain strings are default messages)."""
+
+    event: str
+    data: str
+
+
+def parse_flag(value) -> bool:
+    """Client on/off flag: JSON booleans or 1/true/yes/on."""
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
 class MultimodalServer:
     """ADK-integrated main server handling WS/SSE orchestration.
 
@@ -32,25 +59,97 @@ class MultimodalServer:
         # connection_id -> {user_id, agent_key, session_id}
         self.connection_index: Dict[str, dict] = {}
         self._last_user_content: Dict[str, types.Content] = {}
-        self._audio_state: Dict[str, dict] = {}
+        # Live audio coalescers (block buffer + idle timer) of the running connections
+        self._audio_coalescers: Dict[str, AudioCoalescer] = {}
         self._user_mode: Dict[str, str] = {}
+        # Mode the running Live session already knows (system instruction or a previous turn)
+        self._mode_sent: Dict[str, str] = {}
+        # Per-connection vision mode: raw frames or text summaries (see .vision_proxy)
+        self._vision_mode: Dict[str, str] = {}
+        # Connections that opted in to tool_progress frames (WS/SSE "progress" query param or WS message)
+        self._progress_enabled: Dict[str, bool] = {}
+        # connection_id -> sink emitter for tool_progress frames of the running response handler
+        self._progress_emitters: Dict[str, object] = {}
+        # connection_id -> accepted WS subprotocol (None = JSON/base64 framing)
+        self._ws_protocol: Dict[str, Optional[str]] = {}
+        self.vision_proxy = VisionProxy(max_distance=settings.VISION_PROXY_MAX_DISTANCE)
+        # Drops frames without a scene change and caps forwarded fps per connection
+        self.frame_selector = FrameSelector(threshold=settings.FRAME_SCENE_THRESHOLD, max_fps=settings.FRAME_MAX_FPS)
+        # connection_id -> (vision mode, frame receive time) of the frame turn awaiting its first reply
+        self._awaiting_reply: Dict[str, tuple] = {}
         # For SSE users, a simple per-client state bucket (created by app routes)
         self._sse_clients: Dict[str, dict] = {}
-        # Global limiter for concurrent live sessions to avoid RESOURCE_EXHAUSTED
-        self._live_slots = asyncio.Semaphore(settings.LIVE_SESSIONS_MAX)
-        self._live_in_use = 0
+        # Per-connection scopes used to time out / abort in-flight model calls
+        self._call_scopes: Dict[str, CallScope] = {}
+        # Global limiter for concurrent live sessions; shrinks on RESOURCE_EXHAUSTED
+        self.live_limiter = AdaptiveLimiter(
+            "live", max_limit=settings.LIVE_SESSIONS_MAX, min_limit=settings.LIVE_SESSIONS_MIN
+        )
 
     @asynccontextmanager
     async def live_session_slot(self):
-        await self._live_slots.acquire()
-        self._live_in_use += 1
-        logger.info("[live] acquired slot (%d/%d)", self._live_in_use, settings.LIVE_SESSIONS_MAX)
-        try:
-            yield
-        finally:
-            self._live_slots.release()
-            self._live_in_use = max(0, self._live_in_use - 1)
-            logger.info("[live] released slot (%d/%d)", self._live_in_use, settings.LIVE_SESSIONS_MAX)
+        async with self.live_limiter.acquire():
+            logger.info("[live] acquired slot (%d/%d)", self.live_limiter.in_flight, self.live_limiter.limit)
+            try:
+                yield
+            finally:
+                logger.info("[live] releasing slot (%d/%d)", self.live_limiter.in_flight, self.live_limiter.limit)
+
+    def call_scope(self, connection_id: str) -> CallScope:
+        """Return the (open) model-call scope for a connection, creating it on demand."""
+        scope = self._call_scopes.get(connection_id)
+        if scope is None or scope.closed:
+            user_id = self.connection_index.get(connection_id, {}).get("user_id")
+            scope = CallScope(connection_id, user_id=user_id, mode=self._get_mode(connection_id))
+            self._call_scopes[connection_id] = scope
+            self._apply_progress(connection_id)
+        return scope
+
+    def set_progress(self, connection_id: str, enabled: bool) -> None:
+        """Opt a connection in to (or out of) ``tool_progress`` frames; off by default."""
+        self._progress_enabled[connection_id] = bool(enabled)
+        self._apply_progress(connection_id)
+
+    def _apply_progress(self, connection_id: str) -> None:
+        # Without a sink on the scope, tools make plain (non-streaming) calls
+        scope = self._call_scopes.get(connection_id)
+        if scope is not None:
+            enabled = self._progress_enabled.get(connection_id, False)
+            scope.progress = self._progress_emitters.get(connection_id) if enabled else None
+
+    def start_turn(self, connection_id: str):
+        """Start the per-turn deadline for model calls triggered by a user turn."""
+        self.call_scope(connection_id).start_turn(settings.TURN_DEADLINE_S)
+
+    def abort_calls(self, connection_id: str, reason: str) -> int:
+        """Abort outstanding model calls for a connection (disconnect/teardown)."""
+        self.attach_usage(connection_id)
+        self._mode_sent.pop(connection_id, None)
+        self._awaiting_reply.pop(connection_id, None)
+        self._progress_enabled.pop(connection_id, None)
+        self._progress_emitters.pop(connection_id, None)
+        self.vision_proxy.discard(connection_id)
+        self.frame_selector.discard(connection_id)
+        queue_stats.discard(connection_id)
+        scope = self._call_scopes.pop(connection_id, None)
+        if scope is None:
+            return 0
+        return scope.close(reason)
+
+    def attach_usage(self, connection_id: str) -> dict | None:
+        """Store the connection's token usage in its session state under ``usage``."""
+        summary = usage_ledger.connection(connection_id)
+        session_id = self.connection_index.get(connection_id, {}).get("session_id")
+        session = self.session_service._sessions.get(session_id) if session_id else None
+        if summary is None or session is None:
+            return None
+        connections = {**session.state.get("usage", {}).get("connections", {}), connection_id: summary["totals"]}
+        session.state["usage"] = {
+            "total_tokens": sum(t["total_tokens"] for t in connections.values()),
+            "cost_usd": round(sum(t["cost_usd"] for t in connections.values()), 6),
+            "connections": connections,
+        }
+        return session.state["usage"]
 
     async def process_media_stream(self, agent, websocket: WebSocket, connection_id: str):
         """End-to-end WS media stream orchestration (mirrors previous app.py)."""
@@ -77,51 +176,70 @@ class MultimodalServer:
 
         runner = Runner(agent=agent, app_name="adk-video-app", session_service=self.session_service)
 
-        audio_queue: asyncio.Queue = asyncio.Queue()
-        video_queue: asyncio.Queue = asyncio.Queue()
+        audio_queue, video_queue = self.ingest_queues(connection_id)
+        # tool_progress frames are opt-in: ?progress=1 at connect or a {"type": "progress"} message
+        self.set_progress(connection_id, parse_flag(websocket.query_params.get("progress")))
+
+        async def _enqueue_media(kind: int, payload: bytes, mode: str = "webcam", timestamp=None):
+            if kind == ws_protocol.AUDIO:
+                await audio_queue.put(payload)
+                logger.info("Enqueued audio chunk: %d bytes", len(payload))
+            else:
+                await video_queue.put({"data": payload, "mode": mode, "timestamp": timestamp, "received": time.perf_counter()})
+                logger.info("Enqueued video frame: %d bytes", len(payload))
+
+        async def _handle_json_message(message: str):
+            data, payload = ws_protocol.parse_json_message(message)
+            message_type = data.get("type")
+            if message_type == "audio":
+                await _enqueue_media(ws_protocol.AUDIO, payload)
+            elif message_type == "video":
+                await _enqueue_media(ws_protocol.VIDEO, payload, data.get("mode", "webcam"), data.get("timestamp"))
+            elif message_type == "mode":
+                self.set_mode(connection_id, data.get("data") or data.get("value") or "")
+            elif message_type == "vision_mode":
+                self.set_vision_mode(connection_id, data.get("data") or data.get("value") or "")
+            elif message_type == "progress":
+                self.set_progress(connection_id, parse_flag(data.get("value", data.get("data"))))
+            elif message_type == "text":
+                text = (data.get("data") or "").strip()
+                if text:
+                    content = types.Content(role="user", parts=self.text_turn_parts(connection_id, text))
+                    self.start_turn(connection_id)
+                    live_request_queue.send_content(content)
+                    self._last_user_content[connection_id] = content
+                    logger.info("Queued user text turn (%d chars)", len(text))
 
         async def _handle_websocket_messages():
             try:
-                async for message in websocket.iter_text():
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        break
                     try:
-                        data = json.loads(message)
-                        message_type = data.get("type")
-                        if message_type == "audio":
-                            audio_bytes = base64.b64decode(data.get("data", ""))
-                            await audio_queue.put(audio_bytes)
-                            logger.info("Enqueued audio chunk: %d bytes", len(audio_bytes) if audio_bytes else 0)
-                        elif message_type == "video":
-                            video_bytes = base64.b64decode(data.get("data", ""))
-                            await video_queue.put({"data": video_bytes, "mode": data.get("mode", "webcam"), "timestamp": data.get("timestamp")})
-                            logger.info("Enqueued video frame: %d bytes", len(video_bytes) if video_bytes else 0)
-                        elif message_type == "mode":
-                            raw = (data.get("data") or data.get("value") or "").strip().lower()
-                            aliases = {"初級": "beginner", "中級": "intermediate", "上級": "advanced"}
-                            normalized = aliases.get(raw, raw)
-                            if normalized in ("beginner", "intermediate", "advanced"):
-                                self._user_mode[connection_id] = normalized
-                                logger.info("Set mode for %s -> %s", connection_id, normalized)
-                        elif message_type == "text":
-                            text = (data.get("data") or "").strip()
-                            if text:
-                                parts = [
-                                    types.Part.from_text(text=self._mode_instruction(connection_id)),
-                                    types.Part.from_text(text=text),
-                                ]
-                                content = types.Content(role="user", parts=parts)
-                                live_request_queue.send_content(content)
-                                self._last_user_content[connection_id] = content
-                                logger.info("Queued user text turn (%d chars)", len(text))
+                        if message.get("bytes") is not None:
+                            kind, flags, payload = ws_protocol.parse_frame(message["bytes"])
+                            # The only payload copy: Live API blobs and the frame selector need bytes
+                            await _enqueue_media(kind, payload.tobytes(), ws_protocol.video_mode(flags))
+                        elif message.get("text") is not None:
+                            await _handle_json_message(message["text"])
                     except Exception:
                         logger.exception("WS message handling error")
             except Exception:
                 logger.info("WebSocket disconnected")
 
+        binary = self._ws_protocol.get(connection_id) == ws_protocol.BINARY_SUBPROTOCOL
+
         class _WebSocketSink:
             def __init__(self, ws: WebSocket):
                 self.ws = ws
             async def send_text(self, data: str):
                 await self.ws.send_text(data)
+            async def send_audio(self, pcm: bytes):
+                if binary:
+                    await self.ws.send_bytes(ws_protocol.encode_frame(ws_protocol.AUDIO, pcm))
+                else:
+                    await self.ws.send_text(ws_protocol.encode_json_audio(pcm))
 
         # Run tasks explicitly so we can cancel cleanly on disconnect
         ws_task = asyncio.create_task(_handle_websocket_messages(), name=f"ws-messages:{connection_id}")
@@ -139,6 +257,8 @@ class MultimodalServer:
             except Exception:
                 pass
         finally:
+            # Abort model calls first so tool tasks see a closed scope, not a bare cancel
+            self.abort_calls(connection_id, "disconnect")
             for t in (ws_task, audio_task, video_task, resp_task):
                 if not t.done():
                     t.cancel()
@@ -146,6 +266,18 @@ class MultimodalServer:
             # Ensure we drop the connection reference
             self.disconnect(connection_id)
 
+    def ingest_queues(self, connection_id: str) -> tuple:
+        """Bounded audio (byte budget, oldest dropped) and video (latest frame wins) queues."""
+        audio_queue = ByteBudgetQueue(connection_id, max_bytes=settings.AUDIO_QUEUE_MAX_BYTES)
+        video_queue = LatestQueue(connection_id, maxsize=settings.VIDEO_QUEUE_MAX)
+        return audio_queue, video_queue
+
+    def outbound_queue(self, connection_id: str) -> OutboundQueue:
+        """Bounded SSE outbound queue; a client that stays behind is disconnected."""
+        return OutboundQueue(
+            connection_id, maxsize=settings.SSE_OUTBOUND_QUEUE_MAX, put_timeout=settings.SSE_OUTBOUND_PUT_TIMEOUT_S
+        )
+
     def build_run_config(self) -> RunConfig:
         if settings.ENABLE_AUDIO:
             return RunConfig(
@@ -174,6 +306,13 @@ class MultimodalServer:
         )
 
     def _ensure_google_config(self) -> bool:
+        ok = self._resolve_google_config()
+        if ok:
+            # Rebuilds the shared GenAI client only when the credentials actually changed.
+            get_client_pool().refresh()
+        return ok
+
+    def _resolve_google_config(self) -> bool:
         if os.getenv("GOOGLE_API_KEY"):
             return True
         project = os.getenv("GOOGLE_CLOUD_PROJECT")
@@ -194,13 +333,17 @@ class MultimodalServer:
         return bool(os.getenv("GOOGLE_API_KEY") or (project and location))
 
     async def connect(self, websocket: WebSocket, connection_id: str):
-        await websocket.accept()
+        # Clients opt into binary media frames by offering the subprotocol (see .ws_protocol)
+        subprotocol = ws_protocol.negotiate(websocket.scope.get("subprotocols"))
+        await websocket.accept(subprotocol=subprotocol)
+        self._ws_protocol[connection_id] = subprotocol
         self.active_connections[connection_id] = websocket
-        logger.info("Connection %s connected", connection_id)
+        logger.info("Connection %s connected (%s)", connection_id, subprotocol or "json")
 
     def disconnect(self, connection_id: str):
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
+        self._ws_protocol.pop(connection_id, None)
         logger.info("Connection %s disconnected", connection_id)
 
     async def create_connection(self, *, agent_key: str, user_id: str, session_id: Optional[str] = None) -> dict:
@@ -220,60 +363,91 @@ class MultimodalServer:
         }
         return {"connection_id": connection_id, "user_id": user_id, "session_id": sess.id, "agent_key": agent_key}
 
-    async def _process_and_send_audio(self, live_request_queue: LiveRequestQueue, audio_queue: asyncio.Queue, connection_id: str):
-        while True:
-            try:
-                data = await audio_queue.get()
-                if settings.ENABLE_AUDIO:
-                    st = self._audio_state.setdefault(connection_id, {"open": False, "last": 0.0})
-                    now = asyncio.get_event_loop().time()
-                    if not st["open"]:
-                        live_request_queue.send_activity_start()
-                        st["open"] = True
-                    st["last"] = now
-                    asyncio.create_task(self._schedule_audio_activity_end(live_request_queue, connection_id))
-
-                live_request_queue.send_realtime(
-                    types.Blob(
-                        data=data,
-                        mime_type=f"audio/pcm;rate={settings.SEND_SAMPLE_RATE}",
-                    )
-                )
-                audio_queue.task_done()
-            except Exception as e:
-                logger.error("Error processing audio: %s", e)
+    def _voice_activity_detector(self) -> Optional[VoiceActivityDetector]:
+        if not (settings.ENABLE_AUDIO and settings.AUDIO_VAD):
+            return None
+        if not vad_available():
+            logger.warning("AUDIO_VAD is on but numpy is not installed; using the idle timer only")
+            return None
+        return VoiceActivityDetector(
+            sample_rate=settings.SEND_SAMPLE_RATE,
+            threshold_db=settings.VAD_THRESHOLD_DB,
+            hangover_ms=settings.VAD_HANGOVER_MS,
+            preroll_ms=settings.VAD_PREROLL_MS,
+        )
 
-    async def _schedule_audio_activity_end(self, live_request_queue: LiveRequestQueue, connection_id: str):
-        await asyncio.sleep(settings.AUDIO_IDLE_END_MS / 1000)
-        st = self._audio_state.get(connection_id)
-        if not st:
+    async def _process_and_send_audio(self, live_request_queue: LiveRequestQueue, audio_queue: asyncio.Queue, connection_id: str):
+        coalescer = AudioCoalescer(
+            live_request_queue,
+            sample_rate=settings.SEND_SAMPLE_RATE,
+            block_ms=settings.AUDIO_BLOCK_MS,
+            idle_end_ms=settings.AUDIO_IDLE_END_MS,
+            activity=settings.ENABLE_AUDIO,
+            vad=self._voice_activity_detector(),
+        )
+        self._audio_coalescers[connection_id] = coalescer
+        try:
+            while True:
+                try:
+                    data = await audio_queue.get()
+                    coalescer.feed(data)
+                    audio_queue.task_done()
+                except Exception as e:
+                    logger.error("Error processing audio: %s", e)
+        finally:
+            coalescer.close()
+            if self._audio_coalescers.get(connection_id) is coalescer:
+                del self._audio_coalescers[connection_id]
+
+    async def send_video_frame(self, live_request_queue: LiveRequestQueue, connection_id: str, video_bytes: bytes, received: Optional[float] = None):
+        """Forward one frame according to the connection's vision mode, unless the frame selector drops it."""
+        # Decode the JPEG for its dHash once, off the event loop; the selector, the vision
+        # proxy and the summary cache all reuse it
+        fingerprint = await run_sync(frame_fingerprint, video_bytes)
+        if self.frame_selector.select(connection_id, video_bytes, fingerprint) != FORWARDED:
+            return
+        received = time.perf_counter() if received is None else received
+        if self._get_vision_mode(connection_id) != TEXT:
+            await self._send_video_content_immediate(live_request_queue, connection_id, video_bytes, received)
             return
-        now = asyncio.get_event_loop().time()
-        if st["open"] and now - st["last"] >= (settings.AUDIO_IDLE_END_MS / 1000) - 0.05:
-            live_request_queue.send_activity_end()
-            st["open"] = False
 
-    async def _send_video_content_immediate(self, live_request_queue: LiveRequestQueue, connection_id: str, video_bytes: bytes):
+        def _send(content: types.Content, frame_received: float):
+            live_request_queue.send_content(content)
+            self._last_user_content[connection_id] = content
+            self._awaiting_reply[connection_id] = (TEXT, frame_received)
+
+        # Child tasks copy the context, so the summary call runs under the connection's scope
+        with bind_scope(self.call_scope(connection_id)):
+            self.vision_proxy.submit(
+                connection_id,
+                video_bytes,
+                send=_send,
+                start_turn=lambda: self.start_turn(connection_id),
+                received=received,
+                fingerprint=fingerprint,
+            )
+
+    async def _send_video_content_immediate(self, live_request_queue: LiveRequestQueue, connection_id: str, video_bytes: bytes, received: Optional[float] = None):
         try:
             parts = [
-                types.Part.from_text(text=self._mode_instruction(connection_id)),
+                *self.mode_change_parts(connection_id),
                 types.Part.from_text(text="この画像の内容を短く説明してください。道具があれば特定して。"),
                 types.Part.from_bytes(data=video_bytes, mime_type="image/jpeg"),
             ]
             content = types.Content(role="user", parts=parts)
+            self.start_turn(connection_id)
             live_request_queue.send_content(content)
             self._last_user_content[connection_id] = content
+            self._awaiting_reply[connection_id] = (FRAMES, time.perf_counter() if received is None else received)
             logger.info("Queued image content turn to Live API (%d bytes)", len(video_bytes) if video_bytes else 0)
             await asyncio.sleep(0.3)
-            live_request_queue.send_content(
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=self._mode_instruction(connection_id)),
-                        types.Part.from_text(text="上の画像について返答してください。"),
-                    ],
-                )
-            )
+            nudge = types.Content(role="user", parts=[types.Part.from_text(text="上の画像について返答してください。")])
+            live_request_queue.send_content(nudge)
+            stats = self.vision_proxy.stats
+            stats[FRAMES].frames += 1
+            stats[FRAMES].raw_frames_sent += 1
+            stats.record_content(FRAMES, content)
+            stats.record_content(FRAMES, nudge)
         except Exception as e:
             logger.error("Immediate video content send failed: %s", e)
 
@@ -287,32 +461,65 @@ class MultimodalServer:
             try:
                 item = await video_queue.get()
                 video_bytes = item.get("data") if isinstance(item, dict) else item
-                await self._send_video_content_immediate(live_request_queue, connection_id, video_bytes)
+                received = item.get("received") if isinstance(item, dict) else None
+                await self.send_video_frame(live_request_queue, connection_id, video_bytes, received)
                 video_queue.task_done()
             except Exception as e:
                 logger.error("Error processing video: %s", e)
 
     async def _receive_and_process_responses(self, runner: Runner, session, live_request_queue: LiveRequestQueue, run_config: RunConfig, sink, connection_id: str):
+        async def _send_progress(message: dict):
+            data = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+            # SSE sends it as a named event so default onmessage listeners never see it
+            send_event = getattr(sink, "send_event", None)
+            if send_event is not None:
+                await send_event("tool_progress", data)
+            else:
+                await sink.send_text(data)
+
         try:
-            async with self.live_session_slot():
-                async for event in runner.run_live(
-                    user_id=self.connection_index.get(connection_id, {}).get("user_id"),
-                    session_id=session.id if session else None,
-                    live_request_queue=live_request_queue,
-                    run_config=run_config,
-                ):
-                    if event.content and event.content.parts:
-                        for part in event.content.parts:
-                            if hasattr(part, "inline_data") and part.inline_data and part.inline_data.data:
-                                b64_audio = base64.b64encode(part.inline_data.data).decode("utf-8")
-                                msg = json.dumps({"type": "audio", "data": b64_audio}, separators=(",", ":"))
-                                await sink.send_text(msg)
-                            if hasattr(part, "text") and part.text:
-                                await sink.send_text(part.text)
-                            if getattr(part, "function_response", None) and getattr(part.function_response, "name", "") == "transfer_to_agent":
-                                content = self._last_user_content.get(connection_id)
-                                if content is not None:
-                                    asyncio.create_task(self._schedule_replay_after_transfer(live_request_queue, content))
+            # Streamed sub-agent output goes to the same WS/SSE sink as model replies, if opted in
+            self._progress_emitters[connection_id] = _send_progress
+            scope = self.call_scope(connection_id)
+            self._apply_progress(connection_id)
+            # The planner's instruction provider reads the mode from session state at connect time
+            self._store_mode(connection_id, session)
+            self._mode_sent[connection_id] = self._get_mode(connection_id)
+            # Tool tasks spawned by run_live inherit this scope via contextvars
+            with bind_scope(scope):
+                async with self.live_session_slot():
+                    async for event in runner.run_live(
+                        user_id=self.connection_index.get(connection_id, {}).get("user_id"),
+                        session_id=session.id if session else None,
+                        live_request_queue=live_request_queue,
+                        run_config=run_config,
+                    ):
+                        if getattr(event, "usage_metadata", None) is not None:
+                            totals = usage_ledger.record(
+                                tool="live",
+                                model=str(getattr(getattr(runner, "agent", None), "model", "") or "live"),
+                                usage=event.usage_metadata,
+                                agent=getattr(event, "author", None) or "live",
+                            )
+                            self.vision_proxy.stats.record_usage(self._get_vision_mode(connection_id), totals)
+                        if event.content and event.content.parts:
+                            awaiting = self._awaiting_reply.pop(connection_id, None)
+                            if awaiting is not None:
+                                mode, received = awaiting
+                                self.vision_proxy.stats[mode].first_reply_latency.append(time.perf_counter() - received)
+                            for part in event.content.parts:
+                                if hasattr(part, "inline_data") and part.inline_data and part.inline_data.data:
+                                    send_audio = getattr(sink, "send_audio", None)
+                                    if send_audio is not None:
+                                        await send_audio(part.inline_data.data)
+                                    else:
+                                        await sink.send_text(ws_protocol.encode_json_audio(part.inline_data.data))
+                                if hasattr(part, "text") and part.text:
+                                    await sink.send_text(part.text)
+                                if getattr(part, "function_response", None) and getattr(part.function_response, "name", "") == "transfer_to_agent":
+                                    content = self._last_user_content.get(connection_id)
+                                    if content is not None:
+                                        asyncio.create_task(self._schedule_replay_after_transfer(live_request_queue, content))
         except Exception as e:
             try:
                 await sink.send_text(str(e))
@@ -349,22 +556,62 @@ class MultimodalServer:
             except Exception as e:
                 logger.error("Replay after transfer failed: %s", e)
 
+    def set_mode(self, connection_id: str, raw: str) -> Optional[str]:
+        """Normalize and store the user mode; returns None for unknown values."""
+        normalized = normalize_mode(raw)
+        if normalized is None:
+            return None
+        self._user_mode[connection_id] = normalized
+        scope = self._call_scopes.get(connection_id)
+        if scope is not None:
+            scope.mode = normalized
+        self._store_mode(connection_id)
+        logger.info("Set mode for %s -> %s", connection_id, normalized)
+        return normalized
+
     def _get_mode(self, connection_id: str) -> str:
         return self._user_mode.get(connection_id, "intermediate")
 
     def _mode_instruction(self, connection_id: str) -> str:
+        return mode_instruction(self._get_mode(connection_id))
+
+    def _store_mode(self, connection_id: str, session=None) -> None:
+        """Mirror the connection's mode into its session state (read by the planner's instruction)."""
+        if session is None:
+            session_id = self.connection_index.get(connection_id, {}).get("session_id")
+            session = self.session_service._sessions.get(session_id) if session_id else None
+        state = getattr(session, "state", None)
+        if state is not None:
+            state[MODE_STATE_KEY] = self._get_mode(connection_id)
+
+    def set_vision_mode(self, connection_id: str, raw: str) -> Optional[str]:
+        """Switch between raw frames and text summaries; returns None for unknown values."""
+        normalized = normalize_vision_mode(raw)
+        if normalized is None:
+            return None
+        self._vision_mode[connection_id] = normalized
+        logger.info("Set vision mode for %s -> %s", connection_id, normalized)
+        return normalized
+
+    def _get_vision_mode(self, connection_id: str) -> str:
+        return self._vision_mode.get(connection_id) or normalize_vision_mode(settings.LIVE_VISION_MODE) or FRAMES
+
+    def text_turn_parts(self, connection_id: str, text: str) -> list:
+        """Parts of a typed user turn; in text vision mode a question about the picture gets the latest frame."""
+        parts = [*self.mode_change_parts(connection_id), types.Part.from_text(text=text)]
+        mode = self._get_vision_mode(connection_id)
+        if mode == TEXT:
+            parts += self.vision_proxy.frame_parts(connection_id, text)
+        self.vision_proxy.stats.record_content(mode, types.Content(role="user", parts=parts))
+        return parts
+
+    def mode_change_parts(self, connection_id: str) -> list:
+        """Mode paragraph for the next user turn, only if the mode changed since the Live session started."""
         mode = self._get_mode(connection_id)
-        if mode == "beginner":
-            return (
-                "初級者モード: 優しい語り口で、専門用語を避け、短く、具体例を交えて説明してください。必要なら最後に理解確認の質問を1つ添えてください。"
-            )
-        if mode == "advanced":
-            return (
-                "上級者モード: 簡潔かつ技術的に、前提説明は省略して要点・注意点・限界を短く挙げてください。"
-            )
-        return (
-            "中級者モード: 要点を箇条書き中心で、必要十分な専門用語のみ使い、手順や根拠を簡潔に示してください。"
-        )
+        if self._mode_sent.get(connection_id, mode) == mode:
+            return []
+        self._mode_sent[connection_id] = mode
+        return [types.Part.from_text(text=mode_instruction(mode))]
 
     class SseSink:
         def __init__(self, queue: asyncio.Queue):
@@ -372,3 +619,7 @@ class MultimodalServer:
 
         async def send_text(self, data: str):
             await self.queue.put(data)
+
+        async def send_event(self, event: str, data: str):
+            """Queue a named SSE event (``event: <event>``) instead of a default message."""
+            await self.queue.put(SseEvent(event, data))
@@ -0,0 +1,94 @@
+"""Scene-change filter and frame-rate cap applied before frames reach the Live API.
+
+A webcam streaming at a few fps sends mostly identical views of the tea
+room, and every forwarded frame costs a Live turn. :class:`FrameSelector`
+compares each frame's 64-bit dHash (see :func:`adk.vision.cache.frame_fingerprint`;
+the coordinator computes it once per frame off the event loop and reuses it
+for the vision proxy and the summary cache) and forwards it only when it differs from the last *forwarded* frame by at
+least ``threshold`` bits and at most ``max_fps`` frames per second have been
+forwarded on that connection. Comparing against the last forwarded frame
+(not the previous one) means a slow pan still triggers once it adds up.
+Frames that cannot be decoded are compared by a hash of their bytes.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from adk.vision.cache import frame_fingerprint
+
+FORWARDED = "forwarded"
+DROPPED_SIMILAR = "dropped_similar"
+DROPPED_RATE = "dropped_rate"
+
+
+@dataclass
+class _Connection:
+    last_fingerprint: tuple[int, bool] | None = None
+    last_forwarded: float = float("-inf")
+    counts: Counter = field(default_factory=Counter)
+
+
+class FrameSelector:
+    """Per-connection scene-change and rate gate for incoming video frames."""
+
+    def __init__(self, *, threshold: int = 6, max_fps: float = 1.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.max_fps = max_fps
+        self._clock = clock
+        self._connections: dict[str, _Connection] = {}
+        self._totals: Counter = Counter()
+
+    def select(self, connection_id: str, frame: bytes, fingerprint: tuple[int, bool] | None = None) -> str:
+        """Return ``forwarded`` or the reason the frame was dropped.
+
+        ``fingerprint`` is the frame's :func:`frame_fingerprint`; it is computed
+        here (decoding the JPEG on the caller's thread) when not given.
+        """
+        conn = self._connections.get(connection_id)
+        if conn is None:
+            conn = self._connections[connection_id] = _Connection()
+        now = self._clock()
+        fingerprint = fingerprint if fingerprint is not None else frame_fingerprint(frame)
+        phash, exact = fingerprint
+        if exact:
+            self._totals["unhashable"] += 1
+        last = conn.last_fingerprint
+        if last is None:
+            changed = True
+        elif exact or last[1]:
+            changed = last != fingerprint
+        else:
+            changed = (last[0] ^ phash).bit_count() >= self.threshold
+        if not changed:
+            decision = DROPPED_SIMILAR
+        elif self.max_fps > 0 and now - conn.last_forwarded < 1.0 / self.max_fps:
+            decision = DROPPED_RATE
+        else:
+            decision = FORWARDED
+            conn.last_forwarded = now
+            conn.last_fingerprint = fingerprint
+        conn.counts["received"] += 1
+        conn.counts[decision] += 1
+        self._totals["received"] += 1
+        self._totals[decision] += 1
+        return decision
+
+    def discard(self, connection_id: str) -> None:
+        self._connections.pop(connection_id, None)
+
+    def stats(self) -> dict:
+        totals = {key: self._totals[key] for key in ("received", FORWARDED, DROPPED_SIMILAR, DROPPED_RATE, "unhashable")}
+        received = totals["received"]
+        return {
+            **totals,
+            "forward_rate": round(totals[FORWARDED] / received, 4) if received else 0.0,
+            "threshold": self.threshold,
+            "max_fps": self.max_fps,
+            "connections": {
+                cid: {key: conn.counts[key] for key in ("received", FORWARDED, DROPPED_SIMILAR, DROPPED_RATE)}
+                for cid, conn in self._connections.items()
+            },
+        }
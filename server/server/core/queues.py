@@ -0,0 +1,161 @@
+"""Bounded per-connection queues with explicit overflow policies.
+
+Unbounded ``asyncio.Queue`` buffers let a slow Live session or a slow SSE
+client grow memory without limit. Each stream gets its own policy:
+
+* :class:`LatestQueue` (video): at most ``maxsize`` frames; a new frame evicts
+  the oldest one, so the consumer always sees the most recent view.
+* :class:`ByteBudgetQueue` (audio): bounded by total payload bytes; the oldest
+  chunks are dropped to make room for new audio.
+* :class:`OutboundQueue` (SSE text): bounded by count; producers wait up to
+  ``put_timeout`` seconds for the client to catch up and then the queue is
+  closed, which ends the SSE stream (slow consumer).
+
+All queues report to a shared :class:`QueueStats`, exported per connection
+under ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumer(RuntimeError):
+    """Raised by :meth:`OutboundQueue.put` once the client fell too far behind."""
+
+
+class QueueStats:
+    """Counters per ``(connection_id, stream)`` plus totals per stream."""
+
+    def __init__(self):
+        self._connections: dict[str, dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+        self._totals: dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, connection_id: str, stream: str, key: str, n: int = 1) -> None:
+        self._connections[connection_id][stream][key] += n
+        self._totals[stream][key] += n
+
+    def high_water(self, connection_id: str, stream: str, depth: int) -> None:
+        counts = self._connections[connection_id][stream]
+        counts["high_water"] = max(counts["high_water"], depth)
+
+    def discard(self, connection_id: str) -> None:
+        self._connections.pop(connection_id, None)
+
+    def connection(self, connection_id: str) -> dict:
+        return {stream: dict(c) for stream, c in self._connections.get(connection_id, {}).items()}
+
+    def as_dict(self) -> dict:
+        return {
+            "totals": {stream: dict(c) for stream, c in self._totals.items()},
+            "connections": {cid: self.connection(cid) for cid in list(self._connections)},
+        }
+
+
+queue_stats = QueueStats()
+
+
+class _TrackedQueue(asyncio.Queue):
+    stream = "queue"
+
+    def __init__(self, connection_id: str, *, maxsize: int = 0, stats: QueueStats | None = None):
+        super().__init__(maxsize=maxsize)
+        self.connection_id = connection_id
+        self.stats = stats or queue_stats
+
+    def _count(self, key: str, n: int = 1) -> None:
+        self.stats.add(self.connection_id, self.stream, key, n)
+
+    def _accepted(self) -> None:
+        self._count("put")
+        self.stats.high_water(self.connection_id, self.stream, self.qsize())
+
+    def _drop_oldest(self):
+        item = self.get_nowait()
+        self.task_done()
+        self._count("dropped")
+        return item
+
+
+class LatestQueue(_TrackedQueue):
+    """Latest-wins queue: putting into a full queue evicts the oldest item, never blocks."""
+
+    stream = "video"
+
+    def put_nowait(self, item) -> None:
+        while self.full():
+            self._drop_oldest()
+        super().put_nowait(item)
+        self._accepted()
+
+    async def put(self, item) -> None:
+        self.put_nowait(item)
+
+
+class ByteBudgetQueue(_TrackedQueue):
+    """Holds at most ``max_bytes`` of payload; the oldest items are dropped first."""
+
+    stream = "audio"
+
+    def __init__(self, connection_id: str, *, max_bytes: int, stats: QueueStats | None = None):
+        super().__init__(connection_id, stats=stats)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        self.bytes += len(item)
+
+    def _get(self):
+        item = super()._get()
+        self.bytes -= len(item)
+        return item
+
+    def put_nowait(self, item) -> None:
+        if self.max_bytes > 0:
+            while not self.empty() and self.bytes + len(item) > self.max_bytes:
+                self._count("dropped_bytes", len(self._drop_oldest()))
+        super().put_nowait(item)
+        self._accepted()
+
+    async def put(self, item) -> None:
+        self.put_nowait(item)
+
+
+class OutboundQueue(_TrackedQueue):
+    """Bounded queue that blocks producers, then gives up on a consumer that stays behind."""
+
+    stream = "outbound"
+
+    def __init__(self, connection_id: str, *, maxsize: int, put_timeout: float | None, stats: QueueStats | None = None):
+        super().__init__(connection_id, maxsize=maxsize, stats=stats)
+        self.put_timeout = put_timeout if put_timeout and put_timeout > 0 else None
+        self.closed_reason: str | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self.closed_reason is not None
+
+    def close(self, reason: str) -> None:
+        if self.closed_reason is None:
+            self.closed_reason = reason
+            self._count("disconnects")
+            logger.warning("[queues] closing outbound stream of %s (%s)", self.connection_id, reason)
+
+    async def put(self, item) -> None:
+        if self.closed:
+            raise SlowConsumer(self.closed_reason)
+        if self.full():
+            self._count("blocked")
+            try:
+                await asyncio.wait_for(super().put(item), self.put_timeout)
+            except asyncio.TimeoutError:
+                self.close("slow_consumer")
+                raise SlowConsumer(self.closed_reason) from None
+        else:
+            super().put_nowait(item)
+        self._accepted()
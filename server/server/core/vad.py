@@ -0,0 +1,146 @@
+"""Energy / zero-crossing voice activity detection for client PCM.
+
+With an open microphone the client streams silence continuously, so arrival
+of chunks says nothing about speech: every silent frame is still sent to the
+Live API and ``activity_end`` only happens once the client stops sending.
+:class:`VoiceActivityDetector` classifies fixed ``frame_ms`` frames of 16-bit
+mono PCM, vectorized over each chunk with NumPy:
+
+* RMS level in dBFS above ``max(threshold_db, noise floor + noise_margin_db)``,
+  where the noise floor tracks the level of non-speech frames (a steady room
+  hum raises the bar);
+* zero-crossing rate at most ``max_zcr`` (broadband hiss crosses zero on
+  about half of the samples, voiced speech far less often).
+
+``start_ms`` of consecutive speech frames open a segment; ``hangover_ms`` of
+non-speech frames close it. The last ``preroll_ms`` of suppressed audio is
+sent ahead of each onset so the first syllable is not clipped. Frames outside
+segments are withheld.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+try:  # numpy is listed in requirements.txt; without it the coordinator keeps the idle timer only
+    import numpy as np
+except Exception:  # pragma: no cover - depends on the deployment image
+    np = None
+
+SPEECH_START = "start"
+SPEECH_AUDIO = "audio"
+SPEECH_END = "end"
+
+_BYTES_PER_SAMPLE = 2  # 16-bit mono PCM
+_FLOOR_ALPHA = 0.05
+
+
+def vad_available() -> bool:
+    return np is not None
+
+
+class VoiceActivityDetector:
+    """Turns a PCM stream into speech start / audio / end events, dropping silence."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int,
+        frame_ms: int = 20,
+        threshold_db: float = -45.0,
+        noise_margin_db: float = 6.0,
+        max_zcr: float = 0.45,
+        start_ms: int = 40,
+        hangover_ms: int = 300,
+        preroll_ms: int = 200,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for voice activity detection")
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.frame_bytes = self.frame_samples * _BYTES_PER_SAMPLE
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.max_zcr = max_zcr
+        self.start_frames = max(1, -(-start_ms // frame_ms))
+        self.hangover_frames = max(1, -(-hangover_ms // frame_ms))
+        self.noise_floor_db = threshold_db - noise_margin_db
+        self.speaking = False
+        self._remainder = b""
+        self._pending: list[bytes] = []
+        self._preroll: deque[bytes] = deque(maxlen=max(0, preroll_ms // frame_ms))
+        self._silent = 0
+        self.stats = {"frames": 0, "speech_frames": 0, "segments": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def classify(self, frames) -> "np.ndarray":
+        """Speech flags for an ``(n, frame_samples)`` int16 array; updates the noise floor."""
+        x = frames.astype(np.float32) * (1.0 / 32768.0)
+        level_db = 10.0 * np.log10(np.maximum(np.mean(x * x, axis=1), 1e-12))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(1, frames.shape[1] - 1)
+        threshold = max(self.threshold_db, self.noise_floor_db + self.noise_margin_db)
+        speech = (level_db >= threshold) & (zcr <= self.max_zcr)
+        if not speech.all():
+            quiet = float(np.mean(level_db[~speech]))
+            self.noise_floor_db += _FLOOR_ALPHA * (quiet - self.noise_floor_db)
+        return speech
+
+    def process(self, chunk: bytes) -> list[tuple[str, bytes]]:
+        """Feed PCM; returns ``(event, data)`` pairs in order, audio runs merged."""
+        self.stats["bytes_in"] += len(chunk)
+        data = self._remainder + chunk if self._remainder else chunk
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = bytes(data[usable:])
+        if not usable:
+            return []
+        frames = np.frombuffer(data, dtype="<i2", count=usable // _BYTES_PER_SAMPLE).reshape(-1, self.frame_samples)
+        flags = self.classify(frames)
+        self.stats["frames"] += len(flags)
+        self.stats["speech_frames"] += int(flags.sum())
+
+        events: list[tuple[str, bytes]] = []
+        out = bytearray()
+        for i, speech in enumerate(flags.tolist()):
+            frame = data[i * self.frame_bytes : (i + 1) * self.frame_bytes]
+            if self.speaking:
+                out += frame
+                self._silent = 0 if speech else self._silent + 1
+                if self._silent >= self.hangover_frames:
+                    events.extend(self._audio(out))
+                    out = bytearray()
+                    events.append((SPEECH_END, b""))
+                    self.speaking = False
+            elif speech:
+                self._pending.append(frame)
+                if len(self._pending) >= self.start_frames:
+                    events.append((SPEECH_START, b""))
+                    out += b"".join(self._preroll) + b"".join(self._pending)
+                    self._preroll.clear()
+                    self._pending.clear()
+                    self.stats["segments"] += 1
+                    self.speaking = True
+                    self._silent = 0
+            else:
+                # A too-short burst (click, tap) stays suppressed but can still serve as pre-roll
+                self._preroll.extend(self._pending)
+                self._preroll.append(frame)
+                self._pending.clear()
+        events.extend(self._audio(out))
+        return events
+
+    def _audio(self, out: bytearray) -> list[tuple[str, bytes]]:
+        if not out:
+            return []
+        self.stats["bytes_out"] += len(out)
+        return [(SPEECH_AUDIO, bytes(out))]
+
+    def as_dict(self) -> dict:
+        """Counters plus the audio withheld so far (including any pre-roll not yet sent)."""
+        return {**self.stats, "suppressed_bytes": self.stats["bytes_in"] - self.stats["bytes_out"]}
+
+    def reset(self) -> None:
+        """Forget the current segment (e.g. the client stopped sending mid-speech)."""
+        self.speaking = False
+        self._silent = 0
+        self._pending.clear()
+        self._preroll.clear()
+        self._remainder = b""
@@ -0,0 +1,250 @@
+"""Text-proxy vision mode for Live connections.
+
+In the default ``frames`` mode every webcam frame is sent to the Live API as
+a raw JPEG, which costs image tokens on every turn and keeps growing the live
+context. In ``text`` mode a frame is first summarized by the vision agent on
+a per-connection background task; frames that look like the last summarized
+one (dHash within ``max_distance`` bits) are dropped, a frame arriving while
+a summary is in flight replaces any older pending one, and only the short
+text summary is pushed into the ``LiveRequestQueue``. The latest raw frame is
+still attached to a text turn that explicitly asks about the picture.
+
+:class:`VisionProxyStats` keeps the numbers of both modes side by side
+(context added to the live session, Live token usage, latency from frame
+capture to the model's first reply) for ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from google.genai import types
+
+from adk.vision.agent import summarize_image_async
+from adk.vision.cache import vision_cache
+
+logger = logging.getLogger(__name__)
+
+FRAMES = "frames"
+TEXT = "text"
+VISION_MODES = (FRAMES, TEXT)
+
+# Tokens the Live API bills for one (<=384px or tiled) image, and a rough
+# characters-per-token ratio for Japanese text; used for the context estimate.
+_IMAGE_TOKENS = 258
+_CHARS_PER_TOKEN = 1.5
+
+# A text turn matching this asks about the picture itself: attach the raw frame.
+_IMAGE_QUESTION = re.compile(r"画像|映像|写真|カメラ|写って|映って|見えて|見える|見て")
+
+_SUMMARY_PROMPT = "上の映像要約について短く返答してください。"
+
+
+def normalize_vision_mode(raw: str | None) -> str | None:
+    raw = (raw or "").strip().lower()
+    return raw if raw in VISION_MODES else None
+
+
+def asks_about_image(text: str) -> bool:
+    return bool(_IMAGE_QUESTION.search(text or ""))
+
+
+def _percentile(values, q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1)
+
+
+@dataclass
+class _ModeStats:
+    frames: int = 0
+    raw_frames_sent: int = 0
+    raw_on_request: int = 0
+    summaries_sent: int = 0
+    duplicates: int = 0
+    superseded: int = 0
+    failures: int = 0
+    context_images: int = 0
+    context_text_chars: int = 0
+    live_turns: int = 0
+    live_prompt_tokens: int = 0
+    live_total_tokens: int = 0
+    summary_latency: deque = field(default_factory=lambda: deque(maxlen=500))
+    first_reply_latency: deque = field(default_factory=lambda: deque(maxlen=500))
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "raw_frames_sent": self.raw_frames_sent,
+            "raw_on_request": self.raw_on_request,
+            "summaries_sent": self.summaries_sent,
+            "duplicates": self.duplicates,
+            "superseded": self.superseded,
+            "failures": self.failures,
+            "context": {
+                "images": self.context_images,
+                "text_chars": self.context_text_chars,
+                "tokens_est": self.context_images * _IMAGE_TOKENS + round(self.context_text_chars / _CHARS_PER_TOKEN),
+            },
+            "live_usage": {
+                "turns": self.live_turns,
+                "prompt_tokens": self.live_prompt_tokens,
+                "total_tokens": self.live_total_tokens,
+            },
+            "summary_ms": {"p50": _percentile(self.summary_latency, 0.5), "p95": _percentile(self.summary_latency, 0.95)},
+            "first_reply_ms": {
+                "p50": _percentile(self.first_reply_latency, 0.5),
+                "p95": _percentile(self.first_reply_latency, 0.95),
+            },
+        }
+
+
+class VisionProxyStats:
+    """Per vision-mode counters (single event loop, no locking needed)."""
+
+    def __init__(self):
+        self._modes: dict[str, _ModeStats] = defaultdict(_ModeStats)
+
+    def __getitem__(self, mode: str) -> _ModeStats:
+        return self._modes[mode]
+
+    def record_content(self, mode: str, content: types.Content) -> None:
+        stats = self._modes[mode]
+        for part in content.parts or []:
+            if getattr(part, "inline_data", None) is not None:
+                stats.context_images += 1
+            elif part.text:
+                stats.context_text_chars += len(part.text)
+
+    def record_usage(self, mode: str, totals) -> None:
+        if totals is None:
+            return
+        stats = self._modes[mode]
+        stats.live_turns += 1
+        stats.live_prompt_tokens += totals.prompt_tokens
+        stats.live_total_tokens += totals.total_tokens
+
+    def as_dict(self) -> dict:
+        return {mode: stats.as_dict() for mode, stats in self._modes.items()}
+
+
+@dataclass
+class _Connection:
+    latest: bytes | None = None
+    pending: tuple[float, bytes, tuple[int, bool] | None] | None = None
+    worker: asyncio.Task | None = None
+    last_hash: tuple[int, bool] | None = None
+    last_summary: str | None = None
+
+
+class VisionProxy:
+    """Summarizes frames off the live path and forwards only changed scenes."""
+
+    def __init__(
+        self,
+        *,
+        max_distance: int = 8,
+        summarize: Callable[..., Awaitable[str]] = summarize_image_async,
+        stats: VisionProxyStats | None = None,
+    ):
+        self.max_distance = max_distance
+        self._summarize = summarize
+        self.stats = stats or VisionProxyStats()
+        self._connections: dict[str, _Connection] = {}
+
+    def _conn(self, connection_id: str) -> _Connection:
+        conn = self._connections.get(connection_id)
+        if conn is None:
+            conn = self._connections[connection_id] = _Connection()
+        return conn
+
+    def submit(
+        self,
+        connection_id: str,
+        frame: bytes,
+        *,
+        send: Callable[[types.Content, float], None],
+        start_turn: Callable[[], None],
+        received: float | None = None,
+        fingerprint: tuple[int, bool] | None = None,
+    ) -> None:
+        """Queue ``frame`` for summarization; ``send(content, received)`` pushes the result.
+
+        ``fingerprint`` is the frame's :func:`~adk.vision.cache.frame_fingerprint`
+        when the caller already has it; it is reused for deduplication and the
+        summary cache instead of decoding the frame again.
+        """
+        received = time.perf_counter() if received is None else received
+        conn = self._conn(connection_id)
+        self.stats[TEXT].frames += 1
+        # Newest raw frame, attached to a later question about the picture
+        conn.latest = frame
+        if conn.pending is not None:
+            self.stats[TEXT].superseded += 1
+        conn.pending = (received, frame, fingerprint)
+        if conn.worker is None or conn.worker.done():
+            conn.worker = asyncio.create_task(
+                self._drain(connection_id, conn, send, start_turn), name=f"vision-proxy:{connection_id}"
+            )
+
+    async def _drain(self, connection_id: str, conn: _Connection, send, start_turn) -> None:
+        stats = self.stats[TEXT]
+        while conn.pending is not None:
+            received, frame, fingerprint = conn.pending
+            conn.pending = None
+            if fingerprint is None:
+                fingerprint = vision_cache.fingerprint(frame)
+            if self._is_duplicate(conn.last_hash, fingerprint):
+                stats.duplicates += 1
+                continue
+            start_turn()
+            started = time.perf_counter()
+            try:
+                summary = (await self._summarize(frame, fingerprint=fingerprint)).strip()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                stats.failures += 1
+                logger.warning("[vision-proxy] summary failed for %s", connection_id, exc_info=True)
+                continue
+            stats.summary_latency.append(time.perf_counter() - started)
+            conn.last_hash = fingerprint
+            if not summary or summary == conn.last_summary:
+                stats.duplicates += 1
+                continue
+            conn.last_summary = summary
+            content = types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=f"[カメラ映像の要約]\n{summary}"), types.Part.from_text(text=_SUMMARY_PROMPT)],
+            )
+            stats.summaries_sent += 1
+            self.stats.record_content(TEXT, content)
+            send(content, received)
+
+    def _is_duplicate(self, previous: tuple[int, bool] | None, current: tuple[int, bool]) -> bool:
+        if previous is None:
+            return False
+        (prev_hash, prev_exact), (hash_, exact) = previous, current
+        if prev_exact or exact:
+            return prev_exact == exact and prev_hash == hash_
+        return (prev_hash ^ hash_).bit_count() <= self.max_distance
+
+    def frame_parts(self, connection_id: str, text: str) -> list[types.Part]:
+        """The latest raw frame as a part when ``text`` asks about the picture, else ``[]``."""
+        conn = self._connections.get(connection_id)
+        if conn is None or conn.latest is None or not asks_about_image(text):
+            return []
+        self.stats[TEXT].raw_on_request += 1
+        return [types.Part.from_bytes(data=conn.latest, mime_type="image/jpeg")]
+
+    def discard(self, connection_id: str) -> None:
+        conn = self._connections.pop(connection_id, None)
+        if conn is not None and conn.worker is not None and not conn.worker.done():
+            conn.worker.cancel()
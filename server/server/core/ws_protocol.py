@@ -0,0 +1,72 @@
+"""Opt-in binary framing for ``/ws/{agent_key}/{connection_id}``.
+
+The default protocol carries media as JSON text frames with a base64 ``data``
+field: +33% on the wire, and the server pays a UTF-8 decode, ``json.loads``
+and ``base64.b64decode`` per chunk. A client that offers the
+``tea.binary.v1`` WebSocket subprotocol at connect may instead send media as
+binary frames::
+
+    byte 0   kind   0x01 audio (16-bit PCM, SEND_SAMPLE_RATE) | 0x02 video (JPEG)
+    byte 1   flags  video: bit 0 set = screen capture (else webcam)
+    byte 2.. payload, raw
+
+The header is read through a ``memoryview``, so the payload is copied once,
+into the ``bytes`` the Live API blob needs. Text and control messages
+(``text``, ``mode``, ``vision_mode``, and JSON audio/video) remain JSON text
+frames on either protocol. On a binary connection the server sends model
+audio back as ``0x01`` binary frames instead of base64 JSON.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import struct
+
+BINARY_SUBPROTOCOL = "tea.binary.v1"
+
+AUDIO = 0x01
+VIDEO = 0x02
+FLAG_SCREEN = 0x01
+
+_HEADER = struct.Struct("!BB")
+HEADER_SIZE = _HEADER.size
+
+
+class FrameError(ValueError):
+    """A binary frame that is too short or of an unknown kind."""
+
+
+def negotiate(offered: list[str] | None) -> str | None:
+    """The subprotocol to accept from the client's offer, or None for JSON framing."""
+    return BINARY_SUBPROTOCOL if BINARY_SUBPROTOCOL in (offered or []) else None
+
+
+def encode_frame(kind: int, payload: bytes, *, flags: int = 0) -> bytes:
+    return _HEADER.pack(kind, flags) + payload
+
+
+def parse_frame(data: bytes) -> tuple[int, int, memoryview]:
+    """Return ``(kind, flags, payload)``; the payload is a view into ``data``."""
+    view = memoryview(data)
+    if len(view) < HEADER_SIZE:
+        raise FrameError(f"binary frame of {len(view)} bytes has no header")
+    kind, flags = _HEADER.unpack_from(view)
+    if kind not in (AUDIO, VIDEO):
+        raise FrameError(f"unknown binary frame kind 0x{kind:02x}")
+    return kind, flags, view[HEADER_SIZE:]
+
+
+def video_mode(flags: int) -> str:
+    return "screen" if flags & FLAG_SCREEN else "webcam"
+
+
+def parse_json_message(message: str) -> tuple[dict, bytes | None]:
+    """Decode a JSON text frame; audio/video payloads are base64-decoded."""
+    data = json.loads(message)
+    payload = base64.b64decode(data.get("data", "")) if data.get("type") in ("audio", "video") else None
+    return data, payload
+
+
+def encode_json_audio(pcm: bytes) -> str:
+    return json.dumps({"type": "audio", "data": base64.b64encode(pcm).decode("utf-8")}, separators=(",", ":"))
@@ -13,8 +13,9 @@ async def health_check():
     return {
         "status": "healthy",
         "active_connections": len(server.active_connections),
-        "live_in_use": getattr(server, "_live_in_use", 0),
-        "live_max": getattr(settings, "LIVE_SESSIONS_MAX", None),
+        "live_in_use": server.live_limiter.in_flight,
+        "live_max": server.live_limiter.limit,
+        "live_ceiling": getattr(settings, "LIVE_SESSIONS_MAX", None),
     }
 
 
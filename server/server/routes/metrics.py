@@ -0,0 +1,49 @@
+import logging
+
+from fastapi import APIRouter
+
+from adk.planner.prefetch import prefetcher
+from adk.planner.router import router_stats
+from adk.services.context_cache import get_context_cache
+from adk.services.deadline import abort_stats
+from adk.services.genai import get_client_pool
+from adk.services.hedging import get_hedge_policy
+from adk.services.limiter import get_model_limiter
+from adk.services.model_router import get_model_router
+from adk.services.response_cache import get_response_cache
+from adk.services.semantic_cache import get_semantic_cache
+from adk.translator.memory import translation_memory
+from adk.vision.cache import vision_cache
+
+from server.app_state import server
+from server.core.queues import queue_stats
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    response_cache = get_response_cache()
+    semantic_cache = get_semantic_cache()
+    return {
+        "genai": {
+            "aborts": abort_stats(),
+            "in_flight": {cid: scope.in_flight for cid, scope in server._call_scopes.items()},
+        },
+        "client_pool": get_client_pool().stats(),
+        "hedging": get_hedge_policy().stats(),
+        "model_routing": get_model_router().stats(),
+        "limiters": {"live": server.live_limiter.stats(), "genai": get_model_limiter().stats()},
+        "context_cache": get_context_cache().stats(),
+        "vision_cache": vision_cache.stats(),
+        "vision_proxy": server.vision_proxy.stats.as_dict(),
+        "frame_selector": server.frame_selector.stats(),
+        "queues": queue_stats.as_dict(),
+        "audio": {cid: c.as_dict() for cid, c in list(server._audio_coalescers.items())},
+        "response_cache": response_cache.stats() if response_cache else {"enabled": False},
+        "semantic_cache": semantic_cache.stats() if semantic_cache else {"enabled": False},
+        "translation_memory": translation_memory.stats(),
+        "prefetch": prefetcher.stats(),
+        "fast_path": router_stats.as_dict(),
+    }
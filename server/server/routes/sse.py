@@ -12,13 +12,14 @@ from google.genai import types
 
 from server.app_state import server, agents
 from server.config import settings
+from server.core.coordinator import SseEvent
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
 @router.get("/sse/{agent_key}/{connection_id}", include_in_schema=False)
-async def sse_stream_with_agent(agent_key: str, connection_id: str):
+async def sse_stream_with_agent(agent_key: str, connection_id: str, progress: bool = False):
     if not server._ensure_google_config():
         raise HTTPException(status_code=500, detail="Vertex/Gemini credentials not configured")
 
@@ -28,6 +29,8 @@ async def sse_stream_with_agent(agent_key: str, connection_id: str):
     if meta.get("agent_key") != agent_key:
         raise HTTPException(status_code=400, detail="agent_key mismatch for this connection_id")
 
+    # tool_progress events are opt-in (?progress=1); they arrive as "event: tool_progress"
+    server.set_progress(connection_id, progress)
     state_key = connection_id
     if state_key not in server._sse_clients:
         # Ensure the mapped session exists
@@ -38,9 +41,8 @@ async def sse_stream_with_agent(agent_key: str, connection_id: str):
             except Exception:
                 await server.session_service.create_session(app_name="adk-video-app", user_id=meta.get("user_id"))
 
-        audio_queue: asyncio.Queue = asyncio.Queue()
-        video_queue: asyncio.Queue = asyncio.Queue()
-        outbound_queue: asyncio.Queue = asyncio.Queue()
+        audio_queue, video_queue = server.ingest_queues(connection_id)
+        outbound_queue = server.outbound_queue(connection_id)
 
         live_request_queue = LiveRequestQueue()
 
@@ -102,17 +104,26 @@ async def sse_stream_with_agent(agent_key: str, connection_id: str):
     async def event_generator():
         try:
             yield "event: ready\ndata: ok\n\n"
+            outbound = state["outbound_queue"]
             while True:
+                # The response handler gave up on this client (see server.core.queues.OutboundQueue)
+                if getattr(outbound, "closed", False):
+                    yield f"event: error\ndata: {outbound.closed_reason}\n\n"
+                    break
                 try:
-                    data = await asyncio.wait_for(state["outbound_queue"].get(), timeout=5.0)
+                    data = await asyncio.wait_for(outbound.get(), timeout=5.0)
+                    event = None
+                    if isinstance(data, SseEvent):
+                        event, data = data
                     lines = (data.splitlines() if isinstance(data, str) else [str(data)]) or [""]
                     payload = "".join(f"data: {line}\n" for line in lines)
-                    yield payload + "\n"
+                    yield (f"event: {event}\n" if event else "") + payload + "\n"
                 except asyncio.TimeoutError:
                     yield "event: ping\ndata: keepalive\n\n"
         except asyncio.CancelledError:
             pass
         finally:
+            server.abort_calls(connection_id, "sse_closed")
             tasks = state.get("tasks", [])
             for t in tasks:
                 t.cancel()
@@ -130,11 +141,8 @@ async def sse_send_text_with_agent(agent_key: str, connection_id: str, payload:
     text = (payload.get("data") or "").strip()
     if not text:
         raise HTTPException(status_code=400, detail="Missing text data")
-    parts = [
-        types.Part.from_text(text=server._mode_instruction(connection_id)),
-        types.Part.from_text(text=text),
-    ]
-    content = types.Content(role="user", parts=parts)
+    content = types.Content(role="user", parts=server.text_turn_parts(connection_id, text))
+    server.start_turn(connection_id)
     state["live_request_queue"].send_content(content)
     server._last_user_content[connection_id] = content
     return {"ok": True}
@@ -152,7 +160,7 @@ async def sse_send_video_with_agent(agent_key: str, connection_id: str, payload:
         video_bytes = base64.b64decode(b64)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid base64 for video")
-    await server._send_video_content_immediate(state["live_request_queue"], connection_id, video_bytes)
+    await server.send_video_frame(state["live_request_queue"], connection_id, video_bytes)
     return {"ok": True}
 
 
@@ -174,10 +182,15 @@ async def sse_send_audio_with_agent(agent_key: str, connection_id: str, payload:
 
 @router.post("/sse/{agent_key}/{connection_id}/mode", include_in_schema=False)
 async def sse_set_mode_with_agent(agent_key: str, connection_id: str, payload: dict = Body(...)):
-    raw = (payload.get("data") or payload.get("value") or "").strip().lower()
-    aliases = {"初級": "beginner", "中級": "intermediate", "上級": "advanced"}
-    normalized = aliases.get(raw, raw)
-    if normalized not in ("beginner", "intermediate", "advanced"):
+    normalized = server.set_mode(connection_id, payload.get("data") or payload.get("value") or "")
+    if normalized is None:
         raise HTTPException(status_code=400, detail="Unknown mode value")
-    server._user_mode[connection_id] = normalized
     return {"ok": True, "mode": normalized}
+
+
+@router.post("/sse/{agent_key}/{connection_id}/vision_mode", include_in_schema=False)
+async def sse_set_vision_mode_with_agent(agent_key: str, connection_id: str, payload: dict = Body(...)):
+    normalized = server.set_vision_mode(connection_id, payload.get("data") or payload.get("value") or "")
+    if normalized is None:
+        raise HTTPException(status_code=400, detail="Unknown vision mode value")
+    return {"ok": True, "vision_mode": normalized}
@@ -0,0 +1,40 @@
+import logging
+
+from fastapi import APIRouter, HTTPException
+
+from adk.services.usage import usage_ledger
+
+from server.app_state import server
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/usage")
+async def get_usage():
+    return usage_ledger.summary()
+
+
+@router.get("/usage/connections/{connection_id}")
+async def get_connection_usage(connection_id: str):
+    usage = usage_ledger.connection(connection_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="No usage recorded for this connection")
+    return usage
+
+
+@router.get("/usage/users/{user_id}")
+async def get_user_usage(user_id: str):
+    return usage_ledger.user(user_id)
+
+
+@router.get("/usage/sessions/{session_id}")
+async def get_session_usage(session_id: str):
+    session = server.session_service._sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown session_id")
+    # Open connections are attached on demand; closed ones were attached at teardown.
+    for connection_id, meta in list(server.connection_index.items()):
+        if meta.get("session_id") == session_id:
+            server.attach_usage(connection_id)
+    return session.state.get("usage") or {"total_tokens": 0, "cost_usd": 0.0, "connections": {}}
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from server.core.audio import AudioCoalescer
+
+
+class FakeLrq:
+    def __init__(self):
+        self.events = []
+
+    def send_realtime(self, blob):
+        self.events.append(("blob", blob.data))
+
+    def send_activity_start(self):
+        self.events.append(("start", None))
+
+    def send_activity_end(self):
+        self.events.append(("end", None))
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_coalesced_into_blocks_and_flushed_when_idle():
+    lrq = FakeLrq()
+    # 1000 Hz * 2 bytes * 40 ms = 80-byte blocks
+    coalescer = AudioCoalescer(lrq, sample_rate=1000, block_ms=40, idle_end_ms=50, activity=True)
+    for i in range(5):
+        coalescer.feed(bytes([i]) * 32)  # 160 bytes in 5 chunks
+        await asyncio.sleep(0.005)
+    assert [kind for kind, _ in lrq.events] == ["start", "blob", "blob"]
+    assert all(len(data) == 80 for kind, data in lrq.events if kind == "blob")
+
+    coalescer.feed(b"\x09" * 10)
+    await asyncio.sleep(0.12)
+    assert lrq.events[-2:] == [("blob", b"\x09" * 10), ("end", None)]
+    # One idle timer for the whole burst (re-armed when it fired early), not one per chunk
+    assert coalescer.stats["chunks"] == 6 and coalescer.stats["timer_arms"] <= 3
+    coalescer.close()
+
+
+@pytest.mark.asyncio
+async def test_passthrough_without_activity_signals():
+    lrq = FakeLrq()
+    coalescer = AudioCoalescer(lrq, sample_rate=16000, block_ms=0, idle_end_ms=10, activity=False)
+    coalescer.feed(b"ab")
+    coalescer.feed(b"cd")
+    await asyncio.sleep(0.03)
+    assert lrq.events == [("blob", b"ab"), ("blob", b"cd")]
+    coalescer.close()
@@ -0,0 +1,108 @@
+import asyncio
+import types as pytypes
+
+import pytest
+
+from adk.services import genai as genai_module
+from adk.services.genai import ClientPool, Credentials
+
+
+class _FakeClient:
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.closed = False
+        self.aio = pytypes.SimpleNamespace(aclose=self._aclose)
+
+    def close(self):
+        self.closed = True
+
+    async def _aclose(self):
+        self.closed = True
+
+
+def _pool(**kwargs) -> ClientPool:
+    return ClientPool(factory=lambda creds, http_options: _FakeClient(creds), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_model_slots_bound_concurrency_and_record_waits():
+    pool = _pool(model_limits={"m": 2}, default_model_limit=0)
+    active = 0
+    peak = 0
+
+    async def call(model):
+        nonlocal active, peak
+        async with pool.slot(model):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    await asyncio.gather(*(call("m") for _ in range(5)))
+    await asyncio.gather(*(call("other") for _ in range(5)))
+
+    stats = pool.stats()["models"]
+    assert stats["m"]["limit"] == 2 and stats["m"]["peak_in_flight"] == 2
+    assert stats["m"]["calls"] == 5 and stats["m"]["waits"] == 3 and stats["m"]["max_wait_ms"] > 0
+    assert stats["m"]["in_flight"] == 0 and stats["m"]["queued"] == 0
+    assert stats["other"]["limit"] is None and stats["other"]["peak_in_flight"] == 5
+
+
+@pytest.mark.asyncio
+async def test_refresh_closes_old_client_after_in_flight_calls(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "key-a")
+    pool = _pool()
+    first = pool.client()
+    assert pool.refresh() is False
+
+    entered = asyncio.Event()
+    release = asyncio.Event()
+
+    async def in_flight():
+        async with pool.slot("m"):
+            entered.set()
+            await release.wait()
+
+    task = asyncio.create_task(in_flight())
+    await entered.wait()
+    assert pool.refresh(Credentials(api_key="key-b")) is True
+    second = pool.client()
+    assert second is not first and second.credentials.api_key == "key-b"
+    assert not first.closed and pool.stats()["retired_pending"] == 1
+
+    release.set()
+    await task
+    assert first.closed and pool.stats()["retired_pending"] == 0
+    assert pool.stats()["rebuilds"] == 1
+
+
+def test_real_client_uses_configured_http_limits(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "k")
+    monkeypatch.setenv("GENAI_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("GENAI_HTTP_MAX_KEEPALIVE", "3")
+    monkeypatch.setenv("GENAI_MODEL_CONCURRENCY", "gemini-2.0-flash-exp=4,bad")
+    pool = ClientPool.from_env()
+    assert pool.limit_for("gemini-2.0-flash-exp") == 4
+    assert pool.limit_for("other") == 32
+
+    client = pool.client()
+    pool_impl = client._api_client._async_httpx_client._transport._pool
+    assert pool_impl._max_connections == 7 and pool_impl._max_keepalive_connections == 3
+    assert pool.stats()["http"]["connections"] == {"open": 0, "idle": 0, "active": 0}
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_model_calls_go_through_the_pool(monkeypatch):
+    pool = _pool(model_limits={"gemini-x": 1})
+    monkeypatch.setattr(genai_module, "get_client_pool", lambda: pool)
+
+    async def generate_content(**kwargs):
+        assert pool.stats()["models"]["gemini-x"]["in_flight"] == 1
+        return genai_module.types.GenerateContentResponse(candidates=[])
+
+    client = pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=pytypes.SimpleNamespace(generate_content=generate_content)))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+
+    await genai_module.generate_text_async(model="gemini-x", instruction="", prompt="hi", use_cache=False)
+    assert pool.stats()["models"]["gemini-x"]["calls"] == 1
@@ -0,0 +1,128 @@
+import asyncio
+import time
+import types as pytypes
+
+import pytest
+from google.genai import errors
+
+from adk.services import genai as genai_module
+from adk.services.context_cache import CacheHandle, ContextCacheManager, set_context_cache
+
+STATIC = "長い静的な指示文" * 200
+
+
+class FakeBackend:
+    def __init__(self, *, fail=False):
+        self.fail = fail
+        self.created: list[str] = []
+        self.refreshed: list[str] = []
+
+    async def create(self, *, model, system_instruction, ttl_s):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("cached content is not supported")
+        name = f"cachedContents/{len(self.created)}"
+        self.created.append(name)
+        return CacheHandle(name=name, expires_at=time.monotonic() + ttl_s)
+
+    async def refresh(self, *, name, ttl_s):
+        self.refreshed.append(name)
+        return time.monotonic() + ttl_s
+
+
+class FakeAioModels:
+    def __init__(self, *, reject=()):
+        self.configs = []
+        self.reject = set(reject)
+
+    async def generate_content(self, *, model, contents, config):
+        self.configs.append(config)
+        if config.cached_content in self.reject:
+            raise errors.ClientError(404, {"error": {"message": "not found", "status": "NOT_FOUND"}})
+        cached = 1900 if config.cached_content else 0
+        usage = pytypes.SimpleNamespace(prompt_token_count=2000, cached_content_token_count=cached)
+        return pytypes.SimpleNamespace(candidates=[], usage_metadata=usage)
+
+
+@pytest.fixture
+def manager():
+    def install(backend, **kwargs):
+        mgr = ContextCacheManager(backend, **kwargs)
+        mgr.register(STATIC)
+        set_context_cache(mgr)
+        return mgr
+
+    yield install
+    set_context_cache(None)
+
+
+def _client(models):
+    return pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=models))
+
+
+@pytest.mark.asyncio
+async def test_static_instruction_is_sent_by_reference(monkeypatch, manager):
+    backend = FakeBackend()
+    mgr = manager(backend)
+    models = FakeAioModels()
+    monkeypatch.setattr(genai_module, "get_client", lambda: _client(models))
+
+    await asyncio.gather(
+        *(genai_module.generate_text_async(model="m", instruction=STATIC, prompt="棗", use_cache=False) for _ in range(3))
+    )
+    await genai_module.generate_text_async(model="m", instruction="その場の指示", prompt="棗", use_cache=False)
+
+    assert backend.created == ["cachedContents/0"]  # created once despite concurrent callers
+    assert [c.cached_content for c in models.configs] == ["cachedContents/0"] * 3 + [None]
+    assert all(c.system_instruction is None for c in models.configs[:3])
+    assert models.configs[3].system_instruction == "その場の指示"
+    stats = mgr.stats()
+    assert stats["with_cache"]["calls"] == 3
+    assert stats["with_cache"]["billed_input_tokens"] == 300
+    assert stats["without_cache"]["calls"] == 0  # ad-hoc instructions are not part of the comparison
+
+
+@pytest.mark.asyncio
+async def test_refreshes_before_expiry(monkeypatch, manager):
+    backend = FakeBackend()
+    mgr = manager(backend, ttl_s=50, refresh_margin_s=60)
+    monkeypatch.setattr(genai_module, "get_client", lambda: _client(FakeAioModels()))
+
+    await genai_module.generate_text_async(model="m", instruction=STATIC, prompt="a", use_cache=False)
+    await genai_module.generate_text_async(model="m", instruction=STATIC, prompt="b", use_cache=False)
+
+    # A 50s handle is always inside the 60s margin, so the next call extends it.
+    assert backend.created == ["cachedContents/0"]
+    assert backend.refreshed == ["cachedContents/0"]
+    assert mgr.stats()["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_inline_when_caching_is_unavailable(monkeypatch, manager):
+    backend = FakeBackend(fail=True)
+    mgr = manager(backend)
+    models = FakeAioModels()
+    monkeypatch.setattr(genai_module, "get_client", lambda: _client(models))
+
+    for _ in range(2):
+        await genai_module.generate_text_async(model="m", instruction=STATIC, prompt="棗", use_cache=False)
+
+    assert [c.system_instruction for c in models.configs] == [STATIC, STATIC]
+    stats = mgr.stats()
+    assert stats["failures"] == 1  # backed off instead of retrying on every call
+    assert stats["without_cache"]["billed_input_tokens"] == 4000
+
+
+@pytest.mark.asyncio
+async def test_rejected_handle_is_invalidated_and_retried_inline(monkeypatch, manager):
+    backend = FakeBackend()
+    mgr = manager(backend)
+    models = FakeAioModels(reject={"cachedContents/0"})
+    monkeypatch.setattr(genai_module, "get_client", lambda: _client(models))
+
+    await genai_module.generate_text_async(model="m", instruction=STATIC, prompt="棗", use_cache=False)
+
+    assert [c.cached_content for c in models.configs] == ["cachedContents/0", None]
+    assert models.configs[1].system_instruction == STATIC
+    assert mgr.stats()["invalidations"] == 1
+    assert mgr.stats()["handles"] == 0
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from adk.services import deadline
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    deadline.reset_abort_stats()
+    yield
+    deadline.reset_abort_stats()
+
+
+@pytest.mark.asyncio
+async def test_closing_scope_aborts_in_flight_call():
+    scope = deadline.CallScope("c1")
+    started = asyncio.Event()
+    cancelled = []
+
+    async def slow_model_call():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def tool():
+        with deadline.bind_scope(scope):
+            return await deadline.guard_call(slow_model_call(), tool="analyze_tool_history")
+
+    task = asyncio.create_task(tool())
+    await started.wait()
+    assert scope.close("disconnect") == 1
+
+    with pytest.raises(deadline.CallAborted) as exc:
+        await task
+    assert exc.value.reason == "disconnect"
+    assert cancelled == [True]
+    assert deadline.abort_stats()["by_tool"] == {"analyze_tool_history": {"disconnect": 1}}
+
+
+@pytest.mark.asyncio
+async def test_turn_deadline_and_tool_timeout(monkeypatch):
+    monkeypatch.setenv("GENAI_TOOL_TIMEOUTS", "translate_text=0.01")
+    scope = deadline.CallScope("c1")
+    scope.start_turn(5)
+
+    with deadline.bind_scope(scope):
+        with pytest.raises(deadline.CallAborted) as exc:
+            await deadline.guard_call(asyncio.sleep(1), tool="translate_text")
+        assert exc.value.reason == "timeout"
+
+        scope.start_turn(0.01)
+        with pytest.raises(deadline.CallAborted) as exc:
+            await deadline.guard_call(asyncio.sleep(1), tool="analyze_setting")
+        assert exc.value.reason == "deadline"
+
+    assert deadline.abort_stats()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_closed_scope_refuses_new_calls():
+    scope = deadline.CallScope("c1")
+    scope.close("sse_closed")
+
+    with deadline.bind_scope(scope):
+        with pytest.raises(deadline.CallAborted):
+            await deadline.guard_call(asyncio.sleep(0), tool="summarize_image")
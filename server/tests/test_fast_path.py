@@ -0,0 +1,82 @@
+import types as pytypes
+
+import pytest
+
+from adk.planner import agent as planner_module
+from adk.planner.router import RouterStats, route, split_mode_instruction
+
+
+def test_route_rules():
+    assert route(mode="beginner", user_text="「お点前頂戴いたします」を英語に翻訳して", vision=[]).args == {
+        "text": "お点前頂戴いたします",
+        "target_language": "English",
+    }
+    assert route(mode="advanced", user_text="translate to French: 一期一会", vision=[]).args["target_language"] == "French"
+    assert route(mode="beginner", user_text="", vision=["[Vision解析1] 棗"]).tool == "call_tools_basic"
+    assert route(mode="advanced", user_text="", vision=["[Vision解析1] 棗"]).tool == "call_tools_analysis"
+    assert route(mode="intermediate", user_text="", vision=["[Vision解析1] 棗"]) is None
+    assert route(mode="intermediate", user_text="この茶碗の作者は？", vision=[]).tool == "call_tools_analysis"
+    # Two intents (basics + setting) are left to the planner.
+    assert route(mode="intermediate", user_text="設えと道具の使い方を教えて", vision=[]) is None
+
+
+def test_keyword_route_needs_a_subject():
+    # General questions without an image or a known utensil go to the planner
+    assert route(mode="beginner", user_text="和敬清寂とは何ですか", vision=[]) is None
+    assert route(mode="beginner", user_text="あなたの名前は何ですか", vision=[]) is None
+    assert route(mode="intermediate", user_text="季節", vision=[]) is None
+    assert route(mode="intermediate", user_text="この時代の特徴は？", vision=[]) is None
+    # The same intents route once there is a utensil or a vision observation
+    assert route(mode="beginner", user_text="棗の使い方は？", vision=[]).tool == "call_tools_basic"
+    assert route(mode="intermediate", user_text="この季節に合う取り合わせは？", vision=["[Vision解析1] 床の間に花入"]).tool == (
+        "call_setting_analysis"
+    )
+
+
+def test_split_mode_instruction():
+    mode, texts = split_mode_instruction(["上級者モード: 簡潔かつ技術的に…", "棗の銘は？"])
+    assert mode == "advanced" and texts == ["棗の銘は？"]
+
+
+@pytest.mark.asyncio
+async def test_hook_short_circuits_obvious_turn(monkeypatch):
+    calls = []
+
+    async def history(prompt):
+        calls.append(prompt)
+        return "樂家の作と拝察します。"
+
+    stats = RouterStats()
+    monkeypatch.setattr(planner_module, "router_stats", stats)
+    monkeypatch.setattr(planner_module, "analyze_tool_history_async", history)
+    monkeypatch.setattr(planner_module, "get_semantic_cache", lambda: None)
+    last = pytypes.SimpleNamespace(
+        role="user",
+        parts=[
+            pytypes.SimpleNamespace(inline_data=None, text="中級者モード: 要点を箇条書き中心で…"),
+            pytypes.SimpleNamespace(inline_data=None, text="この茶碗の作者は？"),
+        ],
+    )
+    ctx = pytypes.SimpleNamespace(invocation_id="inv-1")
+
+    response = await planner_module._planner_router_before_model(ctx, pytypes.SimpleNamespace(contents=[last]))
+
+    assert response.content.parts[0].text == "樂家の作と拝察します。"
+    assert calls == ["この茶碗の作者は？"]
+    assert stats.as_dict()["llm_routing_calls_saved"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hook_falls_back_and_times_planner(monkeypatch):
+    stats = RouterStats()
+    monkeypatch.setattr(planner_module, "router_stats", stats)
+    last = pytypes.SimpleNamespace(role="user", parts=[pytypes.SimpleNamespace(inline_data=None, text="こんにちは")])
+    ctx = pytypes.SimpleNamespace(invocation_id="inv-2")
+
+    assert await planner_module._planner_router_before_model(ctx, pytypes.SimpleNamespace(contents=[last])) is None
+    await planner_module._planner_after_model(ctx, None)
+
+    snapshot = stats.as_dict()
+    assert snapshot["fallbacks"] == 1
+    assert snapshot["planner_latency_ewma_ms"] is not None
+    assert snapshot["est_saved_latency_ms"] == 0.0
@@ -0,0 +1,101 @@
+import asyncio
+import io
+
+import pytest
+
+from server.core.frame_selector import DROPPED_RATE, DROPPED_SIMILAR, FORWARDED, FrameSelector
+
+
+def _jpeg(flip: bool = False, quality: int = 90) -> bytes:
+    np = pytest.importorskip("numpy")
+    Image = pytest.importorskip("PIL.Image")
+    gradient = np.tile(np.linspace(0, 255, 320, dtype=np.uint8), (240, 1))
+    if flip:
+        gradient = gradient[:, ::-1]
+    buf = io.BytesIO()
+    Image.fromarray(np.stack([gradient] * 3, axis=-1)).save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def test_drops_unchanged_scenes_and_caps_rate():
+    now = [0.0]
+    selector = FrameSelector(threshold=6, max_fps=1.0, clock=lambda: now[0])
+    scene_a, scene_a_noisy, scene_b = _jpeg(), _jpeg(quality=40), _jpeg(flip=True)
+
+    assert selector.select("c1", scene_a) == FORWARDED
+    now[0] = 0.3
+    assert selector.select("c1", scene_a_noisy) == DROPPED_SIMILAR
+    assert selector.select("c1", scene_b) == DROPPED_RATE  # scene change, but within 1s of the last frame
+    now[0] = 1.2
+    assert selector.select("c1", scene_b) == FORWARDED
+    assert selector.select("c2", scene_b) == FORWARDED  # connections are independent
+
+    stats = selector.stats()
+    assert (stats["received"], stats["forwarded"], stats["dropped_similar"], stats["dropped_rate"]) == (5, 3, 1, 1)
+    assert stats["connections"]["c1"] == {"received": 4, "forwarded": 2, "dropped_similar": 1, "dropped_rate": 1}
+    selector.discard("c1")
+    assert "c1" not in selector.stats()["connections"]
+
+
+def test_undecodable_frames_compare_bytes():
+    selector = FrameSelector(max_fps=0)
+    assert selector.select("c1", b"raw-a") == FORWARDED
+    assert selector.select("c1", b"raw-a") == DROPPED_SIMILAR
+    assert selector.select("c1", b"raw-b") == FORWARDED
+    assert selector.stats()["unhashable"] == 3
+
+
+@pytest.mark.asyncio
+async def test_coordinator_forwards_only_selected_frames(monkeypatch):
+    from server.core.coordinator import MultimodalServer
+
+    server = MultimodalServer()
+    sent = []
+
+    class FakeLrq:
+        def send_content(self, content):
+            sent.append(content)
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("server.core.coordinator.asyncio.sleep", no_sleep)
+    for _ in range(5):
+        await server.send_video_frame(FakeLrq(), "c1", b"same-frame")
+    assert len(sent) == 2  # one image turn + its follow-up nudge
+    assert server.frame_selector.stats()["dropped_similar"] == 4
+
+
+@pytest.mark.asyncio
+async def test_text_mode_decodes_each_frame_once(monkeypatch):
+    from adk.vision import cache as vision_cache_module
+    from server.core.coordinator import MultimodalServer
+    from server.core.vision_proxy import TEXT
+
+    decodes = []
+    perceptual_hash = vision_cache_module.perceptual_hash
+
+    def counting_hash(image_bytes, **kwargs):
+        decodes.append(len(image_bytes))
+        return perceptual_hash(image_bytes, **kwargs)
+
+    monkeypatch.setattr(vision_cache_module, "perceptual_hash", counting_hash)
+    server = MultimodalServer()
+    fingerprints = []
+
+    async def summarize(frame, *, fingerprint=None):
+        fingerprints.append(fingerprint)
+        return "棗"
+
+    server.vision_proxy._summarize = summarize
+    server.set_vision_mode("c1", TEXT)
+
+    class FakeLrq:
+        def send_content(self, content):
+            pass
+
+    await server.send_video_frame(FakeLrq(), "c1", _jpeg())
+    await asyncio.sleep(0.01)
+    assert len(decodes) == 1
+    assert fingerprints and fingerprints[0] is not None and fingerprints[0][1] is False
+    server.vision_proxy.discard("c1")
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import types as pytypes
+
+import pytest
+
+from adk.services import genai as genai_module
+
+
+class FakeSyncModels:
+    def __init__(self):
+        self.threads: list[str] = []
+
+    def generate_content(self, *, model, contents, config):
+        self.threads.append(threading.current_thread().name)
+        return pytypes.SimpleNamespace(model=model, contents=contents, config=config)
+
+
+class FakeAioModels:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def generate_content(self, *, model, contents, config):
+        self.calls.append(model)
+        await asyncio.sleep(0)
+        return pytypes.SimpleNamespace(model=model, contents=contents, config=config)
+
+
+@pytest.mark.asyncio
+async def test_generate_text_async_uses_aio_client(monkeypatch):
+    sync_models, aio_models = FakeSyncModels(), FakeAioModels()
+    client = pytypes.SimpleNamespace(models=sync_models, aio=pytypes.SimpleNamespace(models=aio_models))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+
+    resp = await genai_module.generate_text_async(model="m1", instruction="sys", prompt="  hi  ")
+
+    assert aio_models.calls == ["m1"]
+    assert sync_models.threads == []
+    assert resp.contents[0].parts[0].text == "hi"
+    assert resp.config.system_instruction == "sys"
+
+
+@pytest.mark.asyncio
+async def test_generate_text_async_falls_back_to_bounded_executor(monkeypatch):
+    sync_models = FakeSyncModels()
+    client = pytypes.SimpleNamespace(models=sync_models)
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+    monkeypatch.setenv("GENAI_SYNC_WORKERS", "2")
+    genai_module.shutdown_executor()
+    try:
+        await genai_module.generate_text_async(model="m1", instruction="sys", prompt="hi")
+        assert genai_module.get_executor()._max_workers == 2
+    finally:
+        genai_module.shutdown_executor()
+
+    assert len(sync_models.threads) == 1
+    assert sync_models.threads[0].startswith("genai-sync")
+
+
+def _chunk(text, **extra):
+    from google.genai import types
+
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text=text)]), **extra)]
+    )
+
+
+class FakeStreamingModels:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.streamed = 0
+
+    async def generate_content_stream(self, *, model, contents, config):
+        self.streamed += 1
+
+        async def gen():
+            for piece in self.pieces:
+                await asyncio.sleep(0)
+                yield _chunk(piece)
+
+        return gen()
+
+
+@pytest.mark.asyncio
+async def test_stream_forwards_deltas_to_scope_and_returns_merged_text(monkeypatch):
+    from adk.services.deadline import CallScope, bind_scope
+
+    models = FakeStreamingModels(["黒楽は", "利休好み", "の茶碗です。"])
+    monkeypatch.setattr(genai_module, "get_client", lambda: pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=models)))
+    sent = []
+
+    async def sink(message):
+        sent.append(message)
+
+    scope = CallScope("c1")
+    scope.progress = sink
+    with bind_scope(scope):
+        resp = await genai_module.generate_text_stream_async(
+            model="m", instruction="sys", prompt="黒楽", tool="analyze_tool_history", use_cache=False
+        )
+
+    assert genai_module.get_text_from_response(resp) == "黒楽は利休好みの茶碗です。"
+    assert [m.get("text") for m in sent] == ["黒楽は", "利休好み", "の茶碗です。", None]
+    assert sent[-1]["done"] is True
+    assert {m["call_id"] for m in sent} == {sent[0]["call_id"]}
+    assert [m["seq"] for m in sent] == [0, 1, 2, 3]
+    assert all(m["type"] == "tool_progress" and m["tool"] == "analyze_tool_history" for m in sent)
+
+
+@pytest.mark.asyncio
+async def test_stream_without_listener_is_a_plain_call(monkeypatch):
+    models = FakeStreamingModels(["unused"])
+    aio_models = FakeAioModels()
+    aio_models.generate_content_stream = models.generate_content_stream
+    monkeypatch.setattr(genai_module, "get_client", lambda: pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=aio_models)))
+
+    await genai_module.generate_text_stream_async(model="m", instruction="sys", prompt="hi", use_cache=False)
+
+    assert models.streamed == 0
+    assert aio_models.calls == ["m"]
+
+
+@pytest.mark.asyncio
+async def test_broken_progress_sink_does_not_fail_the_tool(monkeypatch):
+    from adk.services.deadline import CallScope, bind_scope
+
+    models = FakeStreamingModels(["a", "b"])
+    monkeypatch.setattr(genai_module, "get_client", lambda: pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=models)))
+
+    async def sink(message):
+        raise RuntimeError("websocket closed")
+
+    scope = CallScope("c1")
+    scope.progress = sink
+    with bind_scope(scope):
+        resp = await genai_module.generate_text_stream_async(model="m", instruction="sys", prompt="x", use_cache=False)
+
+    assert genai_module.get_text_from_response(resp) == "ab"
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from adk.services.hedging import HedgePolicy
+
+
+def _warm(policy: HedgePolicy, key: str, latency_s: float = 0.02, n: int = 20) -> None:
+    for _ in range(n):
+        policy.observe(key, latency_s)
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled():
+    policy = HedgePolicy(tools=("analyze_setting",), min_samples=20, min_delay_s=0.01)
+    _warm(policy, "analyze_setting")
+    delays = iter([1.0, 0.01])
+    cancelled = []
+
+    async def attempt(reporter):
+        delay = next(delays)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    started = asyncio.get_running_loop().time()
+    result = await policy.run("analyze_setting", attempt)
+    assert result == 0.01
+    assert asyncio.get_running_loop().time() - started < 0.2
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+    stats = policy.stats()["tools"]["analyze_setting"]
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_and_warmup_limit_hedges():
+    policy = HedgePolicy(tools=None, min_samples=3, min_delay_s=0.005, budget=0.0, burst=1.0)
+    calls = 0
+
+    async def attempt(reporter):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    # Not enough samples yet: never hedged.
+    for _ in range(3):
+        await policy.run("summarize_image", attempt)
+    assert calls == 3
+    _warm(policy, "summarize_image", 0.001, n=100)
+    await policy.run("summarize_image", attempt)
+    await policy.run("summarize_image", attempt)
+    stats = policy.stats()["tools"]["summarize_image"]
+    assert stats["hedged"] == 1 and stats["denied_budget"] == 1
+    assert calls == 3 + 2 + 1
+
+
+class _Reporter:
+    def __init__(self):
+        self.deltas = []
+
+    async def text(self, delta):
+        self.deltas.append(delta)
+
+
+@pytest.mark.asyncio
+async def test_streamed_race_is_won_by_first_delta():
+    policy = HedgePolicy(tools=("analyze_setting",), min_samples=1, min_delay_s=0.01)
+    policy.observe("analyze_setting:stream", 0.01)
+    reporter = _Reporter()
+    plans = iter([(0.5, "slow"), (0.02, "fast")])
+    cancelled = []
+
+    async def attempt(rep):
+        wait, label = next(plans)
+        try:
+            await asyncio.sleep(wait)
+            await rep.text(f"{label}-1")
+            await asyncio.sleep(0.01)
+            await rep.text(f"{label}-2")
+        except asyncio.CancelledError:
+            cancelled.append(label)
+            raise
+        return label
+
+    assert await policy.run("analyze_setting", attempt, reporter=reporter) == "fast"
+    assert reporter.deltas == ["fast-1", "fast-2"]
+    await asyncio.sleep(0)
+    assert cancelled == ["slow"]
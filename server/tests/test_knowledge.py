@@ -0,0 +1,40 @@
+import pytest
+
+from adk.knowledge import answer_lookup, ground_prompt, knowledge_base
+from adk.tools_basic import agent as basic_module
+
+
+def test_scan_prefers_longest_match_and_skips_short_readings():
+    kb = knowledge_base()
+    text = "黒い楽茶碗の手前に朱塗りのなつめ、風炉に釜。ふろしきは無関係"
+    assert [m.utensil.name for m in kb.scan(text)] == ["楽茶碗", "棗", "風炉", "釜"]
+
+
+def test_fuzzy_search_and_exact_get():
+    kb = knowledge_base()
+    assert kb.get("袱紗").name == "帛紗"
+    assert kb.search("なつめい")[0][0].name == "棗"
+
+
+def test_answer_lookup_uses_subject_from_question_or_vision():
+    assert answer_lookup("[Vision解析1] 竹の茶杓\n\nこれの読み方は？").startswith("茶杓は「ちゃしゃく」と読みます。")
+    assert "中村宗哲" in answer_lookup("棗は千家十職のどこが作りますか")
+    # Two utensils in the findings and none in the question: let the model decide.
+    assert answer_lookup("[Vision解析1] 棗と茶杓\n\nこれの読み方は？") is None
+    assert answer_lookup("この棗の魅力を教えて") is None
+
+
+def test_ground_prompt_appends_known_facts():
+    grounded = ground_prompt("この建水について")
+    assert grounded.startswith("この建水について\n\n[参考情報")
+    assert "建水（けんすい）" in grounded and "中川浄益（金物師）" in grounded
+    assert ground_prompt("こんにちは") == "こんにちは"
+
+
+@pytest.mark.asyncio
+async def test_reading_question_needs_no_model_call(monkeypatch):
+    async def boom(**kwargs):
+        raise AssertionError("model should not be called")
+
+    monkeypatch.setattr(basic_module, "generate_text_stream_async", boom)
+    assert (await basic_module.explain_tool_basics_async("蓋置の読み方は？")).startswith("蓋置は「ふたおき」")
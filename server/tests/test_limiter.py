@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+from google.genai import errors
+
+from adk.services import genai as genai_module
+from adk.services.deadline import CallAborted
+from adk.services.limiter import AdaptiveLimiter, LimiterRejected, is_overload, set_model_limiter
+
+
+def _quota_error():
+    return errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Quota exceeded"}})
+
+
+@pytest.mark.asyncio
+async def test_quota_errors_halve_limit_once_per_burst_and_success_grows_it():
+    limiter = AdaptiveLimiter("t", max_limit=8, min_limit=1, cooldown_s=60)
+    assert is_overload(_quota_error()) and not is_overload(ValueError("boom"))
+
+    for _ in range(3):
+        with pytest.raises(errors.ClientError):
+            async with limiter.acquire():
+                raise _quota_error()
+    assert limiter.limit == 4
+    assert limiter.stats()["overloads"] == 3 and limiter.stats()["decreases"] == 1
+
+    # A full window of successes grows the limit only when it was the bottleneck.
+    for _ in range(4):
+        async with limiter.acquire():
+            pass
+    assert limiter.limit == 4
+
+    release = asyncio.Event()
+
+    async def busy():
+        async with limiter.acquire():
+            await release.wait()
+
+    tasks = [asyncio.create_task(busy()) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queued"] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+    assert limiter.limit == 5 and limiter.stats()["increases"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_rejected_after_max_wait_and_threads_share_the_limit():
+    limiter = AdaptiveLimiter("t", max_limit=1, max_wait_s=0.02)
+    async with limiter.acquire():
+        with pytest.raises(LimiterRejected):
+            async with limiter.acquire():
+                pass
+        done = threading.Event()
+
+        def blocking():
+            with limiter.acquire_sync():
+                done.set()
+
+        thread = threading.Thread(target=blocking)
+        limiter.max_wait_s = None
+        thread.start()
+        await asyncio.sleep(0.02)
+        assert not done.is_set()
+    await asyncio.to_thread(thread.join, 1)
+    assert done.is_set()
+    stats = limiter.stats()
+    assert stats["rejected"] == 1 and stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_model_call_rejection_surfaces_as_abort(monkeypatch):
+    limiter = AdaptiveLimiter("genai", max_limit=1, max_wait_s=0.01)
+    set_model_limiter(limiter)
+    monkeypatch.setattr(genai_module, "get_client", lambda: pytest.fail("should not reach the model"))
+    try:
+        async with limiter.acquire():
+            with pytest.raises(CallAborted) as exc:
+                await genai_module.generate_text_async(model="m", instruction="", prompt="hi", tool="t", use_cache=False)
+        assert exc.value.reason == "overloaded"
+    finally:
+        set_model_limiter(None)
@@ -0,0 +1,123 @@
+import types as pytypes
+
+import pytest
+from google.genai import types
+
+from adk.services import genai as genai_module
+from adk.services.model_router import FALLBACK, PRIMARY, ModelRouter, ToolRoute, set_model_router
+
+
+def _router(**kwargs) -> ModelRouter:
+    route = ToolRoute(primary="pro", fallback="lite", slo_ms=100)
+    return ModelRouter({"analyze_setting": route}, window=10, min_samples=5, probe_every=4, recover_after=2, **kwargs)
+
+
+def test_slow_primary_degrades_then_recovers_through_probes():
+    router = _router()
+    assert router.select("other_tool", "flash") == ("flash", PRIMARY)
+    for _ in range(5):
+        model, tier = router.select("analyze_setting", "flash")
+        assert (model, tier) == ("pro", PRIMARY)
+        router.record("analyze_setting", model, tier, latency_s=0.3, ok=True)
+
+    picks = [router.select("analyze_setting", "flash") for _ in range(8)]
+    assert picks.count(("lite", FALLBACK)) == 6 and picks.count(("pro", PRIMARY)) == 2
+
+    router.record("analyze_setting", "pro", PRIMARY, latency_s=0.05, ok=True)
+    assert router.stats()["tools"]["analyze_setting"]["state"] == "degraded"
+    router.record("analyze_setting", "pro", PRIMARY, latency_s=0.05, ok=True)
+    stats = router.stats()["tools"]["analyze_setting"]
+    assert stats["state"] == "primary" and stats["degradations"] == 1 and stats["recoveries"] == 1
+    assert router.select("analyze_setting", "flash") == ("pro", PRIMARY)
+
+
+def test_error_rate_degrades_even_within_slo():
+    router = _router(max_error_rate=0.3)
+    for ok in (True, False, True, False, False):
+        router.record("analyze_setting", "pro", PRIMARY, latency_s=0.01, ok=ok)
+    assert router.select("analyze_setting", "flash") == ("lite", FALLBACK)
+
+
+@pytest.mark.asyncio
+async def test_generate_uses_routed_model_and_records_tier(monkeypatch):
+    router = _router()
+    set_model_router(router)
+    seen = []
+
+    async def generate_content(*, model, **_):
+        seen.append(model)
+        return types.GenerateContentResponse(candidates=[])
+
+    client = pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=pytypes.SimpleNamespace(generate_content=generate_content)))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+    try:
+        await genai_module.generate_text_async(
+            model="flash", instruction="", prompt="設え", tool="analyze_setting", use_cache=False
+        )
+    finally:
+        set_model_router(None)
+    assert seen == ["pro"]
+    assert router.stats()["tools"]["analyze_setting"]["served"] == {"primary": 1}
+
+
+def _degraded_router() -> ModelRouter:
+    route = ToolRoute(primary="pro", fallback="lite", slo_ms=100)
+    router = ModelRouter({"analyze_setting": route}, window=10, min_samples=5, probe_every=100)
+    for _ in range(5):
+        router.record("analyze_setting", "pro", PRIMARY, latency_s=0.3, ok=True)
+    return router
+
+
+class _Resp:
+    def __init__(self, text):
+        self.candidates = [pytypes.SimpleNamespace(content=pytypes.SimpleNamespace(parts=[pytypes.SimpleNamespace(text=text)]))]
+        self.usage_metadata = None
+
+    def model_dump_json(self, **_):
+        return self.candidates[0].content.parts[0].text
+
+
+@pytest.mark.asyncio
+async def test_fallback_answers_are_not_cached(tmp_path, monkeypatch):
+    from adk.services.response_cache import ResponseCache
+
+    set_model_router(_degraded_router())
+    seen = []
+
+    async def generate_content(*, model, **_):
+        seen.append(model)
+        return _Resp(f"answer from {model}")
+
+    client = pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=pytypes.SimpleNamespace(generate_content=generate_content)))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(genai_module, "get_response_cache", lambda: cache)
+    try:
+        for _ in range(2):
+            await genai_module.generate_text_async(model="flash", instruction="i", prompt="設え", tool="analyze_setting")
+    finally:
+        set_model_router(None)
+    # Both calls reach the (fallback) model: its answer was not stored under the primary's key
+    assert seen == ["lite", "lite"]
+    assert cache.stats()["hits"] == 0
+
+
+def test_sync_generate_with_parts_is_routed(monkeypatch):
+    router = _degraded_router()
+    set_model_router(router)
+    seen = []
+
+    def generate_content(*, model, **_):
+        seen.append(model)
+        return _Resp("ok")
+
+    client = pytypes.SimpleNamespace(models=pytypes.SimpleNamespace(generate_content=generate_content))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+    try:
+        genai_module.generate_with_parts(
+            model="flash", instruction="i", parts=[types.Part.from_text(text="x")], tool="analyze_setting"
+        )
+    finally:
+        set_model_router(None)
+    assert seen == ["lite"]
+    assert router.stats()["tools"]["analyze_setting"]["served"]["fallback"] == 1
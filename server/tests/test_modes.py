@@ -0,0 +1,60 @@
+import types as pytypes
+
+import pytest
+
+from adk.planner.agent import PLANNER_INSTRUCTION, planner_agent
+from adk.planner.modes import MODE_STATE_KEY, mode_instruction_provider, normalize_mode
+from server.core.coordinator import MultimodalServer
+
+
+def test_normalize_mode():
+    assert normalize_mode(" Beginner ") == "beginner"
+    assert normalize_mode("上級") == "advanced"
+    assert normalize_mode("expert") is None
+
+
+def test_instruction_provider_reads_session_state():
+    provider = mode_instruction_provider("BASE")
+    assert provider(pytypes.SimpleNamespace(state={})).startswith("BASE\n")
+    assert "中級者モード" in provider(pytypes.SimpleNamespace(state={}))
+    assert "初級者モード" in provider(pytypes.SimpleNamespace(state={MODE_STATE_KEY: "beginner"}))
+    assert planner_agent.instruction(pytypes.SimpleNamespace(state={MODE_STATE_KEY: "advanced"})).startswith(PLANNER_INSTRUCTION)
+
+
+@pytest.mark.asyncio
+async def test_mode_lives_in_session_state_and_is_sent_only_on_change():
+    server = MultimodalServer()
+    conn = await server.create_connection(agent_key="analyze", user_id="u1")
+    cid = conn["connection_id"]
+    session = server.session_service._sessions[conn["session_id"]]
+    server.set_mode(cid, "beginner")
+    assert session.state[MODE_STATE_KEY] == "beginner"
+
+    # Live session started with the mode in its system instruction: nothing to prepend
+    server._mode_sent[cid] = server._get_mode(cid)
+    assert server.mode_change_parts(cid) == []
+
+    server.set_mode(cid, "advanced")
+    assert session.state[MODE_STATE_KEY] == "advanced"
+    parts = server.mode_change_parts(cid)
+    assert len(parts) == 1 and parts[0].text.startswith("上級者モード")
+    assert server.mode_change_parts(cid) == []
+
+
+@pytest.mark.asyncio
+async def test_video_turns_carry_no_mode_text(monkeypatch):
+    server = MultimodalServer()
+    sent = []
+
+    class FakeLrq:
+        def send_content(self, content):
+            sent.append(content)
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("server.core.coordinator.asyncio.sleep", no_sleep)
+    for _ in range(3):
+        await server._send_video_content_immediate(FakeLrq(), "c1", b"jpeg")
+    texts = [p.text for c in sent for p in c.parts if p.text]
+    assert not any("モード" in t for t in texts)
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from adk.planner import agent as planner_module
+from adk.services.deadline import CallAborted
+
+
+def _fake_agent(label: str, delay: float, calls: list[str]):
+    async def fake(prompt: str) -> str:
+        calls.append(label)
+        await asyncio.sleep(delay)
+        return f"{label}:{prompt}"
+
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_multi_perspective_runs_sections_concurrently(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(planner_module, "analyze_setting_async", _fake_agent("setting", 0.1, calls))
+    monkeypatch.setattr(planner_module, "explain_tool_basics_async", _fake_agent("basic", 0.1, calls))
+    monkeypatch.setattr(planner_module, "analyze_tool_history_async", _fake_agent("analysis", 0.1, calls))
+    monkeypatch.setattr(planner_module, "get_semantic_cache", lambda: None)
+
+    started = time.perf_counter()
+    result = await planner_module.call_multi_perspective("主な道具", "基礎, setting")
+    elapsed = time.perf_counter() - started
+
+    assert sorted(calls) == ["basic", "setting"]
+    assert elapsed < 0.18
+    sections = result.split("\n\n")
+    assert sections[0].startswith("[道具の基礎](") and sections[0].endswith("\nbasic:主な道具")
+    assert sections[1].startswith("[設え](") and sections[1].endswith("\nsetting:主な道具")
+
+
+@pytest.mark.asyncio
+async def test_multi_perspective_isolates_failures_and_defaults_to_all(monkeypatch):
+    calls: list[str] = []
+
+    async def aborted(prompt):
+        raise CallAborted("timeout", "analyze_tool_history")
+
+    monkeypatch.setattr(planner_module, "analyze_setting_async", _fake_agent("setting", 0, calls))
+    monkeypatch.setattr(planner_module, "explain_tool_basics_async", _fake_agent("basic", 0, calls))
+    monkeypatch.setattr(planner_module, "analyze_tool_history_async", aborted)
+    monkeypatch.setattr(planner_module, "get_semantic_cache", lambda: None)
+
+    result = await planner_module.call_multi_perspective("茶碗", "")
+
+    sections = result.split("\n\n")
+    assert [s.split("]")[0] for s in sections] == ["[設え", "[道具の基礎", "[由緒・歴史"]
+    assert sections[2].endswith(planner_module._ABORTED_MESSAGE)
@@ -0,0 +1,101 @@
+import asyncio
+import types as pytypes
+
+import pytest
+
+from adk.planner import agent as planner_module
+from adk.planner import prefetch as prefetch_module
+from adk.services.deadline import CallScope, bind_scope
+
+
+def _fake_generate(calls: list[dict], delay: float = 0.0):
+    async def fake(*, model, instruction, prompt, tool, **kwargs):
+        calls.append({"tool": tool, "prompt": prompt})
+        await asyncio.sleep(delay)
+        return pytypes.SimpleNamespace(
+            candidates=[
+                pytypes.SimpleNamespace(
+                    content=pytypes.SimpleNamespace(parts=[pytypes.SimpleNamespace(text=f"prefetched:{tool}")])
+                )
+            ],
+            usage_metadata=pytypes.SimpleNamespace(total_token_count=120),
+        )
+
+    return fake
+
+
+@pytest.fixture
+def prefetcher(monkeypatch):
+    instance = prefetch_module.Prefetcher(enabled=True, max_per_connection=2, ttl_s=60)
+    monkeypatch.setattr(prefetch_module, "prefetcher", instance)
+    monkeypatch.setattr(planner_module, "prefetcher", instance)
+    monkeypatch.setattr(planner_module, "get_semantic_cache", lambda: None)
+    return instance
+
+
+def test_find_utensil_prefers_first_mention():
+    assert prefetch_module.find_utensil(["茶道具が映っていないようです。"]) is None
+    assert prefetch_module.find_utensil(["黒い楽茶碗の手前に棗があります"]) == "楽茶碗"
+    assert prefetch_module.find_utensil(["床の間", "朱塗りのなつめと茶杓"]) == "棗"
+
+
+@pytest.mark.asyncio
+async def test_mode_selects_sub_agent_and_planner_tool_hits(monkeypatch, prefetcher):
+    calls: list[dict] = []
+    monkeypatch.setattr(prefetch_module, "generate_text_async", _fake_generate(calls))
+
+    async def never(prompt):
+        raise AssertionError("sub-agent should not be called on a prefetch hit")
+
+    monkeypatch.setattr(planner_module, "analyze_tool_history_async", never)
+    scope = CallScope("c1", mode="advanced")
+    with bind_scope(scope):
+        task = prefetcher.schedule(["漆塗りの棗が置かれています"])
+        await task
+        answer = await planner_module.call_tools_analysis("この棗の作者は？")
+
+    assert [c["tool"] for c in calls] == ["analyze_tool_history"]
+    assert "棗" in calls[0]["prompt"]
+    assert answer == "prefetched:analyze_tool_history"
+    stats = prefetcher.stats()
+    assert stats["hits"] == 1 and stats["used"] == 1 and stats["hit_rate"] == 1.0
+    assert stats["tokens"] == 120
+
+
+@pytest.mark.asyncio
+async def test_inflight_prefetch_is_joined_and_misses_fall_through(monkeypatch, prefetcher):
+    calls: list[dict] = []
+    monkeypatch.setattr(prefetch_module, "generate_text_async", _fake_generate(calls, delay=0.05))
+
+    async def explain(prompt):
+        return f"live:{prompt}"
+
+    monkeypatch.setattr(planner_module, "explain_tool_basics_async", explain)
+    with bind_scope(CallScope("c2", mode="beginner")):
+        prefetcher.schedule(["茶杓が見えます"])
+        joined = await planner_module.call_tools_basic("茶杓の使い方")
+        other = await planner_module.call_tools_basic("柄杓の使い方")
+
+    assert joined == "prefetched:explain_tool_basics"
+    assert other == "live:柄杓の使い方"
+    assert prefetcher.stats()["joined"] == 1 and prefetcher.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_and_wasted_tokens_on_close(monkeypatch, prefetcher):
+    calls: list[dict] = []
+    monkeypatch.setattr(prefetch_module, "generate_text_async", _fake_generate(calls))
+    scope = CallScope("c3", mode="beginner")
+    with bind_scope(scope):
+        for summary in ("棗", "茶杓", "水指"):
+            task = prefetcher.schedule([summary])
+            if task is not None:
+                await task
+
+    assert len(calls) == 2
+    scope.close("disconnect")
+
+    stats = prefetcher.stats()
+    assert stats["skipped_budget"] == 1
+    assert stats["wasted"] == 2 and stats["wasted_tokens"] == 240
+    assert stats["connections"] == 0
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from server.core.queues import ByteBudgetQueue, LatestQueue, OutboundQueue, QueueStats, SlowConsumer
+
+
+@pytest.mark.asyncio
+async def test_video_queue_keeps_latest_frames():
+    stats = QueueStats()
+    q = LatestQueue("c1", maxsize=2, stats=stats)
+    for i in range(5):
+        await q.put(i)
+    assert [q.get_nowait(), q.get_nowait()] == [3, 4]
+    assert stats.connection("c1")["video"] == {"put": 5, "dropped": 3, "high_water": 2}
+
+
+@pytest.mark.asyncio
+async def test_audio_queue_drops_oldest_beyond_byte_budget():
+    stats = QueueStats()
+    q = ByteBudgetQueue("c1", max_bytes=10, stats=stats)
+    for chunk in (b"aaaa", b"bbbb", b"cccc", b"dd"):
+        await q.put(chunk)
+    assert q.bytes == 10
+    assert [q.get_nowait() for _ in range(q.qsize())] == [b"bbbb", b"cccc", b"dd"]
+    assert q.bytes == 0
+    audio = stats.connection("c1")["audio"]
+    assert audio["dropped"] == 1 and audio["dropped_bytes"] == 4
+
+
+@pytest.mark.asyncio
+async def test_outbound_queue_blocks_then_disconnects_slow_consumer():
+    stats = QueueStats()
+    q = OutboundQueue("c1", maxsize=1, put_timeout=0.05, stats=stats)
+    await q.put("first")
+
+    # A consumer that catches up in time unblocks the producer
+    async def consume_soon():
+        await asyncio.sleep(0.01)
+        return await q.get()
+
+    consumer = asyncio.create_task(consume_soon())
+    await q.put("second")
+    assert await consumer == "first"
+
+    with pytest.raises(SlowConsumer):
+        await q.put("third")
+    assert q.closed and q.closed_reason == "slow_consumer"
+    with pytest.raises(SlowConsumer):
+        await q.put("fourth")
+    counts = stats.as_dict()["totals"]["outbound"]
+    assert counts["blocked"] == 2 and counts["disconnects"] == 1 and counts["put"] == 2
+    stats.discard("c1")
+    assert stats.as_dict()["connections"] == {}
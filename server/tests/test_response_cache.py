@@ -0,0 +1,80 @@
+import types as pytypes
+
+import pytest
+
+from adk.services import genai as genai_module
+from adk.services import response_cache as cache_module
+from adk.services.response_cache import ResponseCache
+
+
+def test_key_normalizes_prompt_and_separates_instruction():
+    k1 = ResponseCache.make_key(model="m", instruction="basic", prompt="黒楽茶碗 の\n使い方")
+    k2 = ResponseCache.make_key(model="m", instruction="basic", prompt="  黒楽茶碗　の 使い方 ")
+    k3 = ResponseCache.make_key(model="m", instruction="analysis", prompt="黒楽茶碗 の 使い方")
+    assert k1 == k2
+    assert k1 != k3
+
+
+def test_ttl_and_size_eviction(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=300, default_ttl_s=10, ttls={"nocache": 0})
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+
+    cache.put("a", "x" * 100, tool="t")
+    now[0] += 1
+    cache.put("b", "y" * 100, tool="t")
+    cache.put("skip", "z", tool="nocache")
+    now[0] += 1
+    assert cache.get("a") == "x" * 100  # refreshes last_access of "a"
+    now[0] += 1
+    cache.put("c", "w" * 150, tool="t")  # over budget: least recently used "b" goes
+    assert cache.get("b") is None
+    assert cache.get("skip") is None
+    assert cache.get("a") is not None
+
+    now[0] += 20
+    assert cache.get("c") is None
+    assert cache.stats()["expired"] >= 1
+
+    # Survives reopen
+    cache.put("d", "persist", tool="t")
+    cache.close()
+    reopened = ResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=300, default_ttl_s=10)
+    assert reopened.get("d") == "persist"
+
+
+class _Resp:
+    def __init__(self, text):
+        self.candidates = [pytypes.SimpleNamespace(content=pytypes.SimpleNamespace(parts=[pytypes.SimpleNamespace(text=text)]))]
+
+    def model_dump_json(self, **_):
+        return self.candidates[0].content.parts[0].text
+
+
+@pytest.mark.asyncio
+async def test_generate_text_async_serves_repeat_prompt_from_cache(tmp_path, monkeypatch):
+    calls = []
+
+    class AioModels:
+        async def generate_content(self, *, model, contents, config):
+            calls.append(contents[0].parts[0].text)
+            return _Resp("答え")
+
+    client = pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=AioModels()))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+    monkeypatch.setattr(
+        genai_module.types.GenerateContentResponse,
+        "model_validate_json",
+        classmethod(lambda cls, payload: _Resp(payload)),
+        raising=False,
+    )
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(genai_module, "get_response_cache", lambda: cache)
+
+    for prompt in ("黒楽茶碗", " 黒楽茶碗 "):
+        resp = await genai_module.generate_text_async(model="m", instruction="i", prompt=prompt, tool="explain_tool_basics")
+        assert genai_module.get_text_from_response(resp) == "答え"
+    await genai_module.generate_text_async(model="m", instruction="i", prompt="黒楽茶碗", use_cache=False)
+
+    assert calls == ["黒楽茶碗", "黒楽茶碗"]
+    assert cache.stats()["hits"] == 1
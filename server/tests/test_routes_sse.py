@@ -58,3 +58,62 @@ def test_sse_stream_emits_ready_and_model_text(monkeypatch):
         assert r.status_code == 200
         assert r.json().get("ok") is True
 
+
+
+def _progress_stream(monkeypatch, query: str) -> list:
+    import asyncio
+
+    from adk.services.progress import progress_reporter
+    from server.routes import sse as sse_module
+
+    monkeypatch.setattr(sse_module.settings, "ENABLE_AUDIO", False)
+    monkeypatch.setattr(sse_module.server, "_ensure_google_config", lambda: True)
+
+    class FakeRunner:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def run_live(self, **kwargs):
+            # A planner tool streaming its sub-agent output before the reply
+            reporter = progress_reporter("analyze_tool_history")
+            if reporter is not None:
+                await reporter.text("partial")
+                await reporter.done()
+            part = pytypes.SimpleNamespace(text="hello-sse")
+            yield pytypes.SimpleNamespace(content=pytypes.SimpleNamespace(parts=[part]))
+
+    class FakeLRQ:
+        def send_content(self, *args, **kwargs):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(sse_module, "Runner", FakeRunner)
+    monkeypatch.setattr(sse_module, "LiveRequestQueue", lambda: FakeLRQ())
+
+    conn = asyncio.run(sse_module.server.create_connection(agent_key="analyze", user_id="sse-progress"))
+    client = TestClient(app_module.app)
+    lines = []
+    with client.stream("GET", f"/sse/analyze/{conn['connection_id']}{query}") as resp:
+        assert resp.status_code == 200
+        for line in resp.iter_lines():
+            if line:
+                lines.append(line)
+            if line.startswith("data:") and "hello-sse" in line:
+                break
+    return lines
+
+
+def test_sse_sends_no_tool_progress_without_opt_in(monkeypatch):
+    lines = _progress_stream(monkeypatch, "")
+    assert not any("tool_progress" in line for line in lines)
+    # Every data line a default onmessage listener sees is the reply itself
+    assert [line for line in lines if line.startswith("data:") and line != "data: ok"] == ["data: hello-sse"]
+
+
+def test_sse_sends_tool_progress_as_named_event_when_opted_in(monkeypatch):
+    lines = _progress_stream(monkeypatch, "?progress=1")
+    index = lines.index("event: tool_progress")
+    assert '"text":"partial"' in lines[index + 1]
+    assert lines.count("event: tool_progress") == 2
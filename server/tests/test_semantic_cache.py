@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from adk.services import semantic_cache as semantic_cache_module  # noqa: E402
+from adk.services.semantic_cache import HashingEmbedder, SemanticCache, SemanticIndex  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_hits_within_tool_and_mode_scope():
+    cache = SemanticCache(HashingEmbedder(dim=512), threshold=0.6)
+    calls = []
+
+    async def explain(prompt):
+        calls.append(prompt)
+        return f"answer:{prompt}"
+
+    first = await cache.get_or_call("explain_tool_basics", "beginner", "黒楽茶碗の使い方を教えて", explain)
+    again = await cache.get_or_call("explain_tool_basics", "beginner", "黒楽茶碗の使い方を教えてください", explain)
+    other_mode = await cache.get_or_call("explain_tool_basics", "advanced", "黒楽茶碗の使い方を教えて", explain)
+    unrelated = await cache.get_or_call("explain_tool_basics", "beginner", "唐銅の風炉の季節", explain)
+
+    assert again == first
+    assert other_mode == first  # same text, but answered separately for the other mode
+    assert unrelated == "answer:唐銅の風炉の季節"
+    assert len(calls) == 3
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_index_overwrites_oldest_when_full():
+    cache = SemanticCache(HashingEmbedder(dim=128), threshold=0.99, max_entries=2)
+    for prompt in ("棗", "茶杓", "水指"):
+        match = await cache.lookup("t", "m", prompt)
+        cache.store("t", "m", match.vector, prompt)
+
+    assert (await cache.lookup("t", "m", "棗")).answer is None
+    assert (await cache.lookup("t", "m", "水指")).answer == "水指"
+    assert cache.stats()["entries"] == {"t:m": 2}
+
+
+@pytest.mark.asyncio
+async def test_offloaded_search_runs_without_the_cache_lock(monkeypatch):
+    cache = SemanticCache(HashingEmbedder(dim=128), threshold=0.99)
+    first = await cache.lookup("t", "m", "棗")
+    cache.store("t", "m", first.vector, "棗")
+    other = await cache.lookup("t", "m", "茶杓")
+
+    monkeypatch.setattr(semantic_cache_module, "_INLINE_SEARCH_ROWS", 0)
+    entered, release = threading.Event(), threading.Event()
+    search_rows = SemanticIndex.search_rows
+
+    def slow_search(vectors, rows, vector):
+        entered.set()
+        release.wait(2)
+        return search_rows(vectors, rows, vector)
+
+    monkeypatch.setattr(SemanticIndex, "search_rows", staticmethod(slow_search))
+    lookup = asyncio.create_task(cache.lookup("t", "m", "棗"))
+    while not entered.is_set():
+        await asyncio.sleep(0.001)
+
+    # A store on the loop must not wait for the scan running in the executor
+    started = time.perf_counter()
+    cache.store("t", "m", other.vector, "茶杓")
+    assert time.perf_counter() - started < 0.5
+    release.set()
+    assert (await lookup).answer == "棗"
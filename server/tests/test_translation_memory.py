@@ -0,0 +1,79 @@
+import re
+import types as pytypes
+
+import pytest
+
+from adk.translator import agent as translator_module
+from adk.translator.memory import looks_like, parse_batch_response, split_segments, translation_memory
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memory():
+    translation_memory.clear()
+    yield
+    translation_memory.clear()
+
+
+def _response(text):
+    part = pytypes.SimpleNamespace(text=text)
+    return pytypes.SimpleNamespace(candidates=[pytypes.SimpleNamespace(content=pytypes.SimpleNamespace(parts=[part]))])
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    prompts: list[str] = []
+
+    async def fake_generate(*, model, instruction, prompt, tool):
+        prompts.append(prompt)
+        lines = re.findall(r"^(\d+): (.*)$", prompt, flags=re.M)
+        return _response("\n".join(f"{n}: EN<{seg}>" for n, seg in lines))
+
+    monkeypatch.setattr(translator_module, "generate_text_async", fake_generate)
+    return prompts
+
+
+def test_split_segments_round_trips():
+    text = "お写真、拝見いたしました。\n  黒楽茶碗ですね！所見です。\n\n以上"
+    pieces = split_segments(text)
+    assert "".join(p for p, _ in pieces) == text
+    assert [p for p, t in pieces if t] == ["お写真、拝見いたしました。", "黒楽茶碗ですね！", "所見です。", "以上"]
+    assert parse_batch_response("1: a\n3: c", 2) is None
+
+
+@pytest.mark.asyncio
+async def test_only_uncached_segments_are_sent_in_one_batch(fake_model):
+    caveat = "あくまで画像から拝察できる範囲での所見です。"
+    first = await translator_module.translate_text_async(f"黒楽茶碗ですね。{caveat}", target_language="English")
+    assert first == f"EN<黒楽茶碗ですね。> EN<{caveat}>"
+
+    second = await translator_module.translate_text_async(f"井戸茶碗ですね。\n{caveat}", target_language="en")
+    assert second == f"EN<井戸茶碗ですね。>\nEN<{caveat}>"
+
+    assert len(fake_model) == 2
+    assert caveat not in fake_model[1]
+    assert translation_memory.stats()["segment_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_same_language_skips_model_and_multi_runs_each_language(fake_model):
+    assert await translator_module.translate_text_async("これは棗です。", target_language="日本語") == "これは棗です。"
+    assert fake_model == []
+
+    results = await translator_module.translate_text_multi_async("これは棗です。", target_languages=["English", "French"])
+    assert list(results) == ["English", "French"]
+    assert len(fake_model) == 2
+
+
+def test_kanji_only_japanese_is_not_taken_for_chinese():
+    assert not looks_like("千家十職", "zh")
+    assert not looks_like("黒楽茶碗、長次郎作。", "Chinese")
+    assert looks_like("这是黑乐茶碗。", "zh")
+    assert looks_like("這是茶碗。", "中国語")
+
+
+@pytest.mark.asyncio
+async def test_kanji_only_japanese_sentence_is_translated_to_chinese(fake_model):
+    result = await translator_module.translate_text_async("千家十職楽家初代長次郎作。", target_language="中国語")
+    assert result == "EN<千家十職楽家初代長次郎作。>"
+    assert len(fake_model) == 1
+    assert translation_memory.stats()["skipped_same_language"] == 0
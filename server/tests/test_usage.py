@@ -0,0 +1,71 @@
+import types as pytypes
+
+import pytest
+from google.genai import types
+
+from adk.planner import agent as planner_module
+from adk.services import genai as genai_module
+from adk.services import usage as usage_module
+from adk.services.deadline import CallScope, bind_scope
+from adk.services.usage import UsageLedger
+
+
+def _usage(prompt, output, cached=0):
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt,
+        candidates_token_count=output,
+        cached_content_token_count=cached or None,
+        total_token_count=prompt + output,
+    )
+
+
+def test_ledger_attributes_usage_to_scope_turn_agent_and_prices():
+    ledger = UsageLedger(prices={"flash": (1.0, 4.0)})
+    scope = CallScope("c1", user_id="u1")
+    with bind_scope(scope):
+        scope.start_turn(None)
+        ledger.record(tool="summarize_image", model="flash", usage=_usage(1000, 100))
+        scope.start_turn(None)
+        ledger.record(tool="analyze_setting", model="flash", usage=_usage(2000, 200, cached=1000))
+        ledger.record(tool="live", model="live-model", usage=_usage(50, 10), agent="planner_agent")
+    ledger.record(tool="analyze_setting", model="flash", usage=None)
+
+    summary = ledger.summary()
+    assert summary["totals"]["calls"] == 3 and summary["totals"]["total_tokens"] == 3360
+    assert set(summary["by_agent"]) == {"vision", "setting", "planner_agent"}
+    # 1000 in + 100 out, then 1000 + 1000*0.25 in + 200 out, per million tokens
+    assert summary["by_model"]["flash"]["cost_usd"] == pytest.approx((1000 + 400 + 1250 + 800) / 1_000_000)
+    conn = ledger.connection("c1")
+    assert conn["user_id"] == "u1" and set(conn["turns"]) == {"1", "2"}
+    assert conn["turns"]["2"]["calls"] == 2
+
+
+def test_budget_degrades_optional_features_only():
+    ledger = UsageLedger(user_budget_tokens=500, degrade=("prefetch", "translation"))
+    ledger.record(tool="analyze_setting", model="m", usage=_usage(400, 50), user_id="u1")
+    assert ledger.allows("translation", "u1")
+    ledger.record(tool="analyze_setting", model="m", usage=_usage(40, 10), user_id="u1")
+    assert not ledger.allows("translation", "u1") and not ledger.allows("prefetch", "u1")
+    assert ledger.allows("vision", "u1") and ledger.allows("translation", "u2")
+    status = ledger.user("u1")["budget"]
+    assert status["exceeded"] and status["used"] == 500 and status["degraded_features"] == ["prefetch", "translation"]
+
+
+@pytest.mark.asyncio
+async def test_model_calls_are_recorded_and_translation_is_gated(monkeypatch):
+    ledger = UsageLedger(user_budget_tokens=100)
+    monkeypatch.setattr(genai_module, "usage_ledger", ledger)
+    monkeypatch.setattr(planner_module, "usage_ledger", ledger)
+
+    async def generate_content(**_):
+        return types.GenerateContentResponse(candidates=[], usage_metadata=_usage(90, 20))
+
+    client = pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(models=pytypes.SimpleNamespace(generate_content=generate_content)))
+    monkeypatch.setattr(genai_module, "get_client", lambda: client)
+
+    with bind_scope(CallScope("c1", user_id="u1")):
+        await genai_module.generate_text_async(model="m", instruction="", prompt="hi", tool="translate_text", use_cache=False)
+        assert ledger.summary()["by_agent"]["translator"]["total_tokens"] == 110
+        assert await planner_module.call_translation("こんにちは", "English") == planner_module._BUDGET_TRANSLATION_MESSAGE
+    assert ledger.summary()["degraded_calls"] == {"translation": 1}
+    assert usage_module.TOOL_AGENTS["translate_text"] == "translator"
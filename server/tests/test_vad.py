@@ -0,0 +1,96 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from server.core.audio import AudioCoalescer
+from server.core.vad import SPEECH_AUDIO, SPEECH_END, SPEECH_START, VoiceActivityDetector
+
+RATE = 16000
+CHUNK = 320 * 2  # 20 ms
+
+
+def _pcm(samples: np.ndarray) -> bytes:
+    return np.clip(samples * 32767, -32768, 32767).astype("<i2").tobytes()
+
+
+def _silence(seconds: float, rng) -> bytes:
+    return _pcm(rng.normal(0, 10 ** (-60 / 20), int(RATE * seconds)))
+
+
+def _speech(seconds: float) -> bytes:
+    t = np.arange(int(RATE * seconds)) / RATE
+    voiced = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    envelope = 0.3 + 0.7 * np.abs(np.sin(2 * np.pi * 2 * t))
+    return _pcm(0.1 * voiced * envelope)
+
+
+def _chunks(data: bytes):
+    return [data[i : i + CHUNK] for i in range(0, len(data), CHUNK)]
+
+
+def _run(vad, data: bytes):
+    timeline = []
+    for index, chunk in enumerate(_chunks(data)):
+        timeline.extend((index, event, payload) for event, payload in vad.process(chunk))
+    return timeline
+
+
+def test_speech_segment_has_preroll_and_ends_after_hangover():
+    rng = np.random.default_rng(0)
+    stream = _silence(1.0, rng) + _speech(1.0) + _silence(2.0, rng)
+    vad = VoiceActivityDetector(sample_rate=RATE, hangover_ms=300, preroll_ms=200)
+    timeline = _run(vad, stream)
+
+    events = [event for _, event, _ in timeline if event != SPEECH_AUDIO]
+    assert events == [SPEECH_START, SPEECH_END]
+    sent = sum(len(payload) for _, event, payload in timeline if event == SPEECH_AUDIO)
+    # Speech plus pre-roll plus hangover, not the 3 s of silence around it
+    assert len(_speech(1.0)) + 200 * 32 <= sent <= len(_speech(1.0)) + 600 * 32
+    first_audio = next(payload for _, event, payload in timeline if event == SPEECH_AUDIO)
+    # The first syllable is preceded by the 200 ms of audio before the onset
+    onset = RATE * 2 - 200 * 32
+    assert first_audio == stream[onset : onset + len(first_audio)]
+    end_chunk = next(index for index, event, _ in timeline if event == SPEECH_END)
+    speech_end_chunk = 100  # 2.0 s / 20 ms
+    assert 0.3 <= (end_chunk + 1 - speech_end_chunk) * 0.02 <= 0.36
+    assert vad.as_dict()["suppressed_bytes"] == len(stream) - sent
+
+
+def test_silence_clicks_and_hiss_are_suppressed():
+    rng = np.random.default_rng(1)
+    click = _speech(0.02)
+    hiss = _pcm(rng.normal(0, 10 ** (-30 / 20), RATE))
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    assert _run(vad, _silence(1.0, rng) + click + _silence(0.5, rng) + hiss) == []
+    assert vad.stats["segments"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalescer_follows_vad_instead_of_chunk_arrival():
+    class Lrq:
+        def __init__(self):
+            self.events = []
+
+        def send_realtime(self, blob):
+            self.events.append(("blob", len(blob.data)))
+
+        def send_activity_start(self):
+            self.events.append(("start", None))
+
+        def send_activity_end(self):
+            self.events.append(("end", None))
+
+    rng = np.random.default_rng(2)
+    lrq = Lrq()
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    coalescer = AudioCoalescer(lrq, sample_rate=RATE, block_ms=60, idle_end_ms=5000, activity=True, vad=vad)
+    stream = _silence(0.5, rng) + _speech(0.6) + _silence(2.0, rng)
+    for chunk in _chunks(stream):
+        coalescer.feed(chunk)
+    await asyncio.sleep(0)
+    kinds = [kind for kind, _ in lrq.events]
+    # The open mic never goes idle, yet the turn ends on the detected silence
+    assert kinds[0] == "start" and kinds[-1] == "end" and kinds.count("start") == 1
+    assert sum(n for kind, n in lrq.events if kind == "blob") < len(stream) / 2
+    coalescer.close()
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from adk.vision.cache import VisionSummaryCache, perceptual_hash
+
+MODEL = "gemini-2.0-flash-exp"
+INSTR = "describe"
+
+
+def test_near_duplicate_hash_hits_within_distance():
+    cache = VisionSummaryCache(max_distance=4)
+    cache.put((0b1011_0000, False), "黒楽茶碗", model=MODEL, instruction=INSTR)
+
+    assert cache.get((0b1011_0011, False), model=MODEL, instruction=INSTR) == "黒楽茶碗"
+    assert cache.get((0b0100_1111, False), model=MODEL, instruction=INSTR) is None
+    # Same frame under a different instruction is a separate entry
+    assert cache.get((0b1011_0000, False), model=MODEL, instruction="other") is None
+
+    stats = cache.stats()
+    assert (stats["near_hits"], stats["misses"]) == (1, 2)
+
+
+def test_lru_bounds_entries_bytes_and_ttl(monkeypatch):
+    cache = VisionSummaryCache(max_entries=2, max_bytes=10_000, ttl_s=10, max_distance=0)
+    for h in (1, 2, 3):
+        cache.put((h, False), f"s{h}", model=MODEL, instruction=INSTR)
+    assert cache.get((1, False), model=MODEL, instruction=INSTR) is None
+    assert cache.stats()["evictions"] == 1
+
+    small = VisionSummaryCache(max_entries=100, max_bytes=250, max_distance=0)
+    small.put((1, False), "a" * 100, model=MODEL, instruction=INSTR)
+    small.put((2, False), "b" * 100, model=MODEL, instruction=INSTR)
+    assert small.stats()["entries"] == 1
+
+    import adk.vision.cache as cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache.put((9, False), "fresh", model=MODEL, instruction=INSTR)
+    now[0] += 11
+    assert cache.get((9, False), model=MODEL, instruction=INSTR) is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_perceptual_hash_tolerates_reencoding():
+    np = pytest.importorskip("numpy")
+    Image = pytest.importorskip("PIL.Image")
+
+    gradient = np.tile(np.linspace(0, 255, 320, dtype=np.uint8), (240, 1))
+    img = Image.fromarray(np.stack([gradient] * 3, axis=-1))
+
+    def encode(quality: int) -> bytes:
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=quality)
+        return buf.getvalue()
+
+    a, b = perceptual_hash(encode(95)), perceptual_hash(encode(40))
+    assert a is not None and b is not None
+    assert (a ^ b).bit_count() <= 6
+    assert perceptual_hash(b"not an image") is None
@@ -0,0 +1,60 @@
+import asyncio
+import types as pytypes
+
+import pytest
+
+from adk.planner import agent as planner_module
+from adk.vision import agent as vision_module
+
+
+def _fake_summarizer(delays: dict[bytes, float], active: list[int], peak: list[int]):
+    async def fake_summarize(payload, *, mime_type, instruction, model):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        try:
+            await asyncio.sleep(delays.get(payload, 0))
+        finally:
+            active[0] -= 1
+        return f"summary-{payload.decode()}"
+
+    return fake_summarize
+
+
+@pytest.mark.asyncio
+async def test_summarize_images_respects_fanout_and_order(monkeypatch):
+    active, peak = [0], [0]
+    delays = {b"1": 0.03, b"2": 0.01, b"3": 0.02, b"4": 0.0}
+    monkeypatch.setattr(vision_module, "summarize_image_async", _fake_summarizer(delays, active, peak))
+
+    images = [("image/jpeg", k) for k in delays]
+    results = await vision_module.summarize_images_async(images, concurrency=2, timeout=1)
+
+    assert results == ["summary-1", "summary-2", "summary-3", "summary-4"]
+    assert peak[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_planner_hook_returns_partial_result_on_timeout(monkeypatch):
+    active, peak = [0], [0]
+    delays = {b"tokonoma": 0.0, b"kama": 5.0, b"chawan": 0.0}
+    monkeypatch.setattr(vision_module, "summarize_image_async", _fake_summarizer(delays, active, peak))
+    monkeypatch.setenv("VISION_IMAGE_TIMEOUT_S", "0.05")
+
+    def image_part(data: bytes):
+        return pytypes.SimpleNamespace(inline_data=pytypes.SimpleNamespace(mime_type="image/jpeg", data=data))
+
+    text_part = pytypes.SimpleNamespace(inline_data=None, text="この茶席を解説して")
+    last = pytypes.SimpleNamespace(
+        role="user",
+        parts=[text_part, image_part(b"tokonoma"), image_part(b"kama"), image_part(b"chawan")],
+    )
+    request = pytypes.SimpleNamespace(contents=[last])
+
+    assert await planner_module._planner_router_before_model(None, request) is None
+
+    assert last.parts[0] is text_part
+    combined = last.parts[-1].text
+    sections = combined.split("\n\n")
+    assert sections[0] == "[Vision解析1] summary-tokonoma"
+    assert sections[1].startswith("[Vision解析2] 画像解析が時間内に完了しませんでした")
+    assert sections[2] == "[Vision解析3] summary-chawan"
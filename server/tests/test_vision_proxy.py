@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from server.core import vision_proxy as vp
+from server.core.coordinator import MultimodalServer
+
+
+def _has_image(content) -> bool:
+    return any(getattr(p, "inline_data", None) is not None for p in content.parts)
+
+
+@pytest.mark.asyncio
+async def test_proxy_summarizes_latest_frame_and_skips_duplicates():
+    gate = asyncio.Event()
+    summarized = []
+
+    async def summarize(frame, **_):
+        summarized.append(frame)
+        await gate.wait()
+        return f"棗が見えます ({frame.decode()})"
+
+    proxy = vp.VisionProxy(summarize=summarize)
+    sent, turns = [], []
+
+    def submit(frame):
+        proxy.submit("c1", frame, send=lambda content, received: sent.append(content), start_turn=lambda: turns.append(1))
+
+    submit(b"frame-a")
+    await asyncio.sleep(0)
+    submit(b"frame-b")  # superseded by frame-c while frame-a is being summarized
+    submit(b"frame-c")
+    gate.set()
+    await asyncio.sleep(0.01)
+    submit(b"frame-c")  # same bytes as the last summarized frame
+    await asyncio.sleep(0.01)
+
+    assert summarized == [b"frame-a", b"frame-c"]
+    assert len(sent) == len(turns) == 2
+    assert not any(_has_image(c) for c in sent)
+    assert sent[0].parts[0].text.startswith("[カメラ映像の要約]")
+    stats = proxy.stats.as_dict()["text"]
+    assert stats["frames"] == 4 and stats["superseded"] == 1 and stats["duplicates"] == 1
+    assert stats["summaries_sent"] == 2 and stats["context"]["images"] == 0
+
+
+def test_raw_frame_only_when_asked_about_the_picture():
+    proxy = vp.VisionProxy()
+    assert proxy.frame_parts("c1", "この画像の茶碗は？") == []  # nothing captured yet
+    proxy._conn("c1").latest = b"jpeg"
+    assert proxy.frame_parts("c1", "棗の由緒を教えて") == []
+    parts = proxy.frame_parts("c1", "今映っているのは何？")
+    assert len(parts) == 1 and parts[0].inline_data.data == b"jpeg"
+
+
+@pytest.mark.asyncio
+async def test_coordinator_modes_side_by_side(monkeypatch):
+    server = MultimodalServer()
+
+    async def summarize(frame, **_):
+        return "茶碗が一つ置かれています。"
+
+    server.vision_proxy._summarize = summarize
+    sent = []
+
+    class FakeLrq:
+        def send_content(self, content):
+            sent.append(content)
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("server.core.coordinator.asyncio.sleep", no_sleep)
+    await server.send_video_frame(FakeLrq(), "raw", b"jpeg")
+    assert len(sent) == 2 and _has_image(sent[0])
+    monkeypatch.undo()
+
+    sent.clear()
+    assert server.set_vision_mode("proxy", "TEXT") == "text"
+    assert server.set_vision_mode("proxy", "thumbnails") is None
+    await server.send_video_frame(FakeLrq(), "proxy", b"jpeg")
+    await asyncio.sleep(0.01)
+    assert len(sent) == 1 and not _has_image(sent[0])
+    parts = server.text_turn_parts("proxy", "この写真の道具は？")
+    assert parts[-1].inline_data.data == b"jpeg"
+
+    stats = server.vision_proxy.stats.as_dict()
+    assert stats["frames"]["context"]["images"] == 1
+    assert stats["text"]["context"]["images"] == 1  # the explicitly requested frame only
+    assert stats["text"]["summaries_sent"] == 1
+    server.abort_calls("proxy", "disconnect")
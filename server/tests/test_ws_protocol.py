@@ -0,0 +1,70 @@
+import asyncio
+import base64
+import json
+import time
+import types as pytypes
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+from server.core import coordinator as coordinator_module
+from server.core import ws_protocol
+
+
+def test_binary_frame_round_trip_without_copying_payload():
+    frame = ws_protocol.encode_frame(ws_protocol.VIDEO, b"\xff\xd8jpeg", flags=ws_protocol.FLAG_SCREEN)
+    kind, flags, payload = ws_protocol.parse_frame(frame)
+    assert (kind, ws_protocol.video_mode(flags)) == (ws_protocol.VIDEO, "screen")
+    assert isinstance(payload, memoryview) and payload.obj is frame and payload.tobytes() == b"\xff\xd8jpeg"
+    with pytest.raises(ws_protocol.FrameError):
+        ws_protocol.parse_frame(b"\x01")
+    with pytest.raises(ws_protocol.FrameError):
+        ws_protocol.parse_frame(b"\x09\x00data")
+    assert ws_protocol.negotiate(["chat", ws_protocol.BINARY_SUBPROTOCOL]) == ws_protocol.BINARY_SUBPROTOCOL
+    assert ws_protocol.negotiate([]) is None
+
+
+def _echo_runner(monkeypatch):
+    """Runner whose live session answers the first audio blob with that audio reversed."""
+
+    class EchoRunner:
+        def __init__(self, **kwargs):
+            pass
+
+        async def run_live(self, *, live_request_queue, **kwargs):
+            while True:
+                request = await live_request_queue.get()
+                if request.blob is not None:
+                    inline = pytypes.SimpleNamespace(data=request.blob.data[::-1])
+                    yield pytypes.SimpleNamespace(content=pytypes.SimpleNamespace(parts=[pytypes.SimpleNamespace(inline_data=inline)]))
+
+    monkeypatch.setattr(coordinator_module, "Runner", EchoRunner)
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_ws_media_round_trip(monkeypatch, binary):
+    from server.app_state import server
+
+    _echo_runner(monkeypatch)
+    monkeypatch.setattr(server, "_ensure_google_config", lambda: True)
+    monkeypatch.setattr(coordinator_module.settings, "AUDIO_BLOCK_MS", 0)
+    conn = asyncio.run(server.create_connection(agent_key="analyze", user_id="ws-user"))
+    pcm = bytes(range(16))
+    client = TestClient(app_module.app)
+    subprotocols = [ws_protocol.BINARY_SUBPROTOCOL] if binary else []
+    with client.websocket_connect(f"/ws/analyze/{conn['connection_id']}", subprotocols=subprotocols) as ws:
+        if binary:
+            assert ws.accepted_subprotocol == ws_protocol.BINARY_SUBPROTOCOL
+            ws.send_bytes(ws_protocol.encode_frame(ws_protocol.AUDIO, pcm))
+            kind, _, payload = ws_protocol.parse_frame(ws.receive_bytes())
+            assert kind == ws_protocol.AUDIO and payload.tobytes() == pcm[::-1]
+        else:
+            ws.send_text(json.dumps({"type": "audio", "data": base64.b64encode(pcm).decode()}))
+            reply = json.loads(ws.receive_text())
+            assert reply["type"] == "audio" and base64.b64decode(reply["data"]) == pcm[::-1]
+        # Let the server finish its teardown before the test client cancels the app
+        ws.close()
+        deadline = time.monotonic() + 2
+        while conn["connection_id"] in server.active_connections and time.monotonic() < deadline:
+            time.sleep(0.01)